@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for the edX API client, see benchmarks/run.py
+"""
@@ -0,0 +1,118 @@
+"""
+JSON decoding benchmark: every installed decoder on payloads shaped like the big edX responses.
+
+Usage:
+
+    python -m benchmarks.decoding --repeat 50
+
+The decoder the client picks for the responses is marked with a *.
+"""
+import argparse
+import json
+import sys
+import time
+
+from edx_api.serialization import default_decoder
+
+from .fake_edx import FakeEdxData, course_id_for
+from .run import percentile
+
+
+def payloads(data):
+    """
+    Serialized payloads of the endpoints returning the largest bodies
+
+    Args:
+        data (FakeEdxData): the synthetic dataset
+
+    Returns:
+        dict: the JSON bodies by payload shape
+    """
+    course_id = course_id_for(0)
+    pages = {
+        "enrollments page": {"next": None, "previous": None, "results": [
+            data.enrollment(index) for index in range(data.page_size)
+        ]},
+        "grades page": {"next": None, "previous": None, "results": [
+            data.grade(course_id, index) for index in range(data.page_size)
+        ]},
+        "course runs page": {"next": None, "previous": None, "results": [
+            data.course_run(index) for index in range(data.page_size)
+        ]},
+        "course blocks": data.blocks(course_id),
+    }
+    return {name: json.dumps(page).encode("utf-8") for name, page in pages.items()}
+
+
+def decoders():
+    """
+    The decoders installed, the standard library one first, then every optional one
+    that can be imported (default_decoder only returns the fastest of them)
+
+    Returns:
+        dict: the decode functions by name
+    """
+    installed = {"json": json.loads}
+    # pylint: disable=import-outside-toplevel
+    try:
+        import orjson
+        installed["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        installed["msgspec"] = msgspec.json.decode
+    except ImportError:
+        pass
+    return installed
+
+
+def measure(loads, body, repeat):
+    """
+    Times the decoding of a body.
+
+    Args:
+        loads (callable): the decoder
+        body (bytes): the JSON document
+        repeat (int): number of times it is decoded
+
+    Returns:
+        dict: the median and p95 durations in milliseconds and the throughput in MB/s
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loads(body)
+        samples.append((time.perf_counter() - start) * 1000)
+    median = percentile(samples, 50)
+    return {
+        "p50_ms": median,
+        "p95_ms": percentile(samples, 95),
+        "mb_per_sec": len(body) / 1000 / median if median else 0.0,
+    }
+
+
+def main(argv=None):
+    """Runs the decoding benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--blocks", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    bodies = payloads(FakeEdxData(page_size=args.page_size, num_blocks=args.blocks))
+    default_name, _ = default_decoder()
+    print(f"{'payload':<20}{'decoder':<10}{'KB':>8}{'p50 ms':>10}{'p95 ms':>10}{'MB/s':>10}")
+    for payload, body in bodies.items():
+        for name, loads in decoders().items():
+            result = measure(loads, body, args.repeat)
+            label = f"{name}*" if name == default_name else name
+            print(
+                f"{payload:<20}{label:<10}{len(body) / 1000:>8.0f}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['mb_per_sec']:>10.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+"""
+A local stand-in for the edX LMS/CMS REST APIs used by the benchmarks.
+
+It serves synthetic, deterministic payloads shaped like the real edX responses so
+that the client hot paths can be measured offline, with a configurable per-request
+latency and page size.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+COURSE_ID_TEMPLATE = "course-v1:BenchX+B{index:04d}+2030_T1"
+
+
+def course_id_for(index):
+    """The synthetic course id for the given index"""
+    return COURSE_ID_TEMPLATE.format(index=index)
+
+
+class FakeEdxData:
+    """
+    Synthetic edX dataset, pages are serialized lazily and cached.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        num_courses=200,
+        num_enrollments=2000,
+        num_grades=2000,
+        num_course_runs=200,
+        num_blocks=5000,
+        page_size=100,
+    ):
+        self.num_courses = num_courses
+        self.num_enrollments = num_enrollments
+        self.num_grades = num_grades
+        self.num_course_runs = num_course_runs
+        self.num_blocks = num_blocks
+        self.page_size = page_size
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def cached(self, key, build):
+        """Returns the serialized payload for key, building it on first use"""
+        with self._lock:
+            body = self._cache.get(key)
+        if body is None:
+            body = json.dumps(build()).encode("utf-8")
+            with self._lock:
+                self._cache[key] = body
+        return body
+
+    @staticmethod
+    def course_detail(index):
+        """A course detail payload"""
+        course_id = course_id_for(index)
+        return {
+            "blocks_url": f"/api/courses/v1/blocks/?course_id={course_id}",
+            "effort": "5 hours",
+            "end": "2030-12-31T00:00:00Z",
+            "enrollment_start": "2030-01-01T00:00:00Z",
+            "enrollment_end": None,
+            "id": course_id,
+            "media": {
+                "course_image": {"uri": f"/asset-v1:{course_id}+type@asset+block@image.jpg"},
+                "course_video": {"uri": None},
+            },
+            "name": f"Benchmark Course {index}",
+            "number": f"B{index:04d}",
+            "org": "BenchX",
+            "short_description": "A synthetic course used for benchmarking " * 3,
+            "start": "2030-02-01T00:00:00Z",
+            "start_display": "Feb. 1, 2030",
+            "start_type": "timestamp",
+            "pacing": "instructor",
+            "overview": "<p>Overview</p>" * 20,
+        }
+
+    @staticmethod
+    def course_modes(index):
+        """The course modes payload of a course"""
+        return [
+            {
+                "course_id": course_id_for(index),
+                "mode_slug": slug,
+                "mode_display_name": slug.title(),
+                "min_price": price,
+                "currency": "usd",
+                "expiration_datetime": None,
+                "expiration_datetime_is_explicit": False,
+                "description": None,
+                "sku": None,
+                "bulk_sku": None,
+            }
+            for slug, price in (("audit", 0), ("verified", 49))
+        ]
+
+    def enrollment(self, index):
+        """An enrollment payload"""
+        return {
+            "course_id": course_id_for(index % self.num_courses),
+            "created": "2030-01-04T19:44:31.802434Z",
+            "is_active": True,
+            "mode": "audit" if index % 3 else "verified",
+            "user": f"user{index}",
+        }
+
+    def grade(self, course_id, index):
+        """A current grade payload"""
+        return {
+            "course_id": course_id,
+            "email": f"user{index}@example.com",
+            "passed": bool(index % 2),
+            "percent": (index % 100) / 100,
+            "letter_grade": "Pass" if index % 2 else None,
+            "username": f"user{index}",
+        }
+
+    @staticmethod
+    def course_run(index):
+        """A course run payload"""
+        course_id = course_id_for(index)
+        return {
+            "schedule": {
+                "start": "2030-01-01T00:00:00Z",
+                "end": "2030-12-31T00:00:00Z",
+                "enrollment_start": "2029-12-01T00:00:00Z",
+                "enrollment_end": None,
+            },
+            "pacing_type": "instructor_paced",
+            "team": [],
+            "id": course_id,
+            "title": f"Benchmark Course {index}",
+            "images": {"card_image": f"/asset-v1:{course_id}+type@asset+block@card.jpg"},
+            "org": "BenchX",
+            "number": f"B{index:04d}",
+            "run": "2030_T1",
+        }
+
+    @staticmethod
+    def certificate(username, course_id):
+        """A certificate payload"""
+        return {
+            "username": username,
+            "course_id": course_id,
+            "certificate_type": "verified",
+            "status": "downloadable",
+            "download_url": f"/certificates/{username}/{course_id}",
+            "grade": "0.98",
+            "created": "2030-06-01T00:00:00Z",
+            "modified": "2030-06-01T00:00:00Z",
+            "is_passing": True,
+        }
+
+    def blocks(self, course_id):
+        """
+        A course blocks payload: a course with chapters, sequentials, verticals and
+        leaf problems/html/videos adding up to num_blocks blocks.
+        """
+        key = course_id.replace("course-v1:", "")
+        root = f"block-v1:{key}+type@course+block@course"
+        blocks = {}
+        leaf_types = ("problem", "html", "video")
+
+        def add(block_type, name, parent=None):
+            block_id = f"block-v1:{key}+type@{block_type}+block@{name}"
+            blocks[block_id] = {
+                "children": [],
+                "display_name": f"{block_type} {name}",
+                "id": block_id,
+                "type": block_type,
+                "visible_to_staff_only": False,
+            }
+            if parent:
+                blocks[parent]["children"].append(block_id)
+            return block_id
+
+        add("course", "course")
+        count = 1
+        chapter = sequential = vertical = None
+        while count < self.num_blocks:
+            if count % 200 == 1:
+                chapter = add("chapter", f"c{count}", root)
+            elif count % 40 == 2 or sequential is None:
+                sequential = add("sequential", f"s{count}", chapter)
+            elif count % 8 == 3 or vertical is None:
+                vertical = add("vertical", f"v{count}", sequential)
+            else:
+                add(leaf_types[count % 3], f"l{count}", vertical)
+            count += 1
+        return {"root": root, "blocks": blocks}
+
+
+class FakeEdxHandler(BaseHTTPRequestHandler):
+    """
+    Routes the requests made by the edX API client to the synthetic dataset
+    """
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, avoid the Nagle/delayed ACK stall
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Silences the default per-request logging"""
+
+    def _send(self, body, status=200):
+        """Writes a JSON response"""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _page_url(self, path, **params):
+        """An absolute URL to another page of this server"""
+        return f"{self.server.base_url.rstrip('/')}{path}?{urlencode(params)}"
+
+    def _read_body(self):
+        """Reads the request body, decoding JSON and form payloads"""
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if "json" in self.headers.get("Content-Type", ""):
+            return json.loads(body or b"null")
+        return {key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()}
+
+    def _start(self):
+        """Counts the request and waits for the configured latency"""
+        self.server.count_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    def do_GET(self):  # pylint: disable=invalid-name,too-many-return-statements,too-many-branches
+        """Dispatches a GET request"""
+        self._start()
+        data = self.server.data
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        page_size = int(query.get("page_size") or data.page_size)
+
+        if path == "/api/enrollment/v1/enrollments":
+            start = int(query.get("cursor") or 0)
+            end = min(start + data.page_size, data.num_enrollments)
+
+            def build_enrollments():
+                params = dict(query, cursor=end)
+                return {
+                    "next": self._page_url(path, **params) if end < data.num_enrollments else None,
+                    "previous": None,
+                    "results": [data.enrollment(index) for index in range(start, end)],
+                }
+            return self._send(data.cached(("enrollments", url.query), build_enrollments))
+
+        if path == "/api/enrollment/v1/enrollment":
+            return self._send(data.cached(
+                "student_enrollments",
+                lambda: [dict(data.enrollment(index), user="staff") for index in range(data.num_courses)],
+            ))
+
+        if path.startswith("/api/grades/v1/courses/"):
+            course_id = path[len("/api/grades/v1/courses/"):].strip("/")
+            if "username" in query:
+                return self._send(json.dumps([data.grade(course_id, 0)]).encode("utf-8"))
+            page = int(query.get("page") or 1)
+            start = (page - 1) * data.page_size
+            end = min(start + data.page_size, data.num_grades)
+
+            def build_grades():
+                return {
+                    "next": self._page_url(path, page=page + 1) if end < data.num_grades else None,
+                    "previous": None,
+                    "results": [data.grade(course_id, index) for index in range(start, end)],
+                }
+            return self._send(data.cached(("grades", course_id, page), build_grades))
+
+        if path == "/api/courses/v1/courses/":
+            page = int(query.get("page") or 1)
+            if "course_keys" in query:
+                keys = parse_qs(url.query)["course_keys"]
+                indexes = [
+                    int(key.split("+")[1][1:]) for key in keys
+                    if key.startswith("course-v1:BenchX+B")
+                ]
+            else:
+                indexes = list(range(data.num_courses))
+            start = (page - 1) * page_size
+            selected = [index for index in indexes[start:start + page_size] if index < data.num_courses]
+            has_next = start + page_size < len(indexes)
+            return self._send(json.dumps({
+                "results": [data.course_detail(index) for index in selected],
+                "pagination": {
+                    "next": self._page_url(path, page=page + 1) if has_next else None,
+                    "previous": None,
+                    "count": len(indexes),
+                    "num_pages": (len(indexes) + page_size - 1) // page_size,
+                },
+            }).encode("utf-8"))
+
+        if path.startswith("/api/courses/v1/courses/"):
+            course_id = path[len("/api/courses/v1/courses/"):].strip("/")
+            index = int(course_id.split("+")[1][1:])
+            return self._send(data.cached(("detail", index), lambda: data.course_detail(index)))
+
+        if path.startswith("/api/course_modes/v1/courses/"):
+            course_id = path[len("/api/course_modes/v1/courses/"):].strip("/")
+            index = int(course_id.split("+")[1][1:])
+            return self._send(data.cached(("modes", index), lambda: data.course_modes(index)))
+
+        if path == "/api/courses/v1/blocks/":
+            course_id = query["course_id"]
+            return self._send(data.cached(("blocks", course_id), lambda: data.blocks(course_id)))
+
+        if path == "/api/v1/course_runs/":
+            page = int(query.get("page") or 1)
+            start = (page - 1) * data.page_size
+            end = min(start + data.page_size, data.num_course_runs)
+
+            def build_runs():
+                return {
+                    "next": self._page_url(path, page=page + 1) if end < data.num_course_runs else None,
+                    "previous": None,
+                    "count": data.num_course_runs,
+                    "num_pages": (data.num_course_runs + data.page_size - 1) // data.page_size,
+                    "current_page": page,
+                    "start": start,
+                    "results": [data.course_run(index) for index in range(start, end)],
+                }
+            return self._send(data.cached(("runs", page), build_runs))
+
+        if path.startswith("/api/v1/course_runs/"):
+            course_id = path[len("/api/v1/course_runs/"):].strip("/")
+            index = int(course_id.split("+")[1][1:])
+            return self._send(data.cached(("run", index), lambda: data.course_run(index)))
+
+        if path == "/api/mobile/v0.5/my_user_info":
+            return self._send(json.dumps({
+                "id": 9, "username": "staff", "email": "staff@example.com", "name": "Staff",
+            }).encode("utf-8"))
+
+        if path.startswith("/api/certificates/v0/certificates/"):
+            username, _, course_id = path[len("/api/certificates/v0/certificates/"):].strip("/").partition("/courses/")
+            return self._send(json.dumps(data.certificate(username, course_id)).encode("utf-8"))
+
+        return self._send(b'{"detail": "Not found."}', status=404)
+
+    def do_POST(self):  # pylint: disable=invalid-name,too-many-return-statements
+        """Dispatches a POST request"""
+        self._start()
+        path = unquote(urlparse(self.path).path)
+        payload = self._read_body()
+
+        if path == "/api/ccx/v0/ccx/":
+            master_course_id = payload["master_course_id"].replace("course-v1:", "ccx-v1:")
+            return self._send(json.dumps({
+                "ccx_course_id": f"{master_course_id}+ccx@{self.server.requests}",
+            }).encode("utf-8"), status=201)
+
+        if path == "/api/user/v1/validation/registration":
+            return self._send(json.dumps({
+                "validation_decisions": {field: "" for field in payload},
+            }).encode("utf-8"))
+
+        if path == "/api/change_email_settings":
+            return self._send(b'{"success": true}')
+
+        if path == "/api/lti-user-fix/":
+            return self._send(json.dumps({"message": f"Fixed {payload['email']}"}).encode("utf-8"))
+
+        if path == "/v1/accounts/bulk_retire_users":
+            return self._send(json.dumps({
+                "successful_user_retirements": payload["usernames"].split(","),
+                "failed_user_retirements": [],
+            }).encode("utf-8"))
+
+        return self._send(b'{"detail": "Not found."}', status=404)
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        """Dispatches a PATCH request"""
+        self._start()
+        path = unquote(urlparse(self.path).path)
+        payload = self._read_body()
+
+        if path.startswith("/api/user/v1/accounts/"):
+            username = path[len("/api/user/v1/accounts/"):].strip("/")
+            return self._send(json.dumps({
+                "id": 9, "username": username, "email": f"{username}@example.com", "name": payload.get("name"),
+            }).encode("utf-8"))
+
+        return self._send(b'{"detail": "Not found."}', status=404)
+
+
+class FakeEdxServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server serving the synthetic edX dataset.
+
+    Usage:
+        >>> with FakeEdxServer(latency=0.005) as server:
+        ...     api = EdxApi({"access_token": "token"}, server.base_url)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, data=None, host="127.0.0.1", port=0):
+        """
+        Args:
+            latency (float): seconds slept before answering each request, the number of
+                requests received is counted in `requests`
+            data (FakeEdxData): the dataset to serve
+            host (str): interface to bind
+            port (int): port to bind, 0 picks a free one
+        """
+        super().__init__((host, port), FakeEdxHandler)
+        self.latency = latency
+        self.data = data or FakeEdxData()
+        self.base_url = f"http://{host}:{self.server_address[1]}/"
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self._thread = None
+
+    def count_request(self):
+        """Counts a request received, see requests"""
+        with self._requests_lock:
+            self.requests += 1
+
+    def start(self):
+        """Serves requests on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and releases the socket"""
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,75 @@
+"""
+Cold start benchmark: time spent importing the client and building a first sub-client.
+
+Every sample runs in a fresh interpreter so nothing is already imported. Usage:
+
+    python -m benchmarks.import_time --repeat 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+from .run import percentile
+
+STAGES = {
+    "import edx_api.client": "import edx_api.client",
+    "EdxApi()": "from edx_api.client import EdxApi; api = EdxApi({'access_token': 'token'})",
+    "EdxApi().enrollments": (
+        "from edx_api.client import EdxApi; api = EdxApi({'access_token': 'token'}); api.enrollments"
+    ),
+    "all sub-clients": (
+        "from edx_api.client import EdxApi; api = EdxApi({'access_token': 'token'}); "
+        "[getattr(api, name) for name in ('course_list', 'course_structure', 'course_detail', "
+        "'course_mode', 'enrollments', 'ccx', 'email_settings', 'certificates', 'current_grades', "
+        "'user_info', 'bulk_user_retirement', 'user_validation', 'course_runs', 'lti_tools')]"
+    ),
+}
+
+TIMER = (
+    "import time, sys; start = time.perf_counter(); exec(sys.argv[1]); "
+    "print(time.perf_counter() - start, len(sys.modules))"
+)
+
+
+def measure(statement, repeat):
+    """
+    Times a statement in fresh interpreters.
+
+    Args:
+        statement (str): the python code to time
+        repeat (int): number of interpreters to start
+
+    Returns:
+        dict: the timings in milliseconds and the number of modules loaded
+    """
+    samples = []
+    modules = 0
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER, statement], check=True, capture_output=True, text=True
+        ).stdout.split()
+        samples.append(float(output[0]) * 1000)
+        modules = int(output[1])
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": percentile(samples, 95),
+        "modules": modules,
+    }
+
+
+def main(argv=None):
+    """Runs the cold start benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{'stage':<25}{'median ms':>12}{'p95 ms':>10}{'modules':>10}")
+    for name, statement in STAGES.items():
+        result = measure(statement, args.repeat)
+        print(f"{name:<25}{result['median_ms']:>12.2f}{result['p95_ms']:>10.2f}{result['modules']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Benchmarks for the hot paths of every edX API sub-client.
+
+Runs each scenario against a local FakeEdxServer and reports throughput, latency
+percentiles and peak Python memory. Usage:
+
+    python -m benchmarks.run --latency 0.005 --page-size 100 --iterations 20
+    python -m benchmarks.run --scenario enrollments --concurrency 8 --json results.json
+
+Concurrent identical GET requests are not coalesced unless --coalesce is passed, so
+that every iteration reaches the server.
+
+Responses can be recorded into a cassette and the benchmarks replayed from it, which
+leaves only the client code in the profile:
+
+    python -m benchmarks.run --record edx.json.gz
+    python -m benchmarks.run --replay edx.json.gz --latency 0.005
+"""
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from edx_api.cassette import Cassette, RecordingAdapter, ReplayAdapter
+from edx_api.client import EdxApi
+
+from .fake_edx import FakeEdxData, FakeEdxServer, course_id_for
+
+
+def _count(iterable):
+    """Consumes an iterable, returning the number of items"""
+    return sum(1 for _ in iterable)
+
+
+def _walk_blocks(structure):
+    """Visits every block of a course structure from the root"""
+    visited = 0
+    stack = [structure.root]
+    while stack:
+        block = stack.pop()
+        visited += 1
+        stack.extend(block.children)
+    return visited
+
+
+def _ok(results):
+    """The number of successful BulkResults"""
+    return sum(1 for result in results if result.ok)
+
+
+# numbers the registrations validated, UserValidation sends concurrent identical
+# validations once whatever the EdxApi settings
+_registrations = itertools.count()
+
+
+# Each scenario takes an EdxApi and returns the number of items it processed, the
+# cached reads bypass their cache so that every run reaches the server
+SCENARIOS = {
+    "enrollments.get_enrollments": lambda api: _count(api.enrollments.get_enrollments()),
+    "enrollments.get_student_enrollments": lambda api: len(
+        api.enrollments.get_student_enrollments().enrollments
+    ),
+    "current_grades.get_course_current_grades": lambda api: len(
+        api.current_grades.get_course_current_grades(course_id_for(0)).all_current_grades
+    ),
+    "current_grades.get_student_current_grades": lambda api: len(
+        api.current_grades.get_student_current_grades(
+            "user0", [course_id_for(index) for index in range(10)]
+        ).all_current_grades
+    ),
+    "course_list.get_courses": lambda api: _count(api.course_list.get_courses()),
+    "course_detail.get_detail": lambda api: int(
+        api.course_detail.get_detail(course_id_for(1)).course_id is not None
+    ),
+    "course_mode.get_course_modes": lambda api: len(api.course_mode.get_course_modes(course_id_for(1))),
+    "course_runs.get_course_run": lambda api: int(
+        api.course_runs.get_course_run(course_id_for(1)).course_id is not None
+    ),
+    "course_runs.get_course_runs_list": lambda api: len(api.course_runs.get_course_runs_list().results),
+    "course_structure.course_blocks": lambda api: _walk_blocks(
+        api.course_structure.course_blocks(course_id_for(0), "staff")
+    ),
+    "user_info.get_user_info": lambda api: int(api.user_info.get_user_info(use_cache=False).username is not None),
+    "user_info.update_user_name": lambda api: int(
+        api.user_info.update_user_name("staff", "Staff Member").username is not None
+    ),
+    "certificates.get_student_certificates": lambda api: len(
+        api.certificates.get_student_certificates("user0", [course_id_for(index) for index in range(10)]).certificates
+    ),
+    "user_validation.validate_user_registration_info": lambda api: int(
+        api.user_validation.validate_user_registration_info(
+            {"username": f"user{next(_registrations)}", "name": "User"}, use_cache=False
+        ).username is not None
+    ),
+    "email_settings.change_subscriptions": lambda api: _ok(api.email_settings.change_subscriptions(
+        {course_id_for(index): bool(index % 2) for index in range(10)}
+    )),
+    "ccx.create_many": lambda api: _ok(api.ccx.create_many([
+        {
+            "master_course_id": course_id_for(index),
+            "coach_email": "coach@example.com",
+            "max_students_allowed": 200,
+            "title": f"CCX {index}",
+        }
+        for index in range(10)
+    ])),
+    "lti_tools.fix_lti_users": lambda api: sum(
+        result.fixed for result in api.lti_tools.fix_lti_users(f"user{index}@example.com" for index in range(10))
+    ),
+    "bulk_user_retirement.retire_all_users": lambda api: len(
+        api.bulk_user_retirement.retire_all_users(f"user{index}" for index in range(200)).succeeded
+    ),
+}
+
+
+def percentile(values, pct):
+    """The pct-th percentile of the values, using linear interpolation"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run_scenario(scenario, make_api, iterations, concurrency=1, warmup=1):
+    """
+    Measures a scenario.
+
+    Args:
+        scenario (callable): a function taking an EdxApi and returning the number of items processed
+        make_api (callable): builds the EdxApi the scenario runs against
+        iterations (int): number of measured runs
+        concurrency (int): number of threads running the iterations
+        warmup (int): number of unmeasured runs made first
+
+    Returns:
+        dict: the measurements
+    """
+    api = make_api()
+    for _ in range(warmup):
+        scenario(api)
+
+    def timed(_):
+        start = time.perf_counter()
+        items = scenario(api)
+        return time.perf_counter() - start, items
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(timed, range(iterations)))
+    else:
+        samples = [timed(index) for index in range(iterations)]
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = [latency for latency, _ in samples]
+    items = sum(count for _, count in samples)
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "ops_per_sec": iterations / elapsed,
+        "items_per_sec": items / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+def format_results(results, coalesce_requests=False):
+    """Renders the results as a text table"""
+    setting = "on" if coalesce_requests else "off"
+    header = f"{'scenario':<45}{'ops/s':>10}{'items/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>11}"
+    lines = [f"request coalescing: {setting}", header, "-" * len(header)]
+    for name, result in results.items():
+        lines.append(
+            f"{name:<45}{result['ops_per_sec']:>10.1f}{result['items_per_sec']:>12.1f}"
+            f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{result['peak_mem_kb']:>11.1f}"
+        )
+    return "\n".join(lines)
+
+
+def run_scenarios(scenarios, base_url, transport, args):
+    """Runs the scenarios against base_url, returning the results by scenario name"""
+    def make_api():
+        return EdxApi(
+            {"access_token": "benchmark"}, base_url, transport=transport, coalesce_requests=args.coalesce
+        )
+
+    return {
+        name: dict(run_scenario(scenario, make_api, args.iterations, args.concurrency), coalesce_requests=args.coalesce)
+        for name, scenario in scenarios.items()
+    }
+
+
+def parse_args(argv):
+    """Parses the command line"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", help="substring of the scenarios to run (repeatable)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--coalesce", action="store_true", help="coalesce concurrent identical GET requests, as EdxApi does by default"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--enrollments", type=int, default=2000)
+    parser.add_argument("--grades", type=int, default=2000)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--course-runs", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=5000)
+    parser.add_argument("--json", help="write the results to this file")
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--record", help="record the fake server responses into this cassette")
+    recording.add_argument("--replay", help="replay the responses from this cassette instead of a server")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the benchmarks"""
+    args = parse_args(argv)
+    data = FakeEdxData(
+        num_courses=args.courses,
+        num_enrollments=args.enrollments,
+        num_grades=args.grades,
+        num_course_runs=args.course_runs,
+        num_blocks=args.blocks,
+        page_size=args.page_size,
+    )
+    selected = {
+        name: scenario for name, scenario in SCENARIOS.items()
+        if not args.scenario or any(pattern in name for pattern in args.scenario)
+    }
+    if args.replay:
+        cassette = Cassette.load(args.replay)
+        transport = ReplayAdapter(cassette, latency=args.latency)
+        # the URLs recorded in the cassette embed the address of the recording server
+        recorded_url = urlsplit(next(iter(cassette.entries), "GET http://127.0.0.1/").split(" ", 1)[1])
+        results = run_scenarios(selected, f"{recorded_url.scheme}://{recorded_url.netloc}/", transport, args)
+    else:
+        cassette = Cassette(args.record) if args.record else None
+        transport = RecordingAdapter(cassette) if cassette else None
+        with FakeEdxServer(latency=args.latency, data=data) as server:
+            results = run_scenarios(selected, server.base_url, transport, args)
+        if cassette:
+            cassette.save()
+
+    print(format_results(results, args.coalesce))
+    if args.json:
+        with open(args.json, "w") as file_obj:
+            json.dump(results, file_obj, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
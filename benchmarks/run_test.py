@@ -0,0 +1,119 @@
+"""Tests for the benchmark suite"""
+import json
+import sys
+import types
+from argparse import Namespace
+from unittest.mock import patch
+
+from edx_api.client import EdxApi
+
+from . import decoding
+from .fake_edx import FakeEdxData, FakeEdxServer, course_id_for
+from .run import SCENARIOS, main, percentile, run_scenario, run_scenarios
+
+
+def test_fake_server_pagination():
+    """the fake server paginates like edX does"""
+    data = FakeEdxData(num_enrollments=25, num_grades=25, num_courses=7, page_size=10, num_blocks=50)
+    with FakeEdxServer(data=data) as server:
+        api = EdxApi({"access_token": "token"}, server.base_url)
+        assert len(list(api.enrollments.get_enrollments())) == 25
+        grades = api.current_grades.get_course_current_grades(course_id_for(0))
+        assert len(grades.all_current_grades) == 25
+        assert len(list(api.course_list.get_courses())) == 7
+        assert len(list(api.course_structure.course_blocks(course_id_for(0), "staff").blocks)) == 50
+
+
+def test_every_scenario_runs():
+    """each scenario runs against the fake server and processes items"""
+    data = FakeEdxData(
+        num_courses=12, num_enrollments=30, num_grades=30, num_course_runs=12, num_blocks=40, page_size=10
+    )
+    with FakeEdxServer(data=data) as server:
+        for name, scenario in SCENARIOS.items():
+            result = run_scenario(
+                scenario, lambda: EdxApi({"access_token": "token"}, server.base_url), iterations=2
+            )
+            assert result["items_per_sec"] > 0, name
+            assert result["p99_ms"] >= result["p50_ms"]
+
+
+def test_every_iteration_reaches_the_server():
+    """the concurrent iterations of a scenario are not coalesced, each one makes its requests"""
+    data = FakeEdxData(
+        num_courses=12, num_enrollments=30, num_grades=30, num_course_runs=12, num_blocks=40, page_size=10
+    )
+    args = Namespace(iterations=6, concurrency=3, coalesce=False)
+    with FakeEdxServer(data=data) as server:
+        for name, scenario in SCENARIOS.items():
+            received = server.requests
+            scenario(EdxApi({"access_token": "token"}, server.base_url, coalesce_requests=False))
+            per_run = server.requests - received
+            assert per_run > 0, name
+
+            received = server.requests
+            results = run_scenarios({name: scenario}, server.base_url, None, args)
+            # the warmup run and the measured iterations
+            assert server.requests - received == (1 + args.iterations) * per_run, name
+            assert results[name]["coalesce_requests"] is False
+
+
+def test_main_writes_json(tmp_path, capsys):
+    """the command line runs the selected scenarios and writes the results"""
+    output = tmp_path / "results.json"
+    main([
+        "--scenario", "course_detail", "--iterations", "2", "--concurrency", "2",
+        "--blocks", "10", "--json", str(output),
+    ])
+    printed = capsys.readouterr().out
+    assert "course_detail.get_detail" in printed
+    assert "request coalescing: off" in printed
+    results = json.loads(output.read_text())
+    assert list(results) == ["course_detail.get_detail"]
+    assert results["course_detail.get_detail"]["coalesce_requests"] is False
+
+
+def test_main_coalesce(capsys):
+    """--coalesce runs the scenarios with request coalescing, as EdxApi does by default"""
+    main(["--scenario", "course_detail", "--iterations", "2", "--concurrency", "2", "--blocks", "10", "--coalesce"])
+    assert "request coalescing: on" in capsys.readouterr().out
+
+
+def test_percentile():
+    """percentiles interpolate between samples"""
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert percentile([1, 2], 50) == 1.5
+    assert percentile([7], 99) == 7
+
+
+def test_record_then_replay(tmp_path, capsys):
+    """a recorded run can be replayed without the fake server"""
+    cassette = str(tmp_path / "edx.json.gz")
+    main(["--scenario", "course_runs", "--iterations", "2", "--course-runs", "5", "--record", cassette])
+    capsys.readouterr()
+    main(["--scenario", "course_runs", "--iterations", "2", "--replay", cassette])
+    assert "course_runs.get_course_runs_list" in capsys.readouterr().out
+
+
+def test_decoding_benchmark(capsys):
+    """every payload shape is decoded by every installed decoder"""
+    decoding.main(["--repeat", "2", "--page-size", "5", "--blocks", "10"])
+    output = capsys.readouterr().out
+    for payload in ("enrollments page", "grades page", "course runs page", "course blocks"):
+        assert payload in output
+    assert len(output.splitlines()) == 1 + 4 * len(decoding.decoders())
+
+
+def test_decoders_lists_every_installed_library():
+    """orjson and msgspec are both measured when both are installed, neither when missing"""
+    orjson = types.SimpleNamespace(loads=lambda body: "orjson")
+    msgspec = types.SimpleNamespace(json=types.SimpleNamespace(decode=lambda body: "msgspec"))
+    with patch.dict(sys.modules, {"orjson": orjson, "msgspec": msgspec}):
+        installed = decoding.decoders()
+    assert list(installed) == ["json", "orjson", "msgspec"]
+    assert installed["msgspec"](b"{}") == "msgspec"
+
+    with patch.dict(sys.modules, {"orjson": None, "msgspec": msgspec}):
+        assert list(decoding.decoders()) == ["json", "msgspec"]
+    with patch.dict(sys.modules, {"orjson": None, "msgspec": None}):
+        assert list(decoding.decoders()) == ["json"]
@@ -0,0 +1,211 @@
+"""
+Credential providers for the edX API client.
+
+A credential provider hands out the access token used for a token type ("Bearer"
+or "jwt") and renews it when needed. TokenAuth plugs a provider into a requests
+session: the current token is added to every request and a request rejected with
+a 401 is retried once with a renewed token.
+"""
+import threading
+import time
+from urllib.parse import urljoin
+
+import requests
+from requests.auth import AuthBase
+
+from . import DEFAULT_TIME_OUT
+
+ACCESS_TOKEN_URL = "/oauth2/access_token"
+# the lifetime assumed for a token issued without expires_in, a token rejected
+# earlier is renewed by the 401 retry
+DEFAULT_TOKEN_LIFETIME = 3600
+
+
+class StaticTokenProvider:
+    """
+    Provides an access token that can not be renewed
+    """
+
+    def __init__(self, access_token):
+        """
+        Args:
+            access_token (str): the access token
+        """
+        self.access_token = access_token
+
+    def get_token(self, token_type="Bearer"):  # pylint: disable=unused-argument
+        """
+        Returns the access token
+
+        Args:
+            token_type (str): the token type the token is used with
+
+        Returns:
+            str: the access token
+        """
+        return self.access_token
+
+    def invalidate(self, token_type, token):  # pylint: disable=unused-argument
+        """
+        Reports a rejected token, a static token can not be renewed
+
+        Returns:
+            bool: whether a new token can be requested
+        """
+        return False
+
+
+class ClientCredentialsProvider:
+    """
+    Obtains access tokens from the edX OAuth2 provider with the client credentials grant.
+
+    Tokens are cached per token type and renewed `refresh_margin` seconds before they
+    expire. The provider is safe to share between threads, a single thread renews an
+    expired token while the others wait for it.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        token_url,
+        refresh_margin=60,
+        timeout=DEFAULT_TIME_OUT,
+        session=None,
+    ):
+        """
+        Args:
+            client_id (str): the OAuth2 application client id
+            client_secret (str): the OAuth2 application client secret
+            token_url (str): the URL of the edX access token endpoint
+            refresh_margin (float): seconds before the expiry at which tokens are renewed
+            timeout (float): timeout of the token requests
+            session (requests.Session): session used to request the tokens
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self._session = session
+        self._lock = threading.Lock()
+        self._tokens = {}
+
+    @classmethod
+    def for_base_url(cls, base_url, client_id, client_secret, **kwargs):
+        """
+        Builds a provider using the access token endpoint of an edX instance
+
+        Args:
+            base_url (str): the base URL of the edX instance
+            client_id (str): the OAuth2 application client id
+            client_secret (str): the OAuth2 application client secret
+
+        Returns:
+            ClientCredentialsProvider
+        """
+        return cls(client_id, client_secret, urljoin(base_url, ACCESS_TOKEN_URL), **kwargs)
+
+    def _request_token(self, token_type):
+        """
+        Requests a new access token
+
+        Returns:
+            tuple: the access token and the monotonic time it expires at
+        """
+        session = self._session or requests
+        payload = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        if token_type.lower() == "jwt":
+            payload["token_type"] = "jwt"
+        requested_at = time.monotonic()
+        resp = session.post(self.token_url, data=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        token = resp.json()
+        expires_in = token.get("expires_in")
+        lifetime = float(expires_in) if expires_in is not None else DEFAULT_TOKEN_LIFETIME
+        return token["access_token"], requested_at + lifetime
+
+    def get_token(self, token_type="Bearer"):
+        """
+        Returns a valid access token, requesting a new one if the cached token is about to expire
+
+        Args:
+            token_type (str): the token type the token is used with ("Bearer" or "jwt")
+
+        Returns:
+            str: the access token
+        """
+        key = token_type.lower()
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is None or time.monotonic() >= cached[1] - self.refresh_margin:
+                cached = self._tokens[key] = self._request_token(token_type)
+            return cached[0]
+
+    def invalidate(self, token_type, token):
+        """
+        Reports a rejected token so that the next get_token call renews it. Tokens
+        already renewed by another thread are left alone.
+
+        Args:
+            token_type (str): the token type the token was used with
+            token (str): the rejected token
+
+        Returns:
+            bool: whether a new token can be requested
+        """
+        key = token_type.lower()
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is not None and cached[0] == token:
+                del self._tokens[key]
+        return True
+
+
+class TokenAuth(AuthBase):
+    """
+    requests authentication using a credential provider, retrying once on 401
+    """
+
+    def __init__(self, provider, token_type="Bearer"):
+        """
+        Args:
+            provider (object): the credential provider
+            token_type (str): the token type, used as the Authorization scheme
+        """
+        self.provider = provider
+        self.token_type = token_type
+
+    def _authorization(self):
+        """The Authorization header value for the current token"""
+        return f"{self.token_type} {self.provider.get_token(self.token_type)}"
+
+    def __call__(self, request):
+        request.headers["Authorization"] = self._authorization()
+        request.register_hook("response", self.retry_unauthorized)
+        return request
+
+    def retry_unauthorized(self, response, **kwargs):
+        """
+        Response hook sending a request rejected with a 401 again with a renewed token
+        """
+        if response.status_code != 401 or response.history:
+            return response
+        rejected = response.request.headers.get("Authorization", "").split(" ", 1)[-1]
+        if not self.provider.invalidate(self.token_type, rejected):
+            return response
+
+        # release the connection before sending the request again
+        response.content  # pylint: disable=pointless-statement
+        response.close()
+        retry = response.request.copy()
+        retry.headers["Authorization"] = self._authorization()
+        retried = response.connection.send(retry, **kwargs)
+        retried.history.append(response)
+        retried.request = retry
+        return retried
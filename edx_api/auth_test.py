@@ -0,0 +1,134 @@
+"""Tests for the credential providers"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import HTTPError
+
+from .auth import DEFAULT_TOKEN_LIFETIME, ClientCredentialsProvider, StaticTokenProvider
+from .client import EdxApi
+
+BASE_URL = "http://edx.example.com"
+TOKEN_URL = f"{BASE_URL}/oauth2/access_token"
+USER_INFO_URL = f"{BASE_URL}/api/mobile/v0.5/my_user_info"
+CREDENTIALS = {"client_id": "id", "client_secret": "secret"}
+
+
+def _token_responses(*tokens, expires_in=3600):
+    """requests_mock responses issuing the given tokens in order"""
+    return [{"json": {"access_token": token, "expires_in": expires_in}} for token in tokens]
+
+
+def test_client_credentials_request(requests_mock):
+    """tokens are requested with the client credentials grant, per token type"""
+    requests_mock.post(TOKEN_URL, _token_responses("bearer-token", "jwt-token"))
+    provider = ClientCredentialsProvider.for_base_url(BASE_URL, "id", "secret")
+
+    assert provider.get_token("Bearer") == "bearer-token"
+    assert provider.get_token("jwt") == "jwt-token"
+    assert provider.get_token("Bearer") == "bearer-token"
+    assert requests_mock.call_count == 2
+    first, second = requests_mock.request_history
+    assert "grant_type=client_credentials" in first.text
+    assert "token_type=jwt" not in first.text
+    assert "token_type=jwt" in second.text
+
+
+def test_proactive_renewal(requests_mock):
+    """tokens are renewed refresh_margin seconds before they expire"""
+    requests_mock.post(TOKEN_URL, _token_responses("first", "second", expires_in=100))
+    provider = ClientCredentialsProvider(
+        "id", "secret", TOKEN_URL, refresh_margin=10
+    )
+    with patch("edx_api.auth.time.monotonic", return_value=1000):
+        assert provider.get_token() == "first"
+    with patch("edx_api.auth.time.monotonic", return_value=1089):
+        assert provider.get_token() == "first"
+    with patch("edx_api.auth.time.monotonic", return_value=1091):
+        assert provider.get_token() == "second"
+
+
+def test_token_without_expiry(requests_mock):
+    """a token issued without expires_in is reused for DEFAULT_TOKEN_LIFETIME seconds"""
+    requests_mock.post(TOKEN_URL, [{"json": {"access_token": "first"}}, {"json": {"access_token": "second"}}])
+    provider = ClientCredentialsProvider("id", "secret", TOKEN_URL, refresh_margin=60)
+    with patch("edx_api.auth.time.monotonic", return_value=1000):
+        assert provider.get_token() == "first"
+        assert provider.get_token() == "first"
+    with patch("edx_api.auth.time.monotonic", return_value=1000 + DEFAULT_TOKEN_LIFETIME - 61):
+        assert provider.get_token() == "first"
+    assert requests_mock.call_count == 1
+    with patch("edx_api.auth.time.monotonic", return_value=1000 + DEFAULT_TOKEN_LIFETIME):
+        assert provider.get_token() == "second"
+
+
+def test_single_refresh_across_threads(requests_mock):
+    """threads needing a token concurrently trigger a single token request"""
+    requests_mock.post(TOKEN_URL, _token_responses("token"))
+    provider = ClientCredentialsProvider("id", "secret", TOKEN_URL)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tokens = set(pool.map(lambda _: provider.get_token(), range(32)))
+    assert tokens == {"token"}
+    assert requests_mock.call_count == 1
+
+
+def test_invalidate_only_rejected_token(requests_mock):
+    """a token already renewed by another thread is not dropped again"""
+    requests_mock.post(TOKEN_URL, _token_responses("first", "second", "third"))
+    provider = ClientCredentialsProvider("id", "secret", TOKEN_URL)
+    assert provider.get_token() == "first"
+    assert provider.invalidate("Bearer", "first")
+    assert provider.get_token() == "second"
+    provider.invalidate("Bearer", "first")
+    assert provider.get_token() == "second"
+
+
+def test_client_retries_once_on_401(requests_mock):
+    """a request rejected with a 401 is sent again with a renewed token"""
+    requests_mock.post(TOKEN_URL, _token_responses("expired", "renewed"))
+    requests_mock.get(USER_INFO_URL, [
+        {"status_code": 401},
+        {"json": {"username": "staff"}},
+    ])
+    api = EdxApi(CREDENTIALS, BASE_URL)
+
+    assert api.user_info.get_user_info().username == "staff"
+    authorizations = [
+        request.headers["Authorization"] for request in requests_mock.request_history
+        if request.url == USER_INFO_URL
+    ]
+    assert authorizations == ["Bearer expired", "Bearer renewed"]
+
+
+def test_client_gives_up_after_one_retry(requests_mock):
+    """a second 401 is returned to the caller"""
+    requests_mock.post(TOKEN_URL, _token_responses("first", "second"))
+    requests_mock.get(USER_INFO_URL, status_code=401)
+    api = EdxApi(CREDENTIALS, BASE_URL)
+
+    with pytest.raises(HTTPError):
+        api.user_info.get_user_info()
+    assert len([request for request in requests_mock.request_history if request.url == USER_INFO_URL]) == 2
+
+
+def test_static_token_not_retried(requests_mock):
+    """requests made with a static token are not retried"""
+    requests_mock.get(USER_INFO_URL, status_code=401)
+    api = EdxApi({"access_token": "token"}, BASE_URL, credentials_provider=StaticTokenProvider("token"))
+
+    with pytest.raises(HTTPError):
+        api.user_info.get_user_info()
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.headers["Authorization"] == "Bearer token"
+
+
+def test_jwt_sub_clients_use_jwt_tokens(requests_mock):
+    """the CMS sub-clients request jwt tokens"""
+    requests_mock.post(TOKEN_URL, _token_responses("jwt-token"))
+    course_run_url = f"{BASE_URL}/api/v1/course_runs/course-v1:edX+DemoX+Demo_Course/"
+    requests_mock.get(course_run_url, json={"id": "course-v1:edX+DemoX+Demo_Course"})
+    api = EdxApi(CREDENTIALS, BASE_URL)
+
+    api.course_runs.get_course_run("course-v1:edX+DemoX+Demo_Course")
+    assert "token_type=jwt" in requests_mock.request_history[0].text
+    assert requests_mock.last_request.headers["Authorization"] == "jwt jwt-token"
@@ -0,0 +1,331 @@
+"""
+Helpers for the bulk operations of the sub-clients
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from requests.exceptions import ConnectionError as RequestsConnectionError, HTTPError, Timeout
+
+from edx_api.serialization import loads
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class BulkResult(namedtuple("BulkResult", ["item", "value", "error"])):
+    """
+    The outcome of a bulk operation for one item: the value returned, or the error raised
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """Whether the operation succeeded for this item"""
+        return self.error is None
+
+
+def _call(func, item, rate_limiter=None):
+    """Calls func on an item, capturing the error it raises"""
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    try:
+        return BulkResult(item, func(item), None)
+    except Exception as error:  # pylint: disable=broad-except
+        return BulkResult(item, None, error)
+
+
+def map_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None):
+    """
+    Calls func on every item from a pool of threads
+
+    An error raised for an item does not stop the others, it is returned in its result.
+
+    Args:
+        func (callable): the operation, called with one item
+        items (iterable): the items
+        max_workers (int): the maximum number of concurrent calls
+        rate_limiter (RateLimiter): limits the rate at which the calls start
+
+    Returns:
+        list of BulkResult: the results, in the order of the items
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [_call(func, item, rate_limiter) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda item: _call(func, item, rate_limiter), items))
+
+
+def map_in_processes(func, items, processes=None, chunksize=1, executor=None):
+    """
+    Calls func on every item from a pool of processes, for CPU bound work that
+    threads would serialize on the GIL.
+
+    The function, the items and the values returned are pickled between the processes:
+    func must be defined at the top level of a module (or be a partial of one), and it
+    should return compact values.
+
+    Args:
+        func (callable): the operation, called with one item
+        items (iterable): the items
+        processes (int): the number of processes, the number of CPUs if None
+        chunksize (int): the number of items sent to a process at once
+        executor (ProcessPoolExecutor): a pool reused across calls (see process_pool), a pool of
+            `processes` is started and shut down for this call if None
+
+    Returns:
+        list of BulkResult: the results, in the order of the items
+    """
+    items = list(items)
+    if not items:
+        return []
+    if executor is not None:
+        return list(executor.map(partial(_call, func), items, chunksize=chunksize))
+    with process_pool(processes or os.cpu_count()) as pool:
+        return list(pool.map(partial(_call, func), items, chunksize=chunksize))
+
+
+@contextmanager
+def process_pool(processes):
+    """
+    A pool of processes for map_in_processes, shared by all the chunks of a bulk operation
+    so that the processes are started once
+
+    Args:
+        processes (int): the number of processes, None (or 0) for no pool
+
+    Yields:
+        ProcessPoolExecutor: the pool, or None when processes is not set
+    """
+    if not processes:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield executor
+
+
+def decode_and_build(build, body):
+    """
+    Decodes a JSON body and builds a value from it, the work done by map_in_processes
+    for the bulk fetches (see e.g. CourseStructure.course_blocks_many)
+
+    Args:
+        build (callable): builds the value from the decoded JSON
+        body (bytes): the JSON document
+
+    Returns:
+        object: the value built
+    """
+    return build(loads(body))
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket: calls are let through at `rate` per second on average,
+    with bursts of up to `burst` calls.
+
+    A limiter can be shared by several bulk operations to bound their combined rate.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate (float): the calls allowed per second
+            burst (int): the calls allowed at once after an idle period
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def acquire(self):
+        """
+        Waits until a call is allowed
+
+        Returns:
+            float: the seconds waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # the token is reserved now, the caller waits for it outside of the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def chunked(items, size):
+    """
+    Splits an iterable into lists of at most size items, lazily
+
+    Args:
+        items (iterable): the items
+        size (int): the maximum size of a chunk
+
+    Yields:
+        list: the chunks
+    """
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def is_transient(error):
+    """
+    Whether a request error is worth retrying: connection errors, timeouts,
+    429 Too Many Requests and 5xx responses
+
+    Args:
+        error (Exception): the error raised by a request
+
+    Returns:
+        bool: True if the request may succeed if sent again
+    """
+    if isinstance(error, (RequestsConnectionError, Timeout)):
+        return True
+    if isinstance(error, HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+def call_with_retries(func, *args, retries=3, backoff=1.0, should_retry=is_transient, **kwargs):
+    """
+    Calls func, calling it again after an exponential backoff when it fails with a transient error
+
+    Args:
+        func (callable): the function to call
+        *args: its positional arguments
+        retries (int): the number of retries after the first call
+        backoff (float): the delay before the first retry in seconds, doubled for every other retry
+        should_retry (callable): whether an error is worth retrying
+        **kwargs: its keyword arguments
+
+    Returns:
+        object: the value returned by func
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            if attempt >= retries or not should_retry(error):
+                raise
+        time.sleep(backoff * 2 ** attempt)
+        attempt += 1
+
+
+class ProgressLog:
+    """
+    A record of the items a bulk operation went through, appended to a JSON lines file
+    as it goes, so that an interrupted operation can resume without redoing them.
+
+    Items are identified by a string. The last record of an item wins.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): the file the progress is kept in, None to keep it in memory only
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = {}
+        if path is not None and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path):
+        """
+        Reads the records of a file. The last line is partial when the process was killed
+        while appending it: it is dropped, and the file truncated so that the next record
+        starts on a line of its own.
+        """
+        with open(path, "r+b") as file_obj:
+            offset = 0
+            for line in file_obj:
+                try:
+                    record = json.loads(line) if line.strip() else None
+                except ValueError:
+                    if line.endswith(b"\n"):
+                        raise
+                    log.warning("Dropping the partial last record of %s: %r", path, line)
+                    file_obj.truncate(offset)
+                    return
+                if record is not None:
+                    self._records[record["item"]] = record
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    # the record is complete, its line break is not
+                    file_obj.seek(0, os.SEEK_END)
+                    file_obj.write(b"\n")
+
+    def record(self, item, ok, **details):
+        """
+        Records the outcome of an item
+
+        Args:
+            item (str): the item
+            ok (bool): whether it succeeded
+            **details: JSON serializable details kept with the record, e.g. the error
+        """
+        record = dict(details, item=item, ok=ok)
+        with self._lock:
+            self._records[item] = record
+            if self.path is not None:
+                with open(self.path, "a") as file_obj:
+                    file_obj.write(json.dumps(record) + "\n")
+
+    def is_done(self, item):
+        """
+        Whether an item succeeded
+
+        Args:
+            item (str): the item
+
+        Returns:
+            bool: True if its last record is a success
+        """
+        with self._lock:
+            record = self._records.get(item)
+        return record is not None and record["ok"]
+
+    def get(self, item):
+        """
+        Returns the last record of an item, or None
+
+        Args:
+            item (str): the item
+
+        Returns:
+            dict: the record, with the item, ok and the details
+        """
+        with self._lock:
+            return self._records.get(item)
+
+    @property
+    def done(self):
+        """The items which succeeded"""
+        with self._lock:
+            return {item for item, record in self._records.items() if record["ok"]}
+
+    @property
+    def failed(self):
+        """The records of the items which failed, by item"""
+        with self._lock:
+            return {item: record for item, record in self._records.items() if not record["ok"]}
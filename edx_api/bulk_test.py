@@ -0,0 +1,168 @@
+"""Tests for the bulk operation helpers"""
+import os
+import threading
+from unittest.mock import Mock, call, patch
+
+import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError, HTTPError, Timeout
+
+from .bulk import (
+    BulkResult, ProgressLog, RateLimiter, call_with_retries, chunked, decode_and_build, is_transient,
+    map_concurrently, map_in_processes, process_pool,
+)
+
+
+def test_map_concurrently():
+    """results keep the order of the items and capture the errors"""
+    def square(value):
+        if value == 3:
+            raise ValueError("three")
+        return value * value
+
+    results = map_concurrently(square, range(6), max_workers=3)
+    assert [result.item for result in results] == list(range(6))
+    assert [result.value for result in results if result.ok] == [0, 1, 4, 16, 25]
+    assert isinstance(results[3].error, ValueError)
+    assert not results[3].ok
+    assert map_concurrently(square, []) == []
+
+
+def test_map_concurrently_runs_in_parallel():
+    """up to max_workers calls run at the same time"""
+    barrier = threading.Barrier(4, timeout=5)
+    results = map_concurrently(lambda item: barrier.wait() is not None, range(4), max_workers=4)
+    assert all(result.ok for result in results)
+
+
+def test_sequential():
+    """a single worker runs the calls in the calling thread"""
+    results = map_concurrently(lambda item: threading.current_thread(), range(3), max_workers=1)
+    assert {result.value for result in results} == {threading.current_thread()}
+    assert results[0] == BulkResult(0, threading.current_thread(), None)
+
+
+def process_id(_item):
+    """The id of the process an item is handled in"""
+    return os.getpid()
+
+
+def test_map_in_processes():
+    """the calls run in other processes, the errors are captured"""
+    results = map_in_processes(int, ["1", "two", "3"], processes=2)
+    assert [result.value for result in results] == [1, None, 3]
+    assert isinstance(results[1].error, ValueError)
+    assert os.getpid() not in {result.value for result in map_in_processes(process_id, range(4), processes=2)}
+    assert map_in_processes(int, [], processes=2) == []
+
+
+def test_process_pool():
+    """a pool is reused by the calls given it, no pool is started without processes"""
+    with process_pool(2) as executor:
+        first = {result.value for result in map_in_processes(process_id, range(4), executor=executor)}
+        second = {result.value for result in map_in_processes(process_id, range(4), executor=executor)}
+    assert len(first | second) <= 2
+    with process_pool(None) as executor:
+        assert executor is None
+
+
+def test_decode_and_build():
+    """the body is decoded before the value is built"""
+    assert decode_and_build(sorted, b'[3, 1, 2]') == [1, 2, 3]
+
+
+def test_chunked():
+    """iterables are split lazily into chunks"""
+    assert list(chunked(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_call_with_retries():
+    """transient errors are retried with an exponential backoff"""
+    response = Mock(status_code=502)
+    func = Mock(side_effect=[RequestsConnectionError(), HTTPError(response=response), "done"])
+    with patch("edx_api.bulk.time.sleep") as sleep:
+        assert call_with_retries(func, "arg", retries=3, backoff=0.5, key="value") == "done"
+    assert sleep.call_args_list == [call(0.5), call(1.0)]
+    func.assert_called_with("arg", key="value")
+
+    func = Mock(side_effect=HTTPError(response=Mock(status_code=404)))
+    with pytest.raises(HTTPError):
+        call_with_retries(func)
+    assert func.call_count == 1
+
+    func = Mock(side_effect=Timeout())
+    with patch("edx_api.bulk.time.sleep"), pytest.raises(Timeout):
+        call_with_retries(func, retries=2)
+    assert func.call_count == 3
+
+
+def test_is_transient():
+    """connection errors, timeouts, 429 and 5xx are transient"""
+    assert is_transient(Timeout())
+    assert is_transient(HTTPError(response=Mock(status_code=429)))
+    assert not is_transient(HTTPError(response=Mock(status_code=403)))
+    assert not is_transient(ValueError())
+
+
+def test_progress_log(tmp_path):
+    """the progress is appended to a file and read back, the last record wins"""
+    path = str(tmp_path / "progress.jsonl")
+    progress = ProgressLog(path)
+    progress.record("a", True)
+    progress.record("b", False, error="boom")
+    progress.record("c", False, error="boom")
+    progress.record("c", True)
+
+    resumed = ProgressLog(path)
+    assert resumed.done == {"a", "c"}
+    assert resumed.failed == {"b": {"item": "b", "ok": False, "error": "boom"}}
+    assert resumed.is_done("a")
+    assert not resumed.is_done("b")
+    assert not resumed.is_done("d")
+    assert ProgressLog().done == set()
+
+
+def test_progress_log_partial_last_line(tmp_path):
+    """a record cut short by a crash is dropped, the next records are appended after the others"""
+    path = tmp_path / "progress.jsonl"
+    path.write_text('{"item": "a", "ok": true}\n{"item": "b", "ok": tr')
+
+    progress = ProgressLog(str(path))
+    assert progress.done == {"a"}
+    progress.record("b", True)
+    assert ProgressLog(str(path)).done == {"a", "b"}
+
+    path.write_text('{"item": "a", "ok": true}')
+    ProgressLog(str(path)).record("b", True)
+    assert ProgressLog(str(path)).done == {"a", "b"}
+
+
+def test_progress_log_corrupted(tmp_path):
+    """an undecodable record followed by others is not a crash, it is reported"""
+    path = tmp_path / "progress.jsonl"
+    path.write_text('{"item": "a", "ok": tr\n{"item": "b", "ok": true}\n')
+    with pytest.raises(ValueError):
+        ProgressLog(str(path))
+
+
+def test_rate_limiter():
+    """calls are spaced to the rate once the burst is used"""
+    with patch("edx_api.bulk.time.monotonic", return_value=100.0), patch("edx_api.bulk.time.sleep") as sleep:
+        limiter = RateLimiter(10, burst=2)
+        waits = [limiter.acquire() for _ in range(4)]
+    assert waits == [0.0, 0.0, pytest.approx(0.1), pytest.approx(0.2)]
+    assert [args[0] for args, _ in sleep.call_args_list] == [pytest.approx(0.1), pytest.approx(0.2)]
+
+    with patch("edx_api.bulk.time.monotonic", return_value=101.0):
+        assert limiter.acquire() == 0.0
+
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_map_concurrently_rate_limited():
+    """the rate limiter is acquired before every call"""
+    limiter = Mock()
+    results = map_concurrently(lambda item: item, range(3), rate_limiter=limiter)
+    assert [result.value for result in results] == [0, 1, 2]
+    assert limiter.acquire.call_count == 3
@@ -2,10 +2,20 @@
 API client for interacting with user retirement API
 """
 import logging
+from collections import namedtuple
 from urllib import parse
 
+from edx_api.bulk import ProgressLog, call_with_retries, chunked, map_concurrently
+
 log = logging.getLogger(__name__)
 
+# edX resolves every user of a request in one transaction, keep the requests small
+RETIREMENT_CHUNK_SIZE = 100
+
+# the outcome of retire_all_users: the usernames retired, the failures (reason by
+# username) and the usernames already retired by a previous run
+RetirementReport = namedtuple("RetirementReport", ["succeeded", "failed", "skipped"])
+
 
 class BulkUserRetirement:
     """
@@ -34,3 +44,61 @@ class BulkUserRetirement:
 
         response.raise_for_status()
         return response.json()
+
+    # pylint: disable=too-many-arguments
+    def retire_all_users(
+        self, usernames, chunk_size=RETIREMENT_CHUNK_SIZE, max_workers=4, retries=3, backoff=1.0, progress_log=None
+    ):
+        """
+        Retires many users, in chunks sent concurrently.
+
+        A chunk failing with a transient error (connection error, timeout, 429 or 5xx) is
+        sent again after a backoff. The outcome of every user is recorded in the progress
+        log as soon as its chunk completes: with a log kept in a file, running the
+        retirement again after an interruption skips the users already retired.
+
+        Args:
+            usernames (iterable): the usernames of the users to retire
+            chunk_size (int): the number of users per request
+            max_workers (int): the maximum number of concurrent requests
+            retries (int): the number of times a chunk is sent again
+            backoff (float): the delay before the first retry of a chunk in seconds, doubled for every other retry
+            progress_log (ProgressLog or str): the progress log, or the path of its file
+
+        Returns:
+            RetirementReport: the usernames retired, the failures and the usernames skipped
+        """
+        if progress_log is None or isinstance(progress_log, str):
+            progress_log = ProgressLog(progress_log)
+        skipped = []
+        pending = []
+        for username in dict.fromkeys(usernames):
+            (skipped if progress_log.is_done(username) else pending).append(username)
+
+        def retire_chunk(chunk):
+            """Retires a chunk of users, recording the outcome of each one"""
+            try:
+                response = call_with_retries(
+                    self.retire_users, {"usernames": ",".join(chunk)}, retries=retries, backoff=backoff
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                log.error("Failed to retire %d users: %s", len(chunk), error)
+                for username in chunk:
+                    progress_log.record(username, False, error=str(error))
+                return
+            retired = set(response.get("successful_user_retirements", []))
+            failed = set(response.get("failed_user_retirements", []))
+            for username in chunk:
+                if username in retired:
+                    progress_log.record(username, True)
+                else:
+                    reason = "retirement failed" if username in failed else "missing from the response"
+                    progress_log.record(username, False, error=reason)
+
+        map_concurrently(retire_chunk, chunked(pending, chunk_size), max_workers)
+        succeeded = [username for username in pending if progress_log.is_done(username)]
+        failed = {
+            username: progress_log.get(username)["error"]
+            for username in pending if not progress_log.is_done(username)
+        }
+        return RetirementReport(succeeded, failed, skipped)
@@ -0,0 +1,83 @@
+"""Tests for the bulk user retirement client"""
+from unittest.mock import patch
+from urllib.parse import urljoin
+
+import pytest
+
+from edx_api.bulk import ProgressLog
+from edx_api.bulk_user_retirement import BulkUserRetirement
+from edx_api.client import EdxApi
+
+BASE_URL = "http://edx.example.com/"
+API_URL = urljoin(BASE_URL, BulkUserRetirement.api_url)
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """the bulk user retirement client"""
+    return EdxApi({"access_token": "token"}, BASE_URL).bulk_user_retirement
+
+
+def retirement_response(request, context):  # pylint: disable=unused-argument
+    """retires the users of a request, except the ones whose name starts with 'fail'"""
+    usernames = request.json()["usernames"].split(",")
+    return {
+        "successful_user_retirements": [username for username in usernames if not username.startswith("fail")],
+        "failed_user_retirements": [username for username in usernames if username.startswith("fail")],
+    }
+
+
+def test_retire_users(client, requests_mock):
+    """the payload is posted as is"""
+    requests_mock.post(API_URL, json={"successful_user_retirements": ["a"], "failed_user_retirements": []})
+    assert client.retire_users({"usernames": "a"}) == {
+        "successful_user_retirements": ["a"], "failed_user_retirements": []
+    }
+    assert requests_mock.last_request.json() == {"usernames": "a"}
+
+
+def test_retire_all_users(client, requests_mock):
+    """the users are retired in chunks and the outcome of each one is reported"""
+    requests_mock.post(API_URL, json=retirement_response)
+    usernames = [f"user{index}" for index in range(25)] + ["fail1", "user0"]
+
+    report = client.retire_all_users(usernames, chunk_size=10, max_workers=2)
+
+    assert report.succeeded == [f"user{index}" for index in range(25)]
+    assert report.failed == {"fail1": "retirement failed"}
+    assert report.skipped == []
+    chunks = sorted(len(request.json()["usernames"].split(",")) for request in requests_mock.request_history)
+    assert chunks == [6, 10, 10]
+
+
+def test_retries_transient_errors(client, requests_mock):
+    """a chunk failing with a transient error is sent again, other errors fail the chunk"""
+    requests_mock.post(API_URL, [{"status_code": 503}, {"json": retirement_response}])
+    with patch("edx_api.bulk.time.sleep") as sleep:
+        report = client.retire_all_users(["a", "b"], backoff=0.5)
+    assert report.succeeded == ["a", "b"]
+    sleep.assert_called_once_with(0.5)
+
+    requests_mock.post(API_URL, status_code=400)
+    report = client.retire_all_users(["a", "b"])
+    assert report.succeeded == []
+    assert set(report.failed) == {"a", "b"}
+    assert "400" in report.failed["a"]
+
+
+def test_resumes_from_progress_log(client, requests_mock, tmp_path):
+    """the users already retired are not sent again"""
+    path = str(tmp_path / "retirement.jsonl")
+    requests_mock.post(API_URL, [
+        {"json": {"successful_user_retirements": ["a"], "failed_user_retirements": []}},
+        {"json": retirement_response},
+    ])
+    first = client.retire_all_users(["a", "b"], progress_log=path)
+    assert first.succeeded == ["a"]
+    assert first.failed == {"b": "missing from the response"}
+
+    second = client.retire_all_users(["a", "b", "c"], progress_log=path)
+    assert second.skipped == ["a"]
+    assert second.succeeded == ["b", "c"]
+    assert requests_mock.last_request.json() == {"usernames": "b,c"}
+    assert ProgressLog(path).done == {"a", "b", "c"}
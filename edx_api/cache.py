@@ -0,0 +1,100 @@
+"""
+A small in-process cache for the responses of the edX APIs
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe least recently used cache whose entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        """
+        Args:
+            maxsize (int): the maximum number of entries, the least recently used one is dropped to make room
+            ttl (float): the seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (value, expires at), least recently used first
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        """
+        Returns the value of a key, or default if it is absent or expired
+
+        Args:
+            key (hashable): the key
+            default (object): the value returned on a miss
+
+        Returns:
+            object: the cached value
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Caches a value
+
+        Args:
+            key (hashable): the key
+            value (object): the value
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Drops a key
+
+        Args:
+            key (hashable): the key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_if(self, predicate):
+        """
+        Drops the entries matching a predicate
+
+        Args:
+            predicate (callable): called with the key and the value of each entry
+
+        Returns:
+            int: the number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key, (value, _) in self._entries.items() if predicate(key, value)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """Drops every key"""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
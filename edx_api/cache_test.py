@@ -0,0 +1,53 @@
+"""Tests for the TTL cache"""
+from unittest.mock import patch
+
+from .cache import TTLCache
+
+
+def test_get_set():
+    """values are returned until they are invalidated"""
+    cache = TTLCache()
+    assert cache.get("key") is None
+    assert cache.get("key", "default") == "default"
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert "key" in cache
+    cache.invalidate("key")
+    assert "key" not in cache
+    cache.set("key", None)
+    assert "key" in cache
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_expiry():
+    """entries expire after ttl seconds"""
+    with patch("edx_api.cache.time.monotonic", return_value=100):
+        cache = TTLCache(ttl=10)
+        cache.set("key", "value")
+    with patch("edx_api.cache.time.monotonic", return_value=109.9):
+        assert cache.get("key") == "value"
+    with patch("edx_api.cache.time.monotonic", return_value=110):
+        assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_dropped():
+    """the least recently used entry makes room for new ones"""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_if():
+    """the entries matching the predicate are dropped"""
+    cache = TTLCache()
+    for key in range(5):
+        cache.set(key, key * 10)
+    assert cache.invalidate_if(lambda key, value: key % 2 == 0 or value == 30) == 4
+    assert [key for key in range(5) if key in cache] == [1]
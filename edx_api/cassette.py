@@ -0,0 +1,215 @@
+"""
+Record/replay transport adapters for the edX API client.
+
+A Cassette stores edX responses in a gzip compressed JSON file, indexed by the
+request method and URL (query params included, in a canonical order). The
+RecordingAdapter saves the real responses while the client is used normally, and
+the ReplayAdapter serves them back without network access, optionally simulating
+latency:
+
+    >>> cassette = Cassette("grades.json.gz")
+    >>> api = EdxApi(credentials, base_url, transport=RecordingAdapter(cassette))
+    >>> api.current_grades.get_course_current_grades(course_id)
+    >>> cassette.save()
+    >>> api = EdxApi(credentials, base_url, transport=ReplayAdapter(Cassette.load("grades.json.gz")))
+"""
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+CASSETTE_VERSION = 1
+# the recorded body is stored decoded, these headers would not match it anymore
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteError(Exception):
+    """Raised when a request can not be replayed from a cassette"""
+
+
+def request_key(method, url):
+    """
+    The cassette index of a request: the method and the URL with sorted query params.
+
+    Args:
+        method (str): the HTTP method
+        url (str): the full request URL
+
+    Returns:
+        str: the key identifying the request
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(parts._replace(query=query, fragment=''))}"
+
+
+class Cassette:
+    """
+    Recorded edX responses, several responses recorded for the same key are replayed in order.
+    """
+
+    def __init__(self, path=None, entries=None):
+        """
+        Args:
+            path (str): the file the cassette is saved to
+            entries (dict): recorded responses by request key
+        """
+        self.path = path
+        self.entries = entries or {}
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a cassette saved with Cassette.save
+
+        Args:
+            path (str): the cassette file
+
+        Returns:
+            Cassette
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file_obj:
+            data = json.load(file_obj)
+        if data.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version {data.get('version')}")
+        return cls(path, data["entries"])
+
+    def save(self, path=None):
+        """
+        Writes the cassette to disk
+
+        Args:
+            path (str): the file to write, defaults to the cassette path
+        """
+        path = path or self.path
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "entries": self.entries}
+            with gzip.open(path, "wt", encoding="utf-8") as file_obj:
+                json.dump(data, file_obj, separators=(",", ":"))
+
+    def record(self, method, url, response):
+        """
+        Adds a response to the cassette
+
+        Args:
+            method (str): the HTTP method of the request
+            url (str): the URL of the request
+            response (requests.Response): the response to record
+        """
+        content = response.content
+        try:
+            body, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+        entry = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            },
+            "body": body,
+            "encoding": encoding,
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        with self._lock:
+            self.entries.setdefault(request_key(method, url), []).append(entry)
+
+    def play(self, method, url):
+        """
+        Returns the next recorded response for a request, the last one is repeated once
+        they have all been played.
+
+        Args:
+            method (str): the HTTP method of the request
+            url (str): the URL of the request
+
+        Returns:
+            dict: the recorded entry
+        """
+        key = request_key(method, url)
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                raise CassetteError(f"No recorded response for {key}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        return recorded[min(position, len(recorded) - 1)]
+
+    def rewind(self):
+        """Replays the recorded responses from the start again"""
+        with self._lock:
+            self._positions.clear()
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Transport adapter sending the requests through another adapter and recording the responses.
+    """
+
+    def __init__(self, cassette, adapter=None):
+        """
+        Args:
+            cassette (Cassette): where the responses are recorded
+            adapter (BaseAdapter): the adapter actually sending the requests
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(request.method, request.url, response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter answering requests from a cassette, without network access.
+    """
+
+    def __init__(self, cassette, latency=0.0, recorded_latency=False):
+        """
+        Args:
+            cassette (Cassette): the recorded responses
+            latency (float): seconds to wait before returning each response
+            recorded_latency (bool): also wait for the time the recorded request took
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.recorded_latency = recorded_latency
+        self._builder = HTTPAdapter()
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        entry = self.cassette.play(request.method, request.url)
+        delay = self.latency + (entry["elapsed"] if self.recorded_latency else 0)
+        if delay:
+            time.sleep(delay)
+        if entry["encoding"] == "base64":
+            content = base64.b64decode(entry["body"])
+        else:
+            content = entry["body"].encode("utf-8")
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=entry["headers"],
+            status=entry["status"],
+            reason=entry["reason"],
+            preload_content=False,
+            decode_content=False,
+        )
+        return self._builder.build_response(request, raw)
+
+    def close(self):
+        self._builder.close()
@@ -0,0 +1,119 @@
+"""Tests for the record/replay transport adapters"""
+import gzip
+import json
+
+import pytest
+import requests_mock
+
+from .cassette import Cassette, CassetteError, RecordingAdapter, ReplayAdapter, request_key
+from .client import EdxApi
+
+BASE_URL = "http://edx.example.com"
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+GRADES_URL = f"{BASE_URL}/api/grades/v1/courses/{COURSE_ID}/"
+
+
+def _recording_api(cassette):
+    """An EdxApi recording the responses of a mocked edX into the cassette"""
+    mock_adapter = requests_mock.Adapter()
+    mock_adapter.register_uri("GET", GRADES_URL, json={
+        "next": f"{GRADES_URL}?page=2",
+        "results": [{"course_id": COURSE_ID, "username": "tomoko", "percent": 0.97, "passed": True}],
+    })
+    mock_adapter.register_uri("GET", f"{GRADES_URL}?page=2", json={
+        "next": None,
+        "results": [{"course_id": COURSE_ID, "username": "amir", "percent": 0.03, "passed": False}],
+    })
+    mock_adapter.register_uri("GET", f"{BASE_URL}/api/mobile/v0.5/my_user_info", [
+        {"json": {"username": "staff"}},
+        {"json": {"username": "renamed"}},
+    ])
+    return EdxApi(
+        {"access_token": "token"}, BASE_URL, transport=RecordingAdapter(cassette, adapter=mock_adapter)
+    )
+
+
+def test_request_key_is_canonical():
+    """query params are sorted and the method upper cased"""
+    assert request_key("get", "http://x.com/a?b=2&a=1") == request_key("GET", "http://x.com/a?a=1&b=2")
+    assert request_key("GET", "http://x.com/a?a=1") != request_key("POST", "http://x.com/a?a=1")
+
+
+def test_record_and_replay(tmp_path):
+    """responses recorded through a sub-client replay identically from disk"""
+    path = str(tmp_path / "grades.json.gz")
+    cassette = Cassette(path)
+    recorded = _recording_api(cassette).current_grades.get_course_current_grades(COURSE_ID)
+    cassette.save()
+
+    with gzip.open(path, "rt") as file_obj:
+        assert len(json.load(file_obj)["entries"]) == 2
+
+    api = EdxApi({"access_token": "token"}, BASE_URL, transport=ReplayAdapter(Cassette.load(path)))
+    replayed = api.current_grades.get_course_current_grades(COURSE_ID)
+    assert replayed.all_usernames == recorded.all_usernames == {"tomoko", "amir"}
+
+
+def test_replay_in_recorded_order(tmp_path):
+    """responses recorded for the same request are replayed in order, repeating the last"""
+    path = str(tmp_path / "user_info.json.gz")
+    cassette = Cassette(path)
+    api = _recording_api(cassette)
+    api.user_info.get_user_info(use_cache=False)
+    api.user_info.get_user_info(use_cache=False)
+    cassette.save()
+
+    cassette = Cassette.load(path)
+    api = EdxApi({"access_token": "token"}, BASE_URL, transport=ReplayAdapter(cassette))
+    usernames = [api.user_info.get_user_info(use_cache=False).username for _ in range(3)]
+    assert usernames == ["staff", "renamed", "renamed"]
+    cassette.rewind()
+    assert api.user_info.get_user_info(use_cache=False).username == "staff"
+
+
+def test_replay_latency():
+    """the configured and recorded latencies are simulated"""
+    cassette = Cassette()
+    cassette.entries[request_key("GET", GRADES_URL)] = [{
+        "status": 200, "reason": "OK", "headers": {}, "body": "[]", "encoding": "utf-8", "elapsed": 0.02,
+    }]
+    api = EdxApi(
+        {"access_token": "token"}, BASE_URL,
+        transport=ReplayAdapter(cassette, latency=0.01, recorded_latency=True),
+    )
+    response = api.get_requester().get(GRADES_URL)
+    assert response.json() == []
+    assert response.status_code == 200
+
+
+def test_binary_body_round_trip(tmp_path):
+    """non utf-8 bodies are stored base64 encoded"""
+    mock_adapter = requests_mock.Adapter()
+    mock_adapter.register_uri("GET", f"{BASE_URL}/image", content=b"\xff\xd8\xff")
+    cassette = Cassette(str(tmp_path / "binary.json.gz"))
+    session = EdxApi(
+        {"access_token": "token"}, BASE_URL, transport=RecordingAdapter(cassette, adapter=mock_adapter)
+    ).get_requester()
+    session.get(f"{BASE_URL}/image")
+    cassette.save()
+
+    session = EdxApi(
+        {"access_token": "token"}, BASE_URL, transport=ReplayAdapter(Cassette.load(cassette.path))
+    ).get_requester()
+    assert session.get(f"{BASE_URL}/image").content == b"\xff\xd8\xff"
+
+
+def test_replay_miss():
+    """requests that were not recorded fail loudly"""
+    api = EdxApi({"access_token": "token"}, BASE_URL, transport=ReplayAdapter(Cassette()))
+    with pytest.raises(CassetteError):
+        api.user_info.get_user_info()
+
+
+def test_unsupported_version(tmp_path):
+    """cassettes written by another format version are rejected"""
+    path = tmp_path / "old.json.gz"
+    with gzip.open(path, "wt") as file_obj:
+        json.dump({"version": 0, "entries": {}}, file_obj)
+    with pytest.raises(CassetteError):
+        Cassette.load(str(path))
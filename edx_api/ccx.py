@@ -4,6 +4,7 @@ API Client for interacting w/ CCXs
 import logging
 from urllib import parse
 
+from edx_api.bulk import DEFAULT_MAX_WORKERS, map_concurrently
 
 log = logging.getLogger(__name__)
 
@@ -53,3 +54,35 @@ class CCX:
             raise
 
         return resp.json()['ccx_course_id']
+
+    def create_many(self, specs, max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None):
+        """
+        Creates many CCXs concurrently
+
+        Args:
+            specs (list): the CCXs to create, dicts of the arguments of create, e.g.
+                {"master_course_id": ..., "coach_email": ..., "max_students_allowed": 200, "title": ...}
+            max_workers (int): the maximum number of concurrent requests
+            rate_limiter (RateLimiter): limits the rate of the requests, e.g. RateLimiter(5) for 5 per second
+
+        Returns:
+            list of BulkResult: the outcome of each spec, its value is the ccx_course_id
+        """
+        return map_concurrently(lambda spec: self.create(**spec), specs, max_workers, rate_limiter)
+
+    def retry_failed(self, results, max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None):
+        """
+        Creates again the CCXs whose creation failed
+
+        Args:
+            results (list of BulkResult): the results of create_many (or of a previous retry)
+            max_workers (int): the maximum number of concurrent requests
+            rate_limiter (RateLimiter): limits the rate of the requests
+
+        Returns:
+            list of BulkResult: the results, in the same order, the failed ones replaced by the new outcome
+        """
+        retried = iter(self.create_many(
+            [result.item for result in results if not result.ok], max_workers, rate_limiter
+        ))
+        return [result if result.ok else next(retried) for result in results]
@@ -3,7 +3,8 @@ import json
 import os.path
 import requests
 
-from unittest.mock import create_autospec
+from unittest.mock import Mock, create_autospec
+from .bulk import RateLimiter
 from .ccx import CCX
 
 
@@ -19,3 +20,43 @@ def test_create():
     result = ccx.create('course-id', 'foo@bar.com', 100, 'test title')
 
     assert result == "ccx-v1:Organization+EX101+RUN-FALL2099+ccx@1"
+
+
+def test_create_many_and_retry_failed():
+    """CCXs are created concurrently, only the failed ones are retried"""
+    mock_requester = create_autospec(requests)
+    failing = {"title 1", "title 3"}
+
+    def post(url, json):  # pylint: disable=redefined-outer-name
+        """creates a CCX, except the failing ones"""
+        response = create_autospec(requests.Response, instance=True)
+        if json['display_name'] in failing:
+            response.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
+            response.json.return_value = {"error": "boom"}
+        else:
+            response.json.return_value = {"ccx_course_id": f"ccx-v1:{json['display_name']}"}
+        return response
+
+    mock_requester.post.side_effect = post
+    ccx = CCX(mock_requester, 'https://example.org/')
+    specs = [
+        {"master_course_id": "course-id", "coach_email": "foo@bar.com", "max_students_allowed": 10,
+         "title": f"title {index}"}
+        for index in range(5)
+    ]
+    limiter = Mock(wraps=RateLimiter(1000, burst=5))
+
+    results = ccx.create_many(specs, max_workers=3, rate_limiter=limiter)
+
+    assert [result.item for result in results] == specs
+    assert [result.value for result in results] == [
+        "ccx-v1:title 0", None, "ccx-v1:title 2", None, "ccx-v1:title 4"
+    ]
+    assert isinstance(results[1].error, requests.HTTPError)
+    assert limiter.acquire.call_count == 5
+
+    failing.clear()
+    mock_requester.post.reset_mock()
+    retried = ccx.retry_failed(results)
+    assert [result.value for result in retried] == [f"ccx-v1:title {index}" for index in range(5)]
+    assert mock_requester.post.call_count == 2
@@ -0,0 +1,146 @@
+"""
+Circuit breakers protecting the client from degraded edX services
+"""
+import threading
+import time
+
+from requests.exceptions import RequestException
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of sending a request while the circuit of its endpoint group is open"""
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for one endpoint group.
+
+    The circuit opens after `failure_threshold` consecutive failures (errors, 5xx
+    responses or calls slower than `slow_call_threshold`). While open, calls fail
+    immediately. After `reset_timeout` seconds it half-opens and lets
+    `half_open_max_calls` probe calls through: a success closes it, a failure opens
+    it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, slow_call_threshold=None, half_open_max_calls=1):
+        """
+        Args:
+            failure_threshold (int): consecutive failures opening the circuit
+            reset_timeout (float): seconds the circuit stays open before probing
+            slow_call_threshold (float): calls taking longer than this many seconds count as failures
+            half_open_max_calls (int): concurrent probe calls allowed while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes = 0
+
+    @property
+    def state(self):
+        """The current state: closed, open or half_open"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self):
+        """Half-opens an open circuit once reset_timeout has elapsed"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def allow(self):
+        """
+        Returns whether a call may be made now, reserving a probe when half-open
+
+        Returns:
+            bool: True if the call may go through
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record(self, success, duration=None):
+        """
+        Records the outcome of a call allowed by `allow`
+
+        Args:
+            success (bool): whether the call succeeded
+            duration (float): how long the call took, in seconds
+        """
+        if success and self.slow_call_threshold is not None and duration is not None:
+            success = duration <= self.slow_call_threshold
+        with self._lock:
+            if self._state == OPEN:
+                # a call allowed before the circuit opened, its outcome is stale
+                return
+            if success:
+                # only a probe closes the circuit, a success while closed resets the count
+                self._state = CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """
+    The circuit breakers of every endpoint group, created on first use.
+
+    A registry can be shared by several EdxApi instances talking to the same edX.
+    """
+
+    def __init__(self, overrides=None, **defaults):
+        """
+        Args:
+            overrides (dict): CircuitBreaker arguments by endpoint group, e.g. {"grades": {"failure_threshold": 2}}
+            **defaults: CircuitBreaker arguments used for every endpoint group
+        """
+        self.defaults = defaults
+        self.overrides = overrides or {}
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def get(self, group):
+        """
+        Returns the circuit breaker of an endpoint group
+
+        Args:
+            group (str): the endpoint group
+
+        Returns:
+            CircuitBreaker
+        """
+        with self._lock:
+            breaker = self._breakers.get(group)
+            if breaker is None:
+                breaker = self._breakers[group] = CircuitBreaker(
+                    **dict(self.defaults, **self.overrides.get(group, {}))
+                )
+            return breaker
+
+    def states(self):
+        """
+        Returns the state of every circuit breaker
+
+        Returns:
+            dict: state by endpoint group
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {group: breaker.state for group, breaker in breakers.items()}
@@ -0,0 +1,130 @@
+"""Tests for the circuit breakers"""
+from unittest.mock import patch
+
+import pytest
+
+from .circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers, CircuitOpenError
+from .client import EdxApi
+
+BASE_URL = "http://edx.example.com"
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+GRADES_URL = f"{BASE_URL}/api/grades/v1/courses/{COURSE_ID}/"
+
+
+def test_opens_after_consecutive_failures():
+    """the circuit opens after failure_threshold consecutive failures"""
+    breaker = CircuitBreaker(failure_threshold=3)
+    for _ in range(2):
+        breaker.record(False)
+    breaker.record(True)
+    for _ in range(2):
+        breaker.record(False)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_slow_calls_are_failures():
+    """calls slower than slow_call_threshold count as failures"""
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=2)
+    breaker.record(True, duration=1)
+    assert breaker.state == CLOSED
+    breaker.record(True, duration=3)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probing():
+    """after reset_timeout a single probe is allowed, its outcome decides the state"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=100):
+        breaker.record(False)
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=129):
+        assert not breaker.allow()
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=130):
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record(False)
+        assert breaker.state == OPEN
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=161):
+        assert breaker.allow()
+        breaker.record(True)
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+
+def test_late_outcomes_are_ignored_while_open():
+    """calls allowed before the circuit opened do not close it, nor keep it open longer"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    assert all(breaker.allow() for _ in range(3))
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=100):
+        breaker.record(False)
+        breaker.record(False)
+        assert breaker.state == OPEN
+        breaker.record(True)
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=120):
+        breaker.record(False)
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=130):
+        assert breaker.state == HALF_OPEN
+
+
+def test_registry_overrides():
+    """each endpoint group gets its own breaker, with optional overrides"""
+    breakers = CircuitBreakers(overrides={"grades": {"failure_threshold": 1}}, failure_threshold=4)
+    assert breakers.get("grades") is breakers.get("grades")
+    assert breakers.get("grades").failure_threshold == 1
+    assert breakers.get("enrollment").failure_threshold == 4
+    assert breakers.states() == {"grades": CLOSED, "enrollment": CLOSED}
+
+
+def test_client_fails_fast_when_open(requests_mock):
+    """once the grades circuit opens, grade requests fail fast and other groups still work"""
+    requests_mock.get(GRADES_URL, status_code=503)
+    requests_mock.get(f"{BASE_URL}/api/mobile/v0.5/my_user_info", json={"username": "staff"})
+    api = EdxApi(
+        {"access_token": "token"}, BASE_URL, circuit_breakers=CircuitBreakers(failure_threshold=2)
+    )
+
+    for _ in range(2):
+        with pytest.raises(Exception) as exc:
+            api.current_grades.get_course_current_grades(COURSE_ID)
+        assert not isinstance(exc.value, CircuitOpenError)
+    with pytest.raises(CircuitOpenError):
+        api.current_grades.get_course_current_grades(COURSE_ID)
+    assert requests_mock.call_count == 2
+    assert api.user_info.get_user_info().username == "staff"
+
+    metrics = api.metrics.snapshot()
+    assert metrics["gauges"]["circuit_state"] == {"grades": OPEN, "mobile": CLOSED}
+    assert metrics["counters"]["circuit_rejected"] == {"grades": 1}
+    assert metrics["counters"]["server_errors"] == {"grades": 2}
+
+
+def test_client_gauge_follows_the_state(requests_mock):
+    """the circuit_state gauge is refreshed by rejected calls and half-open transitions"""
+    requests_mock.get(GRADES_URL, status_code=503)
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=30)
+    api = EdxApi({"access_token": "token"}, BASE_URL, circuit_breakers=breakers)
+
+    def gauge():
+        return api.metrics.snapshot()["gauges"]["circuit_state"]["grades"]
+
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=100):
+        with pytest.raises(Exception):
+            api.current_grades.get_course_current_grades(COURSE_ID)
+    assert gauge() == OPEN
+
+    with patch("edx_api.circuit_breaker.time.monotonic", return_value=140):
+        # a probe is in flight, the circuit has half-opened since the failure
+        assert breakers.get("grades").allow()
+        with pytest.raises(CircuitOpenError):
+            api.current_grades.get_course_current_grades(COURSE_ID)
+    assert gauge() == HALF_OPEN
+
+    breakers.get("grades").record(True)
+    requests_mock.get(GRADES_URL, json={"next": None, "results": []})
+    api.current_grades.get_course_current_grades(COURSE_ID)
+    assert gauge() == CLOSED
@@ -1,40 +1,112 @@
 """edX api client"""
-# pylint: disable=fixme
-import requests
+# The sub-client modules (and requests, dateutil) are imported on first use to keep
+# `import edx_api.client` cheap for short lived processes.
+# pylint: disable=fixme,import-outside-toplevel
+import threading
 
 from . import DEFAULT_TIME_OUT
-from .bulk_user_retirement import BulkUserRetirement
-from .ccx import CCX
-from .certificates import UserCertificates
-from .course_list import CourseList
-from .course_detail import CourseDetails, CourseModes
-from .course_runs import CourseRuns
-from .course_structure import CourseStructure
-from .enrollments import CourseEnrollments
-from .email_settings import EmailSettings
-from .grades import UserCurrentGrades
-from .user_info import UserInfo
-from .user_validation import UserValidation
-from .lti_tools import LTITools
+from .metrics import Metrics
+from .single_flight import SingleFlight
 
 
 class EdxApi:
     """
     A client for speaking with edX.
+
+    Sub-clients are built on first access and then reused, they share one requester
+    per token type. Call `reset_clients` after changing the credentials, timeout or
+    transport so that they are rebuilt.
+
+    One client can be shared by the threads of a process, pass `max_threads` so that
+    its connection pool holds a connection per thread. Its sub-clients and their
+    methods are thread-safe:
+
+    - sub-clients and requesters are built once, under a lock
+    - the requesters are never mutated after they are built, per call headers are
+      passed with each request
+    - the metrics, circuit breakers, coalesced requests, token renewals and caches
+      are guarded by locks
+
+    `reset_clients`, `close` and changes of the attributes are not, they are meant
+    to be called while the client is not in use.
     """
 
     def __init__(
-        self, credentials, base_url="https://courses.edx.org/", timeout=DEFAULT_TIME_OUT
+        self,
+        credentials,
+        base_url="https://courses.edx.org/",
+        timeout=DEFAULT_TIME_OUT,
+        coalesce_requests=True,
+        transport=None,
+        credentials_provider=None,
+        pool_maxsize=None,
+        circuit_breakers=None,
+        timeouts=None,
+        max_threads=None,
+        identity_cache=None,
     ):
-        if "access_token" not in credentials:
-            raise AttributeError(
-                "Due to a lack of support for Client Credentials Grant in edX,"
-                " you must specify the access token."
+        """
+        Args:
+            credentials (dict): the credentials used to authenticate, either an `access_token`
+                or the `client_id` and `client_secret` of an OAuth2 application (the tokens are
+                then requested and renewed automatically)
+            base_url (str): the base URL of the edX instance
+            timeout (float or tuple): the timeout applied to every request, either one value
+                or a (connect, read) tuple
+            coalesce_requests (bool): whether concurrent identical GET requests made
+                through this client share a single request and response
+            transport (requests.adapters.BaseAdapter): transport adapter used for every
+                request instead of the default HTTP one (see edx_api.cassette)
+            credentials_provider (object): provides (and renews) the access tokens instead of
+                the credentials, see edx_api.auth
+            pool_maxsize (int): if set, all the requests of this client share one connection
+                pool holding at most this many connections per host, requests wait for a free
+                connection instead of opening more (ignored when a transport is given)
+            circuit_breakers (CircuitBreakers): circuit breakers by endpoint group, requests
+                fail fast with CircuitOpenError while their circuit is open
+                (see edx_api.circuit_breaker)
+            timeouts (dict): timeout overrides, keyed either by sub-client property name
+                (e.g. "user_info") or by URL path prefix (e.g. "/api/courses/v1/blocks/"),
+                the longest matching prefix wins over the sub-client timeout
+            max_threads (int): the number of threads sharing this client, the default
+                pool_maxsize so that each thread can keep a connection open to the host
+            identity_cache (TTLCache or bool): the cache of the identities resolved by
+                user_info, by default a cache shared by the clients of the process so that
+                clients built per request reuse them, False disables it (see edx_api.user_info)
+        """
+        if credentials_provider is None and "access_token" not in credentials:
+            if "client_id" not in credentials or "client_secret" not in credentials:
+                raise AttributeError(
+                    "You must specify the access token, or the client_id and client_secret"
+                    " of an OAuth2 application."
+                )
+            from .auth import ClientCredentialsProvider
+
+            credentials_provider = ClientCredentialsProvider.for_base_url(
+                base_url, credentials["client_id"], credentials["client_secret"], timeout=timeout
             )
 
         self.base_url = base_url
         self.credentials = credentials
+        self.credentials_provider = credentials_provider
         self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.identity_cache = identity_cache
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self.circuit_breakers = circuit_breakers
+        self.metrics = Metrics()
+        self.transport = transport
+        self._owns_transport = False
+        if pool_maxsize is None:
+            pool_maxsize = max_threads
+        if transport is None and pool_maxsize is not None:
+            from requests.adapters import HTTPAdapter
+
+            self.transport = HTTPAdapter(pool_maxsize=pool_maxsize, pool_block=True)
+            self._owns_transport = True
+        self._lock = threading.RLock()
+        self._requesters = {}
+        self._clients = {}
 
     def get_requester(self, token_type="Bearer"):
         """
@@ -42,91 +114,181 @@ class EdxApi:
         """
         # TODO(abrahms): Perhaps pull this out into a factory function for
         # generating an EdxApi instance with the proper requester & credentials.
-        session = requests.session()
-        session.headers.update(
-            {
-                "Authorization": f"{token_type} {self.credentials['access_token']}"
-            }
+        from .requester import EdxSession
+
+        session = EdxSession(
+            timeout=self.timeout,
+            single_flight=self._single_flight,
+            circuit_breakers=self.circuit_breakers,
+            metrics=self.metrics,
+            path_timeouts={
+                prefix: value for prefix, value in self.timeouts.items() if prefix.startswith("/")
+            },
         )
+        if self.credentials_provider is not None:
+            from .auth import TokenAuth
 
-        old_request = session.request
+            session.auth = TokenAuth(self.credentials_provider, token_type)
+        else:
+            session.headers.update(
+                {
+                    "Authorization": f"{token_type} {self.credentials['access_token']}"
+                }
+            )
+        if self.transport is not None:
+            session.mount("http://", self.transport)
+            session.mount("https://", self.transport)
+        return session
 
-        def patched_request(*args, **kwargs):
-            """
-            adds timeout param to session.request
-            """
-            return old_request(*args, timeout=self.timeout, **kwargs)
+    def _get_requester(self, token_type="Bearer", owner=None):
+        """
+        Returns the requester memoized for the token type, or a dedicated one for owner
+        (a sub-client name) using the timeout configured for it
+        """
+        key = (token_type, owner)
+        with self._lock:
+            requester = self._requesters.get(key)
+            if requester is None:
+                requester = self._requesters[key] = self.get_requester(token_type=token_type)
+                if owner in self.timeouts:
+                    requester.timeout = self.timeouts[owner]
+            return requester
 
-        session.request = patched_request
-        return session
+    def _get_client(self, name, client_class, token_type="Bearer", **options):
+        """
+        Returns the client_class instance memoized on this EdxApi, building it on first use
+
+        Args:
+            name (str): the sub-client name
+            client_class (type): the sub-client class
+            token_type (str): the token type used to authenticate the requests
+            options: the other arguments of the client_class constructor
+        """
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    # sub-clients with their own timeout get their own requester
+                    requester = self._get_requester(token_type, owner=name if name in self.timeouts else None)
+                    client = self._clients[name] = client_class(requester, self.base_url, **options)
+        return client
+
+    def reset_clients(self):
+        """
+        Discards the memoized sub-clients and closes their requesters, the next access
+        of each property builds a new sub-client with the current settings.
+        """
+        with self._lock:
+            requesters = list(self._requesters.values())
+            self._requesters.clear()
+            self._clients.clear()
+        for requester in requesters:
+            requester.close()
+
+    def close(self):
+        """
+        Closes the sub-clients requesters and the connection pool owned by this client
+        """
+        self.reset_clients()
+        if self._owns_transport:
+            self.transport.close()
 
     @property
     def course_list(self):
         """Course List API"""
-        return CourseList(self.get_requester(), self.base_url)
+        from .course_list import CourseList
+
+        return self._get_client("course_list", CourseList)
 
     @property
     def course_structure(self):
         """Course Structure API"""
-        return CourseStructure(self.get_requester(), self.base_url)
+        from .course_structure import CourseStructure
+
+        return self._get_client("course_structure", CourseStructure)
 
     @property
     def course_detail(self):
         """Course Detail API"""
-        return CourseDetails(self.get_requester(), self.base_url)
+        from .course_detail import CourseDetails
+
+        return self._get_client("course_detail", CourseDetails)
 
     @property
     def course_mode(self):
         """Course Detail API"""
-        return CourseModes(self.get_requester(), self.base_url)
+        from .course_detail import CourseModes
+
+        return self._get_client("course_mode", CourseModes)
 
     @property
     def enrollments(self):
         """Course Enrollments API"""
-        return CourseEnrollments(self.get_requester(), self.base_url)
+        from .enrollments import CourseEnrollments
+
+        return self._get_client("enrollments", CourseEnrollments)
 
     @property
     def ccx(self):
         """CCX API"""
-        return CCX(self.get_requester(), self.base_url)
+        from .ccx import CCX
+
+        return self._get_client("ccx", CCX)
 
     @property
     def email_settings(self):
         """Email Settings API"""
-        return EmailSettings(self.get_requester(), self.base_url)
+        from .email_settings import EmailSettings
+
+        return self._get_client("email_settings", EmailSettings)
 
     @property
     def certificates(self):
         """Certificates API"""
-        return UserCertificates(self.get_requester(), self.base_url)
+        from .certificates import UserCertificates
+
+        return self._get_client("certificates", UserCertificates)
 
     @property
     def current_grades(self):
         """Current Grades API"""
-        return UserCurrentGrades(self.get_requester(), self.base_url)
+        from .grades import UserCurrentGrades
+
+        return self._get_client("current_grades", UserCurrentGrades)
 
     @property
     def user_info(self):
         """User info API"""
-        return UserInfo(self.get_requester(), self.base_url)
+        from .user_info import UserInfo
+
+        return self._get_client("user_info", UserInfo, cache=self.identity_cache)
 
     @property
     def bulk_user_retirement(self):
         """Bulk user retirement API"""
-        return BulkUserRetirement(self.get_requester(token_type="jwt"), self.base_url)
+        from .bulk_user_retirement import BulkUserRetirement
+
+        return self._get_client("bulk_user_retirement", BulkUserRetirement, token_type="jwt")
 
     @property
     def user_validation(self):
         """User validation API"""
-        return UserValidation(self.get_requester(), self.base_url)
+        from .user_validation import UserValidation
+
+        return self._get_client("user_validation", UserValidation)
 
     @property
     def course_runs(self):
         """Course runs management API (Works with CMS)"""
-        return CourseRuns(self.get_requester(token_type="jwt"), self.base_url)
+        from .course_runs import CourseRuns
+
+        return self._get_client("course_runs", CourseRuns, token_type="jwt")
 
     @property
     def lti_tools(self):
         """LTI Tools API"""
-        return LTITools(self.get_requester(), self.base_url)
+        from .lti_tools import LTITools
+
+        return self._get_client("lti_tools", LTITools)
 
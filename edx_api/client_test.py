@@ -1,4 +1,15 @@
 """client tests"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import unquote
+
 import pytest
 
 from .client import EdxApi
@@ -17,3 +28,201 @@ def test_instantiation_happypath():
     token = 'asdf'
     client = EdxApi({'access_token': token})
     assert client.get_requester().headers['Authorization'] == f'Bearer {token}'
+
+
+def test_import_is_lazy():
+    """importing the client does not load the sub-clients or their dependencies"""
+    code = (
+        "import sys; import edx_api.client; "
+        "print(','.join(sorted(name for name in sys.modules "
+        "if name.split('.')[0] in ('requests', 'dateutil') or name.startswith('edx_api.'))))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout.strip()
+    assert output.split(",") == ["edx_api.client", "edx_api.metrics", "edx_api.single_flight"]
+
+
+def test_sub_client_loaded_on_access():
+    """the sub-client classes are imported when the property is first used"""
+    client = EdxApi({'access_token': 'token'})
+    assert type(client.enrollments).__name__ == 'CourseEnrollments'
+    assert type(client.course_mode).__name__ == 'CourseModes'
+
+
+def test_sub_clients_are_memoized():
+    """each property returns the same sub-client, sharing one requester per token type"""
+    client = EdxApi({'access_token': 'token'})
+    assert client.enrollments is client.enrollments
+    assert client.enrollments.requester is client.current_grades.requester
+    assert client.course_runs._requester is client.bulk_user_retirement.requester  # pylint: disable=protected-access
+    assert client.course_runs._requester.headers['Authorization'] == 'jwt token'  # pylint: disable=protected-access
+    assert client.user_info.requester is client.enrollments.requester
+
+
+def test_sub_clients_memoized_across_threads():
+    """concurrent first accesses build a single sub-client"""
+    client = EdxApi({'access_token': 'token'})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        instances = list(pool.map(lambda _: client.course_list, range(32)))
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_reset_clients():
+    """reset_clients rebuilds the sub-clients with the new credentials"""
+    client = EdxApi({'access_token': 'old'})
+    enrollments = client.enrollments
+    client.credentials = {'access_token': 'new'}
+    client.reset_clients()
+    assert client.enrollments is not enrollments
+    assert client.enrollments.requester.headers['Authorization'] == 'Bearer new'
+
+
+def test_pool_maxsize_shares_one_adapter():
+    """a bounded connection pool is shared by all the sub-clients and closed with the client"""
+    client = EdxApi({'access_token': 'token'}, 'https://lms.example.com/', pool_maxsize=4)
+    adapter = client.transport
+    assert client.enrollments.requester.get_adapter('https://lms.example.com/') is adapter
+    assert client.course_runs._requester.get_adapter('https://lms.example.com/') is adapter  # pylint: disable=protected-access
+    with patch.object(adapter, 'close') as close:
+        client.close()
+    assert close.called
+
+
+def test_max_threads_sizes_the_connection_pool():
+    """the shared connection pool holds a connection per thread"""
+    client = EdxApi({'access_token': 'token'}, max_threads=64)
+    assert client.transport._pool_maxsize == 64  # pylint: disable=protected-access
+    assert client.transport._pool_block  # pylint: disable=protected-access
+    assert client.enrollments.requester.get_adapter('https://courses.edx.org/') is client.transport
+    assert EdxApi({'access_token': 'token'}, max_threads=64, pool_maxsize=8).transport._pool_maxsize == 8  # pylint: disable=protected-access
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Answers the user info, account and course detail requests, counting the open connections"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Silences the default per-request logging"""
+
+    def setup(self):
+        super().setup()
+        self.server.connection_opened()
+
+    def finish(self):
+        self.server.connection_closed()
+        super().finish()
+
+    def _send(self, payload):
+        """Records the request and writes a JSON response"""
+        self.server.record(self.command, self.headers)
+        # holds the connection long enough for the threads to contend for the pool
+        time.sleep(0.002)
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answers the user info and course detail requests"""
+        if self.path == '/api/mobile/v0.5/my_user_info':
+            return self._send({'username': 'staff'})
+        return self._send({'id': unquote(self.path.rsplit('/', 1)[-1])})
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        """Answers the account updates"""
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        return self._send({'username': self.path.rsplit('/', 1)[-1], 'name': payload['name']})
+
+
+class _CountingServer(ThreadingHTTPServer):
+    """A local server recording its requests and its peak number of open connections"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _CountingHandler)
+        self.base_url = f'http://127.0.0.1:{self.server_address[1]}/'
+        self.lock = threading.Lock()
+        self.open_connections = 0
+        self.peak_connections = 0
+        self.requests = []
+
+    def connection_opened(self):
+        """Counts a connection accepted"""
+        with self.lock:
+            self.open_connections += 1
+            self.peak_connections = max(self.peak_connections, self.open_connections)
+
+    def connection_closed(self):
+        """Counts a connection closed"""
+        with self.lock:
+            self.open_connections -= 1
+
+    def record(self, method, headers):
+        """Records the method and the headers of a request"""
+        with self.lock:
+            self.requests.append((method, headers.get('Authorization'), 'X-Requested-With' in headers))
+
+
+@pytest.fixture
+def counting_server():
+    """A local server counting its connections, served from a background thread"""
+    server = _CountingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_shared_client_under_concurrency(counting_server):  # pylint: disable=redefined-outer-name
+    """threads outnumbering max_threads share one client, its pool bounds the connections"""
+    max_threads, threads, rounds = 8, 32, 5
+    client = EdxApi({'access_token': 'token'}, counting_server.base_url, max_threads=max_threads)
+
+    def work(index):
+        results = []
+        for round_ in range(rounds):
+            info = client.user_info.update_user_name(f'user{index}', f'Name {index} {round_}')
+            detail = client.course_detail.get_detail(f'course-v1:edx+c{index}+r{round_}')
+            results.append((info.username, info.name, detail.json['id'], client.user_info.get_user_info().username))
+        return results
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(work, range(threads)))
+    client.close()
+
+    for index, thread_results in enumerate(results):
+        assert thread_results == [
+            (f'user{index}', f'Name {index} {round_}', f'course-v1:edx+c{index}+r{round_}', 'staff')
+            for round_ in range(rounds)
+        ]
+    assert 1 < counting_server.peak_connections <= max_threads
+    for method, authorization, requested_with in counting_server.requests:
+        assert authorization == 'Bearer token'
+        assert requested_with == (method == 'PATCH')
+    assert 'X-Requested-With' not in client.user_info.requester.headers
+    counters = client.metrics.snapshot()['counters']['requests']
+    assert counters['user'] == threads * rounds
+    assert counters['courses'] == threads * rounds
+    assert sum(counters.values()) == len(counting_server.requests)
+
+
+def test_sub_client_timeouts():
+    """sub-clients with a timeout override get a dedicated requester"""
+    client = EdxApi({'access_token': 'token'}, timeout=(3.05, 25), timeouts={
+        'user_info': 2,
+        '/api/courses/v1/blocks/': (3.05, 120),
+    })
+    assert client.user_info.requester.timeout == 2
+    assert client.enrollments.requester.timeout == (3.05, 25)
+    assert client.course_structure.requester.timeout_for(
+        'https://courses.edx.org/api/courses/v1/blocks/'
+    ) == (3.05, 120)
@@ -0,0 +1,12 @@
+"""Fixtures shared by the tests of the edX API client"""
+import pytest
+
+from edx_api.user_info import clear_identity_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_identity_cache():
+    """every test starts without the identities resolved by the previous ones"""
+    clear_identity_cache()
+    yield
+    clear_identity_cache()
@@ -1,7 +1,17 @@
 """Course Detail API"""
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
 from urllib.parse import urljoin
 
-from .models import CourseDetail, CourseMode
+from dateutil import parser
+from requests.exceptions import HTTPError
+
+from edx_api.bulk import DEFAULT_MAX_WORKERS, BulkResult, map_concurrently
+from .models import CourseDetail, CourseMode, CourseModeOperation
+
+COURSE_MODE_FIELDS = (
+    "mode_display_name", "currency", "min_price", "expiration_datetime", "description", "sku", "bulk_sku",
+)
 
 
 # pylint: disable=too-few-public-methods
@@ -47,6 +57,46 @@ class CourseDetails:
 
         return CourseDetail(resp.json())
 
+    def get_details(self, course_ids, username=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Fetches the details of many courses.
+
+        The courses are first fetched in batches with the course list API filtered on their
+        keys, the ones it does not return are then fetched concurrently one by one.
+
+        Args:
+            course_ids (list): edx course ids.
+            username (str, optional): The user on behalf of whom the courses are fetched.
+            max_workers (int, optional): The maximum number of concurrent requests.
+
+        Returns:
+            OrderedDict: CourseDetail by course id, in the order of course_ids, or None
+                for the courses which do not exist
+        """
+        from edx_api.course_list import CourseList  # pylint: disable=import-outside-toplevel
+
+        course_ids = list(OrderedDict.fromkeys(course_ids))
+        details = OrderedDict((course_id, None) for course_id in course_ids)
+        try:
+            for detail in CourseList(self._requester, self._base_url).get_courses(
+                course_keys=course_ids, username=username
+            ):
+                if detail.course_id in details:
+                    details[detail.course_id] = detail
+        except HTTPError:
+            # the course list API is unavailable or rejects the filter, every course is fetched alone
+            pass
+
+        missing = [course_id for course_id, detail in details.items() if detail is None]
+        for result in map_concurrently(
+            lambda course_id: self.get_detail(course_id, username), missing, max_workers
+        ):
+            if result.ok:
+                details[result.item] = result.value
+            elif not isinstance(result.error, HTTPError) or result.error.response.status_code != 404:
+                raise result.error
+        return details
+
 
 class CourseModes:
     """
@@ -178,7 +228,12 @@ class CourseModes:
             "bulk_sku": bulk_sku,
         }
         payload = {k: v for k, v in payload.items() if v is not None}
+        self._patch_course_mode(course_id, mode_slug, payload)
 
+    def _patch_course_mode(self, course_id, mode_slug, payload):
+        """
+        Sends a merge-patch of a course mode, the fields set to None in the payload are cleared
+        """
         resp = self._requester.patch(
             urljoin(
             self._base_url,
@@ -188,7 +243,6 @@ class CourseModes:
             headers={"Content-Type": "application/merge-patch+json"}
         )
         resp.raise_for_status()
-        return
 
     def delete_course_mode(self, course_id, mode_slug):
         """
@@ -208,3 +262,115 @@ class CourseModes:
         )
         resp.raise_for_status()
         return
+
+    def plan_course_modes(self, course_id, current_modes, desired_modes, delete_missing=False):
+        """
+        Computes the operations turning the current modes of a course into the desired ones.
+
+        Args:
+            course_id (str): An edx course id.
+            current_modes (list): The CourseMode objects of the course.
+            desired_modes (list): The desired modes, dicts with a `mode_slug` and any of
+                the fields of create_course_mode. A field set to None is cleared.
+            delete_missing (bool, optional): Whether the modes not desired are deleted.
+
+        Returns:
+            list of CourseModeOperation
+        """
+        current = {mode.mode_slug: mode.json for mode in current_modes}
+        operations = []
+        for desired in desired_modes:
+            slug = desired["mode_slug"]
+            fields = {key: value for key, value in desired.items() if key in COURSE_MODE_FIELDS}
+            if slug not in current:
+                operations.append(CourseModeOperation("create", course_id, slug, fields))
+                continue
+            changes = {
+                key: value for key, value in fields.items()
+                if not _same_mode_value(key, current[slug].get(key), value)
+            }
+            if changes:
+                operations.append(CourseModeOperation("update", course_id, slug, changes))
+        if delete_missing:
+            desired_slugs = {desired["mode_slug"] for desired in desired_modes}
+            operations.extend(
+                CourseModeOperation("delete", course_id, slug, {})
+                for slug in current if slug not in desired_slugs
+            )
+        return operations
+
+    def apply_course_mode_operation(self, operation):
+        """
+        Applies a change planned by plan_course_modes.
+
+        The fields of an update are sent as they are, the ones set to None are cleared
+        (unlike with update_course_mode, which leaves them unchanged).
+
+        Args:
+            operation (CourseModeOperation): the change
+
+        Returns:
+            CourseMode: the created mode, None for updates and deletions
+        """
+        if operation.action == "create":
+            return self.create_course_mode(operation.course_id, operation.mode_slug, **operation.changes)
+        if operation.action == "update":
+            return self._patch_course_mode(operation.course_id, operation.mode_slug, operation.changes)
+        if operation.action == "delete":
+            return self.delete_course_mode(operation.course_id, operation.mode_slug)
+        raise ValueError(f"Unknown course mode operation {operation.action}")
+
+    def sync_course_modes(self, desired, dry_run=False, delete_missing=False, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Brings the course modes of many courses to the desired state.
+
+        The current modes of every course are fetched concurrently, then only the modes
+        which are missing, different or (with delete_missing) not desired are created,
+        updated or deleted, concurrently as well.
+
+        Args:
+            desired (dict): The desired modes by course id, each a list of dicts with a
+                `mode_slug` and any of the fields of create_course_mode, e.g.
+                {"course-v1:edX+DemoX+Demo_Course": [{"mode_slug": "verified", "min_price": 49}]}.
+                The modes to create need a mode_display_name and a currency.
+            dry_run (bool, optional): If True, the operations are only planned, not applied.
+            delete_missing (bool, optional): Whether the modes not desired are deleted.
+            max_workers (int, optional): The maximum number of concurrent requests.
+
+        Returns:
+            list of BulkResult: one per operation (a CourseModeOperation), with the error
+                raised if it failed. Courses whose modes cannot be fetched get a `fetch`
+                operation holding the error. Nothing is applied in a dry run.
+        """
+        results = []
+        operations = []
+        for fetched in map_concurrently(self.get_course_modes, list(desired), max_workers):
+            course_id = fetched.item
+            if not fetched.ok:
+                results.append(fetched._replace(item=CourseModeOperation("fetch", course_id, None, {})))
+                continue
+            operations.extend(
+                self.plan_course_modes(course_id, fetched.value, desired[course_id], delete_missing)
+            )
+        if dry_run:
+            return results + [BulkResult(operation, None, None) for operation in operations]
+        return results + map_concurrently(self.apply_course_mode_operation, operations, max_workers)
+
+
+def _same_mode_value(key, current, desired):
+    """Whether a course mode field already has the desired value"""
+    if current == desired:
+        return True
+    if current is None or desired is None:
+        return False
+    if key == "min_price":
+        try:
+            return Decimal(str(current)) == Decimal(str(desired))
+        except InvalidOperation:
+            return False
+    if key == "expiration_datetime":
+        try:
+            return parser.parse(str(current)) == parser.parse(str(desired))
+        except (ValueError, OverflowError):
+            return False
+    return False
@@ -4,7 +4,9 @@ from unittest.mock import Mock
 from urllib.parse import urljoin
 
 import pytest
+from requests.exceptions import HTTPError
 
+from edx_api.client import EdxApi
 from edx_api.course_detail import CourseDetails, CourseModes
 from edx_api.course_detail.models import CourseDetail, CourseMode
 
@@ -41,6 +43,46 @@ class TestCourseDetails:
         mock_response.raise_for_status.assert_called_once()
         assert isinstance(result, CourseDetail)
 
+    def test_get_details(self, requests_mock):
+        """Course details are fetched with the course list first, then one by one"""
+        list_url = urljoin(self.base_url, "/api/courses/v1/courses/")
+        requests_mock.get(list_url, json={
+            "results": [{"id": "course-v1:A+1+R"}, {"id": "course-v1:C+3+R"}],
+            "pagination": {"next": None},
+        })
+        requests_mock.get(urljoin(self.base_url, "/api/courses/v1/courses/course-v1:B+2+R"), json={
+            "id": "course-v1:B+2+R"
+        })
+        requests_mock.get(urljoin(self.base_url, "/api/courses/v1/courses/course-v1:D+4+R"), status_code=404)
+        client = EdxApi({"access_token": "token"}, self.base_url).course_detail
+
+        details = client.get_details(
+            ["course-v1:D+4+R", "course-v1:C+3+R", "course-v1:B+2+R", "course-v1:A+1+R", "course-v1:C+3+R"]
+        )
+
+        assert list(details) == ["course-v1:D+4+R", "course-v1:C+3+R", "course-v1:B+2+R", "course-v1:A+1+R"]
+        assert details["course-v1:D+4+R"] is None
+        assert [detail.course_id for detail in list(details.values())[1:]] == [
+            "course-v1:C+3+R", "course-v1:B+2+R", "course-v1:A+1+R"
+        ]
+        list_requests = [request for request in requests_mock.request_history if request.path.endswith("courses/")]
+        assert len(list_requests) == 1
+        assert len(list_requests[0].qs["course_keys"]) == 4
+        assert len(requests_mock.request_history) == 3
+
+    def test_get_details_fallback(self, requests_mock):
+        """Every course is fetched alone when the course list fails, other errors are raised"""
+        requests_mock.get(urljoin(self.base_url, "/api/courses/v1/courses/"), status_code=403)
+        requests_mock.get(urljoin(self.base_url, "/api/courses/v1/courses/course-v1:A+1+R"), json={
+            "id": "course-v1:A+1+R"
+        })
+        client = EdxApi({"access_token": "token"}, self.base_url).course_detail
+        assert list(client.get_details(["course-v1:A+1+R"])) == ["course-v1:A+1+R"]
+
+        requests_mock.get(urljoin(self.base_url, "/api/courses/v1/courses/course-v1:A+1+R"), status_code=500)
+        with pytest.raises(HTTPError):
+            client.get_details(["course-v1:A+1+R"])
+
 
 class TestCourseModes:
     """Tests for CourseModes class"""
@@ -246,3 +288,94 @@ class TestCourseModes:
             )
         )
         mock_response.raise_for_status.assert_called_once()
+
+    def _mock_sync_api(self, requests_mock):
+        """Mocks the course modes of two courses and a course whose modes cannot be read"""
+        modes_url = urljoin(self.base_url, "/api/course_modes/v1/courses/")
+        requests_mock.get(f"{modes_url}course-v1:A+1+R", json=[
+            {"course_id": "course-v1:A+1+R", "mode_slug": "audit", "min_price": 0, "currency": "usd"},
+            {
+                "course_id": "course-v1:A+1+R", "mode_slug": "verified", "min_price": "49.00",
+                "currency": "usd", "expiration_datetime": "2030-01-01T00:00:00Z",
+            },
+        ])
+        requests_mock.get(f"{modes_url}course-v1:B+2+R", json=[
+            {"course_id": "course-v1:B+2+R", "mode_slug": "honor", "min_price": 0, "currency": "usd"},
+        ])
+        requests_mock.get(f"{modes_url}course-v1:C+3+R", status_code=500)
+        requests_mock.patch(f"{modes_url}course-v1:A+1+R/verified", status_code=204)
+        requests_mock.post(f"{modes_url}course-v1:B+2+R/", json={"mode_slug": "verified"})
+        requests_mock.delete(f"{modes_url}course-v1:B+2+R/honor", status_code=400)
+        return EdxApi({"access_token": "token"}, self.base_url).course_mode
+
+    def test_sync_course_modes_dry_run(self, requests_mock):
+        """The dry run lists the operations needed and changes nothing"""
+        client = self._mock_sync_api(requests_mock)
+        desired = {
+            "course-v1:A+1+R": [
+                {"mode_slug": "audit", "min_price": 0, "currency": "usd"},
+                {"mode_slug": "verified", "min_price": 99, "expiration_datetime": "2030-01-01T00:00:00+00:00"},
+            ],
+            "course-v1:B+2+R": [
+                {"mode_slug": "verified", "mode_display_name": "Verified", "currency": "usd", "min_price": 49},
+            ],
+            "course-v1:C+3+R": [],
+        }
+
+        results = client.sync_course_modes(desired, dry_run=True, delete_missing=True)
+
+        assert [str(result.item) for result in results] == [
+            "fetch course-v1:C+3+R",
+            "update course-v1:A+1+R verified min_price=99",
+            "create course-v1:B+2+R verified currency='usd' min_price=49 mode_display_name='Verified'",
+            "delete course-v1:B+2+R honor",
+        ]
+        assert results[0].error.response.status_code == 500
+        assert all(result.ok for result in results[1:])
+        assert {request.method for request in requests_mock.request_history} == {"GET"}
+
+    def test_sync_course_modes(self, requests_mock):
+        """Only the operations needed are applied, each with its own result"""
+        client = self._mock_sync_api(requests_mock)
+        requests_mock.patch(
+            urljoin(self.base_url, "/api/course_modes/v1/courses/course-v1:A+1+R/audit"), status_code=500
+        )
+        desired = {
+            "course-v1:A+1+R": [{"mode_slug": "verified", "min_price": "49"}, {"mode_slug": "audit", "min_price": 10}],
+            "course-v1:B+2+R": [
+                {"mode_slug": "verified", "mode_display_name": "Verified", "currency": "usd", "min_price": 49},
+            ],
+        }
+
+        results = client.sync_course_modes(desired, delete_missing=True)
+
+        assert [(result.item.action, result.item.mode_slug, result.ok) for result in results] == [
+            ("update", "audit", False),
+            ("create", "verified", True),
+            ("delete", "honor", False),
+        ]
+        assert results[0].error.response.status_code == 500
+        assert isinstance(results[1].value, CourseMode)
+        assert results[2].error.response.status_code == 400
+        writes = [request for request in requests_mock.request_history if request.method != "GET"]
+        assert sorted(request.method for request in writes) == ["DELETE", "PATCH", "POST"]
+        patch = next(request for request in writes if request.method == "PATCH")
+        assert patch.json() == {"min_price": 10}
+        assert patch.headers["Content-Type"] == "application/merge-patch+json"
+
+    def test_sync_course_modes_clears_fields(self, requests_mock):
+        """A desired field set to None is planned as an update and cleared with an explicit null"""
+        client = self._mock_sync_api(requests_mock)
+        desired = {"course-v1:A+1+R": [{"mode_slug": "verified", "min_price": 49, "expiration_datetime": None}]}
+
+        planned = client.sync_course_modes(desired, dry_run=True)
+        assert [str(result.item) for result in planned] == [
+            "update course-v1:A+1+R verified expiration_datetime=None",
+        ]
+
+        results = client.sync_course_modes(desired)
+
+        assert [(result.item.action, result.ok) for result in results] == [("update", True)]
+        patch = next(request for request in requests_mock.request_history if request.method == "PATCH")
+        assert patch.json() == {"expiration_datetime": None}
+        assert patch.headers["Content-Type"] == "application/merge-patch+json"
@@ -8,6 +8,18 @@ from dateutil import parser
 Media = namedtuple("Media", ["type", "url"])
 
 
+class CourseModeOperation(namedtuple("CourseModeOperation", ["action", "course_id", "mode_slug", "changes"])):
+    """
+    A change to the course modes of a course: create, update or delete a mode
+    (or fetch, for the courses whose modes could not be read)
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        changes = " ".join(f"{key}={value!r}" for key, value in sorted(self.changes.items()))
+        return f"{self.action} {self.course_id} {self.mode_slug or ''} {changes}".rstrip()
+
+
 class CourseDetail:
     """
     The course detail object
@@ -5,6 +5,7 @@ from urllib.parse import urljoin
 
 from .constants import PAGE_SIZE, BATCH_SIZE
 from edx_api.course_detail.models import CourseDetail
+from edx_api.deadline import Deadline, deadline_kwargs
 
 
 class CourseList:
@@ -23,12 +24,13 @@ class CourseList:
         self._requester = requester
         self._base_url = base_url
 
-    def _get_paginated_courses(self, params):
+    def _get_paginated_courses(self, params, deadline=None):
         """
         Helper method to handle pagination for a single API request.
 
         Args:
             params (dict): Query parameters for the API request
+            deadline (Deadline): The deadline of the whole listing, if any
 
         Yields:
             CourseDetail: Course objects one at a time
@@ -38,9 +40,12 @@ class CourseList:
             request_params = params.copy()
             request_params['page'] = page
 
+            if deadline is not None:
+                deadline.check()
             resp = self._requester.get(
                 urljoin(self._base_url, self.course_list_url),
-                params=request_params
+                params=request_params,
+                **deadline_kwargs(deadline)
             )
             resp.raise_for_status()
 
@@ -54,7 +59,7 @@ class CourseList:
                 break
 
     def get_courses(self, course_keys=None, org=None, search_term=None,
-                    username=None, active_only=None, **kwargs):
+                    username=None, active_only=None, deadline=None, **kwargs):
         """
         Get a list of courses
 
@@ -68,6 +73,8 @@ class CourseList:
             search_term (str, optional): Search term to filter courses.
             username (str, optional): The username whose visible courses to return.
             active_only (bool, optional): Only return non-ended courses.
+            deadline (float, optional): Seconds allowed to go through all the pages, counted from
+                the first page request. DeadlineExceeded is raised once they have elapsed.
             **kwargs: Additional query parameters
 
         Returns:
@@ -87,6 +94,7 @@ class CourseList:
         }
 
         params['page_size'] = PAGE_SIZE
+        deadline = Deadline.from_seconds(deadline)
 
         if course_keys:
             for start_index in range(0, len(course_keys), BATCH_SIZE):
@@ -94,8 +102,8 @@ class CourseList:
                 batch_params = params.copy()
                 batch_params['course_keys'] = batch
 
-                for course in self._get_paginated_courses(batch_params):
+                for course in self._get_paginated_courses(batch_params, deadline):
                     yield course
         else:
-            for course in self._get_paginated_courses(params):
+            for course in self._get_paginated_courses(params, deadline):
                 yield course
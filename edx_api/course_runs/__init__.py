@@ -4,8 +4,31 @@ from urllib import parse
 
 from requests.exceptions import HTTPError
 
+from edx_api.bulk import DEFAULT_MAX_WORKERS, map_concurrently
 from .exceptions import CourseRunAPIError
-from .models import CourseRun, CourseRunList
+from .models import CourseRun, CourseRunList, CourseRunProvisioningReport, ProvisionedCourseRun
+from .structs import CourseRunStruct
+
+
+SCHEDULE_FIELDS = ("start", "end", "enrollment_start", "enrollment_end")
+
+
+def _course_key_parts(course_id):
+    """Splits a course-v1:ORG+NUMBER+RUN course id into its org, number and run"""
+    try:
+        prefix, key = course_id.split(":", 1)
+        org, number, run = key.split("+")
+    except ValueError:
+        prefix = None
+    if prefix != "course-v1":
+        raise ValueError(f"Invalid course id {course_id}")
+    return org, number, run
+
+
+def _is_not_found(error):
+    """Whether a CourseRunAPIError was caused by a 404 response"""
+    cause = error.__cause__
+    return isinstance(cause, HTTPError) and cause.response is not None and cause.response.status_code == 404
 
 
 class CourseRuns:
@@ -195,12 +218,13 @@ class CourseRuns:
                 f"Failed to update course run: {ex.response.status_code} - {ex.response.text}"
             ) from ex
 
-    def get_course_run(self, course_id):
+    def get_course_run(self, course_id, typed=False):
         """
         Returns a course run object in Open edX.
 
         Args:
             course_id (str): The course id for the course run to get.
+            typed (bool, optional): If True, returns a validated, immutable CourseRunStruct.
         Returns:
             CourseRun: The course run object.
         Raises:
@@ -211,6 +235,8 @@ class CourseRuns:
         )
         try:
             resp.raise_for_status()
+            if typed:
+                return CourseRunStruct.from_json(resp.json())
             return CourseRun(resp.json())
         except HTTPError as ex:
             raise CourseRunAPIError(
@@ -240,3 +266,75 @@ class CourseRuns:
             raise CourseRunAPIError(
                 f"Failed to get course runs list: {ex.response.status_code} - {ex.response.text}"
             ) from ex
+
+    def provision_course_run(self, spec):
+        """
+        Makes a course run match its spec: creates or clones it when it does not exist,
+        then updates its title, pacing type and schedule when they differ.
+
+        Args:
+            spec (dict): The course run spec, see provision_course_runs.
+
+        Returns:
+            ProvisionedCourseRun: The course id, the action taken and the course run.
+        Raises:
+            CourseRunAPIError: If a request to Open edX fails.
+        """
+        course_id = spec["course_id"]
+        action = "unchanged"
+        try:
+            course_run = self.get_course_run(course_id)
+        except CourseRunAPIError as ex:
+            if not _is_not_found(ex):
+                raise
+            course_run = None
+
+        if course_run is None and spec.get("source_course_id"):
+            self.clone_course_run(spec["source_course_id"], course_id)
+            course_run = self.get_course_run(course_id)
+            action = "cloned"
+        elif course_run is None:
+            org, number, run = _course_key_parts(course_id)
+            course_run = self.create_course_run(
+                org, number, run, spec["title"], pacing_type=spec.get("pacing_type"),
+                **{key: spec.get(key) for key in SCHEDULE_FIELDS}
+            )
+            return ProvisionedCourseRun(course_id, "created", course_run)
+
+        changes = {
+            key: spec[key] for key in ("title", "pacing_type")
+            if spec.get(key) is not None and spec[key] != getattr(course_run, key)
+        }
+        if any(spec.get(key) is not None and spec[key] != getattr(course_run, key) for key in SCHEDULE_FIELDS):
+            # the schedule is replaced as a whole, the dates absent from the spec are kept
+            changes.update({
+                key: spec[key] if spec.get(key) is not None else getattr(course_run, key)
+                for key in SCHEDULE_FIELDS
+            })
+        if changes:
+            course_run = self.update_course_run(course_id, **changes)
+            if action == "unchanged":
+                action = "updated"
+        return ProvisionedCourseRun(course_id, action, course_run)
+
+    def provision_course_runs(self, specs, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Provisions many course runs concurrently.
+
+        Each run is created (or cloned) only if it does not exist yet, and updated only if
+        it differs from its spec, so the provisioning can safely be run again after a failure.
+
+        Args:
+            specs (list): The course run specs, dicts with:
+                * course_id (str): The id of the course run, course-v1:ORG+NUMBER+RUN.
+                * title (str): The title, required to create the course run.
+                * source_course_id (str, optional): The course run cloned when it does not exist.
+                * pacing_type (str, optional): instructor_paced or self_paced.
+                * start, end, enrollment_start, enrollment_end (datetime, optional): The schedule,
+                    timezone aware dates so that they compare with the ones of Open edX.
+            max_workers (int, optional): The maximum number of course runs provisioned at once.
+
+        Returns:
+            CourseRunProvisioningReport: The outcome of every spec.
+        """
+        return CourseRunProvisioningReport(map_concurrently(self.provision_course_run, specs, max_workers))
@@ -4,6 +4,7 @@ Tests for the content of the __init__ module in course_runs
 
 import json
 import os
+from datetime import datetime, timezone
 
 import pytest
 import requests_mock
@@ -13,6 +14,8 @@ from urllib.parse import urljoin
 
 from edx_api.client import EdxApi
 from edx_api.course_runs import CourseRuns
+from edx_api.course_runs.exceptions import CourseRunAPIError
+from edx_api.course_runs.structs import CourseRunStruct
 
 
 class CourseRunsTest(TestCase):
@@ -119,6 +122,18 @@ class CourseRunsTest(TestCase):
         response = self.course_run_client.get_course_run(course_id=course_id)
         assert response.json == self.course_run_responses[0]["json"]
 
+    @requests_mock.mock()
+    def test_get_course_run_typed(self, mock_req):
+        """
+        Tests that get_course_run can decode the course run into a struct.
+        """
+        course_id = "course-v1:ORG+NUMBER+RUN"
+        mock_req.get(self.course_run_url + f"{course_id}/", **self.course_run_responses[0])
+        course_run = self.course_run_client.get_course_run(course_id=course_id, typed=True)
+        assert isinstance(course_run, CourseRunStruct)
+        assert course_run.course_id == course_id
+        assert course_run.schedule.enrollment_end is None
+
     @requests_mock.mock()
     def test_get_course_run_list(self, mock_req):
         """
@@ -128,3 +143,75 @@ class CourseRunsTest(TestCase):
         mock_req.get(url, **self.course_run_responses[2])
         response = self.course_run_client.get_course_runs_list()
         assert response.json == self.course_run_responses[2]["json"]
+
+    @requests_mock.mock()
+    def test_provision_course_runs(self, mock_req):
+        """
+        Tests that the provisioning creates, clones and updates only what is needed.
+        """
+        def run_json(course_id, **changes):
+            return dict(self.course_run_json, id=course_id, **changes)
+
+        mock_req.get(self.course_run_url + "course-v1:ORG+NUMBER+RUN/", json=self.course_run_json)
+        mock_req.get(self.course_run_url + "course-v1:ORG+NUMBER+OLD/", json=run_json("course-v1:ORG+NUMBER+OLD"))
+        mock_req.get(self.course_run_url + "course-v1:ORG+NUMBER+NEW/", status_code=404)
+        mock_req.get(self.course_run_url + "course-v1:ORG+NUMBER+BAD/", status_code=500)
+        mock_req.get(self.course_run_url + "course-v1:ORG+NUMBER+CLONE/", [
+            {"status_code": 404},
+            {"json": run_json("course-v1:ORG+NUMBER+CLONE")},
+        ])
+        mock_req.post(self.course_run_url, status_code=201, json=run_json("course-v1:ORG+NUMBER+NEW"))
+        mock_req.post(self.course_run_clone_url, status_code=201, json=self.course_run_clone_json)
+        mock_req.put(requests_mock.ANY, json=self.course_run_json)
+        end = datetime(2031, 1, 1, tzinfo=timezone.utc)
+
+        report = self.course_run_client.provision_course_runs([
+            {"course_id": "course-v1:ORG+NUMBER+RUN", "title": "Test Course",
+             "start": datetime(2025, 1, 1, tzinfo=timezone.utc)},
+            {"course_id": "course-v1:ORG+NUMBER+OLD", "title": "Test Course", "end": end},
+            {"course_id": "course-v1:ORG+NUMBER+NEW", "title": "New Course", "pacing_type": "self_paced"},
+            {"course_id": "course-v1:ORG+NUMBER+CLONE", "source_course_id": "course-v1:ORG+NUMBER+RUN",
+             "pacing_type": "self_paced"},
+            {"course_id": "course-v1:ORG+NUMBER+BAD", "title": "Bad Course"},
+        ], max_workers=3)
+
+        assert report.by_action() == {
+            "unchanged": ["course-v1:ORG+NUMBER+RUN"],
+            "updated": ["course-v1:ORG+NUMBER+OLD"],
+            "created": ["course-v1:ORG+NUMBER+NEW"],
+            "cloned": ["course-v1:ORG+NUMBER+CLONE"],
+            "failed": ["course-v1:ORG+NUMBER+BAD"],
+        }
+        assert str(report) == "<Course run provisioning: 1 unchanged, 1 updated, 1 created, 1 cloned, 1 failed>"
+        assert isinstance(report.failed["course-v1:ORG+NUMBER+BAD"], CourseRunAPIError)
+        assert [provisioned.action for provisioned in report.succeeded] == ["unchanged", "updated", "created", "cloned"]
+
+        created = next(request for request in mock_req.request_history if request.url == self.course_run_url)
+        assert created.json() == {
+            "org": "ORG", "number": "NUMBER", "run": "NEW", "title": "New Course", "pacing_type": "self_paced",
+        }
+        cloned = next(request for request in mock_req.request_history if request.url == self.course_run_clone_url)
+        assert cloned.json() == {
+            "source_course_id": "course-v1:ORG+NUMBER+RUN", "destination_course_id": "course-v1:ORG+NUMBER+CLONE",
+        }
+        updates = {
+            request.path.rstrip("/").rsplit("/", 1)[-1]: request.json()
+            for request in mock_req.request_history if request.method == "PUT"
+        }
+        assert updates == {
+            "course-v1:org+number+old": {"schedule": {
+                "start": "2025-01-01T00:00:00+00:00",
+                "end": end.isoformat(),
+                "enrollment_start": "2025-01-02T00:00:00+00:00",
+            }},
+            "course-v1:org+number+clone": {"pacing_type": "self_paced"},
+        }
+
+    def test_provision_invalid_course_id(self):
+        """
+        Tests that a course run which cannot be created from its id is reported as failed.
+        """
+        with requests_mock.Mocker() as mock_req:
+            mock_req.get(self.course_run_url + "invalid/", status_code=404)
+            report = self.course_run_client.provision_course_runs([{"course_id": "invalid", "title": "Title"}])
+        assert isinstance(report.failed["invalid"], ValueError)
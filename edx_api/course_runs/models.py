@@ -1,9 +1,14 @@
 """
 Business objects for the course run API
 """
+from collections import namedtuple
 
 from dateutil import parser
 
+# the outcome of the provisioning of one course run: its id, what was done
+# (created, cloned, updated or unchanged) and the resulting CourseRun
+ProvisionedCourseRun = namedtuple("ProvisionedCourseRun", ["course_id", "action", "course_run"])
+
 
 class CourseRun:
     """
@@ -153,3 +158,43 @@ class CourseRunList:
         Returns a list of course runs
         """
         return [CourseRun(course_run) for course_run in self.json.get("results", [])]
+
+
+class CourseRunProvisioningReport:
+    """
+    The report of a bulk course run provisioning
+    """
+
+    def __init__(self, results):
+        """
+        Args:
+            results (list): a BulkResult per course run spec, holding a ProvisionedCourseRun
+        """
+        self.results = results
+
+    def __str__(self):
+        counts = ", ".join(f"{len(course_ids)} {action}" for action, course_ids in self.by_action().items())
+        return f"<Course run provisioning: {counts or 'nothing done'}>"
+
+    @property
+    def succeeded(self):
+        """Returns the ProvisionedCourseRun of every course run provisioned"""
+        return [result.value for result in self.results if result.ok]
+
+    @property
+    def failed(self):
+        """Returns the failed specs and their errors, by course id"""
+        return {result.item["course_id"]: result.error for result in self.results if not result.ok}
+
+    def by_action(self):
+        """
+        Returns the ids of the course runs provisioned, by action
+
+        Returns:
+            dict: the course ids by action (created, cloned, updated, unchanged, failed)
+        """
+        actions = {}
+        for result in self.results:
+            action = result.value.action if result.ok else "failed"
+            actions.setdefault(action, []).append(result.item["course_id"])
+        return actions
@@ -0,0 +1,106 @@
+"""
+Typed, immutable structs for the course run API, validated when they are decoded
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from edx_api.schema import datetime_field, field, mapping
+
+
+@dataclass(frozen=True)
+class ScheduleStruct:
+    """
+    The dates of a course run
+    """
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    enrollment_start: Optional[datetime] = None
+    enrollment_end: Optional[datetime] = None
+
+    @classmethod
+    def from_json(cls, payload, path="schedule"):
+        """
+        Decodes the schedule of a course run
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            ScheduleStruct: the schedule
+        """
+        mapping(payload, path)
+        return cls(
+            start=datetime_field(payload, "start", path),
+            end=datetime_field(payload, "end", path),
+            enrollment_start=datetime_field(payload, "enrollment_start", path),
+            enrollment_end=datetime_field(payload, "enrollment_end", path),
+        )
+
+
+@dataclass(frozen=True)
+class CourseRunStruct:  # pylint: disable=too-many-instance-attributes
+    """
+    A course run, the dates are in its schedule
+    """
+    course_id: str
+    title: Optional[str] = None
+    org: Optional[str] = None
+    number: Optional[str] = None
+    run: Optional[str] = None
+    pacing_type: Optional[str] = None
+    card_image: Optional[str] = None
+    schedule: ScheduleStruct = ScheduleStruct()
+
+    def __str__(self):
+        return f"<Course run details for {self.course_id}>"
+
+    @property
+    def start(self):
+        """Date the course run begins"""
+        return self.schedule.start
+
+    @property
+    def end(self):
+        """Date the course run ends"""
+        return self.schedule.end
+
+    @property
+    def enrollment_start(self):
+        """Date enrollment begins"""
+        return self.schedule.enrollment_start
+
+    @property
+    def enrollment_end(self):
+        """Date enrollment ends"""
+        return self.schedule.enrollment_end
+
+    @classmethod
+    def from_json(cls, payload, path=""):
+        """
+        Decodes a course run payload
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            CourseRunStruct: the course run
+        """
+        mapping(payload, path)
+        prefix = f"{path}." if path else ""
+        schedule = payload.get("schedule")
+        images = mapping(field(payload, "images", dict, path, default={}), f"{prefix}images")
+        return cls(
+            course_id=field(payload, "id", str, path, required=True),
+            title=field(payload, "title", str, path),
+            org=field(payload, "org", str, path),
+            number=field(payload, "number", str, path),
+            run=field(payload, "run", str, path),
+            pacing_type=field(payload, "pacing_type", str, path),
+            card_image=field(images, "card_image", str, f"{prefix}images"),
+            schedule=ScheduleStruct() if schedule is None else ScheduleStruct.from_json(
+                schedule, f"{prefix}schedule"
+            ),
+        )
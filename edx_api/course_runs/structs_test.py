@@ -0,0 +1,49 @@
+"""Tests for the typed course run structs"""
+import json
+import os.path
+from unittest import TestCase
+
+from edx_api.schema import SchemaError
+from .models import CourseRun, CourseRunList
+from .structs import CourseRunStruct, ScheduleStruct
+
+
+class CourseRunStructTests(TestCase):
+    """Tests for CourseRunStruct"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(os.path.dirname(__file__), "fixtures/course_run.json")) as file_obj:
+            cls.course_run_json = json.loads(file_obj.read())
+        with open(os.path.join(os.path.dirname(__file__), "fixtures/course_run_list.json")) as file_obj:
+            cls.course_run_list_json = json.loads(file_obj.read())
+
+    def test_matches_the_models(self):
+        """the structs expose the same values as the models"""
+        payloads = [self.course_run_json] + CourseRunList(self.course_run_list_json).json["results"]
+        for payload in payloads:
+            struct = CourseRunStruct.from_json(payload)
+            model = CourseRun(payload)
+            assert str(struct) == str(model)
+            for name in (
+                "course_id", "title", "org", "number", "run", "pacing_type", "card_image",
+                "start", "end", "enrollment_start", "enrollment_end",
+            ):
+                assert getattr(struct, name) == getattr(model, name), name
+
+    def test_without_schedule(self):
+        """a course run without a schedule has no dates"""
+        payload = {key: value for key, value in self.course_run_json.items() if key not in ("schedule", "images")}
+        struct = CourseRunStruct.from_json(payload)
+        assert struct.schedule == ScheduleStruct()
+        assert struct.start is None
+        assert struct.card_image is None
+
+    def test_schema_errors(self):
+        """unexpected payloads are reported with the path of the invalid value"""
+        with self.assertRaisesRegex(SchemaError, "^schedule.start: invalid date"):
+            CourseRunStruct.from_json(dict(self.course_run_json, schedule={"start": "tomorrow"}))
+        with self.assertRaisesRegex(SchemaError, "^id: is required"):
+            CourseRunStruct.from_json({"title": "Test Course"})
+        with self.assertRaisesRegex(SchemaError, "^images: expected dict"):
+            CourseRunStruct.from_json(dict(self.course_run_json, images=[]))
@@ -1,7 +1,27 @@
 """Course Structure API"""
+import logging
+import time
+from collections import namedtuple
+from functools import partial
 from urllib.parse import urljoin
 
+from edx_api.bulk import (
+    DEFAULT_MAX_WORKERS, BulkResult, ProgressLog, call_with_retries, chunked, decode_and_build, map_concurrently,
+    map_in_processes, process_pool,
+)
 from .models import Structure
+from .structs import BlockIndex
+
+log = logging.getLogger(__name__)
+
+# the courses fetched before their indexes are handed to the sink, bounds the memory
+# used by a crawl
+CRAWL_CHUNK_SIZE = 100
+
+# the outcome of crawl_course_blocks: the courses indexed, the failures (error by course
+# id), the courses already indexed by a previous run and the seconds spent fetching
+# each course, retries included
+CrawlReport = namedtuple("CrawlReport", ["succeeded", "failed", "skipped", "seconds"])
 
 
 class CourseStructure:
@@ -12,6 +32,22 @@ class CourseStructure:
         self.requester = requester
         self.base_url = base_url
 
+    def _get_blocks(self, course_id, username):
+        """
+        Requests the blocks of a course, raising for an error status
+        """
+        resp = self.requester.get(
+            urljoin(self.base_url, '/api/courses/v1/blocks/'),
+            params={
+                "depth": "all",
+                "username": username,
+                "course_id": course_id,
+                "requested_fields": "children,display_name,id,type,visible_to_staff_only",
+            })
+
+        resp.raise_for_status()
+        return resp
+
     def course_blocks(self, course_id, username):
         """
         Fetches course blocks.
@@ -24,15 +60,140 @@ class CourseStructure:
         Returns:
             Structure
         """
-        resp = self.requester.get(
-            urljoin(self.base_url, '/api/courses/v1/blocks/'),
-            params={
-                "depth": "all",
-                "username": username,
-                "course_id": course_id,
-                "requested_fields": "children,display_name,id,type,visible_to_staff_only",
-            })
+        return Structure(self._get_blocks(course_id, username).json())
 
-        resp.raise_for_status()
+    def course_blocks_many(  # pylint: disable=too-many-arguments
+        self, course_ids, username, max_workers=DEFAULT_MAX_WORKERS, processes=None, rate_limiter=None
+    ):
+        """
+        Fetches the blocks of many courses concurrently and indexes each of them in a BlockIndex.
+
+        Decoding and indexing large block trees is CPU bound, the fetching threads serialize
+        on it. With `processes` the threads only fetch the bodies, which are decoded and
+        indexed in a pool of processes, the compact indexes are sent back.
+
+        Args:
+            course_ids (iterable): the edX course ids
+            username (str): username of the user to query for (can reveal hidden modules)
+            max_workers (int): the maximum number of concurrent requests
+            processes (int): if set, the number of processes decoding and indexing the bodies
+            rate_limiter (RateLimiter): limits the rate of the requests
+
+        Returns:
+            list of BulkResult: the BlockIndex of each course, or the error raised for it,
+                in the order of the course ids
+        """
+        with process_pool(processes) as executor:
+            return self._index_many(
+                course_ids, lambda course_id: self._get_blocks(course_id, username), max_workers, executor, rate_limiter
+            )
+
+    # pylint: disable=too-many-arguments
+    def _index_many(self, course_ids, fetch, max_workers, executor, rate_limiter):
+        """
+        Fetches the blocks of courses with fetch(course_id), indexing them in the fetching
+        threads or in the pool of processes of executor
+        """
+        if executor is None:
+            return map_concurrently(
+                lambda course_id: BlockIndex.from_json(fetch(course_id).json()),
+                course_ids, max_workers=max_workers, rate_limiter=rate_limiter,
+            )
+
+        fetched = map_concurrently(
+            lambda course_id: fetch(course_id).content,
+            course_ids, max_workers=max_workers, rate_limiter=rate_limiter,
+        )
+        built = iter(map_in_processes(
+            partial(decode_and_build, BlockIndex.from_json),
+            [result.value for result in fetched if result.ok],
+            executor=executor,
+        ))
+        results = []
+        for result in fetched:
+            if result.ok:
+                index = next(built)
+                result = BulkResult(result.item, index.value, index.error)
+            results.append(result)
+        return results
+
+    # pylint: disable=too-many-locals
+    def crawl_course_blocks(
+        self, sink, username, course_ids=None, chunk_size=CRAWL_CHUNK_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+        processes=None, rate_limiter=None, retries=3, backoff=1.0, progress_log=None,
+    ):
+        """
+        Indexes the block trees of many courses, e.g. the whole catalog, streaming them to a sink.
+
+        The courses are fetched concurrently, chunk by chunk, and indexed in BlockIndex
+        structs (in a pool of processes with `processes`, see course_blocks_many). A fetch
+        failing with a transient error is retried after a backoff. Each index is handed to
+        the sink and then the course is recorded in the progress log, with its fetch time
+        and number of blocks: with a log kept in a file, running the crawl again after an
+        interruption skips the courses already indexed. The fetch time of each course is
+        also observed in the requester metrics, as `course_blocks_seconds`.
+
+        Args:
+            sink (callable): called with the course id and the BlockIndex of every course
+                indexed, from the calling thread (see edx_api.course_structure.sinks)
+            username (str): username of the user to query for (can reveal hidden modules)
+            course_ids (iterable): the edX course ids, all the courses visible to the user
+                (see CourseList.get_courses) if None
+            chunk_size (int): the number of courses fetched before their indexes are sunk
+            max_workers (int): the maximum number of concurrent requests
+            processes (int): if set, the number of processes decoding and indexing the blocks
+            rate_limiter (RateLimiter): limits the rate of the requests
+            retries (int): the number of times a course is fetched again
+            backoff (float): the delay before the first retry of a course in seconds, doubled for every other retry
+            progress_log (ProgressLog or str): the progress log, or the path of its file
+
+        Returns:
+            CrawlReport: the courses indexed, the failures, the courses skipped and the fetch times
+        """
+        if progress_log is None or isinstance(progress_log, str):
+            progress_log = ProgressLog(progress_log)
+        if course_ids is None:
+            from edx_api.course_list import CourseList  # pylint: disable=import-outside-toplevel
+
+            course_ids = (
+                course.course_id for course in CourseList(self.requester, self.base_url).get_courses(username=username)
+            )
+        metrics = getattr(self.requester, "metrics", None)
+        report = CrawlReport([], {}, [], {})
+
+        def pending():
+            """The course ids left to index, once each"""
+            seen = set()
+            for course_id in course_ids:
+                if course_id in seen:
+                    continue
+                seen.add(course_id)
+                if progress_log.is_done(course_id):
+                    report.skipped.append(course_id)
+                else:
+                    yield course_id
+
+        def fetch(course_id):
+            """Fetches the blocks of a course, timing it"""
+            started = time.monotonic()
+            try:
+                return call_with_retries(self._get_blocks, course_id, username, retries=retries, backoff=backoff)
+            finally:
+                report.seconds[course_id] = time.monotonic() - started
 
-        return Structure(resp.json())
+        # the processes are started once for the whole crawl
+        with process_pool(processes) as executor:
+            for chunk in chunked(pending(), chunk_size):
+                for result in self._index_many(chunk, fetch, max_workers, executor, rate_limiter):
+                    seconds = report.seconds.get(result.item)
+                    if metrics is not None and seconds is not None:
+                        metrics.observe("course_blocks_seconds", seconds, "blocks")
+                    if not result.ok:
+                        log.error("Failed to index the blocks of %s: %s", result.item, result.error)
+                        report.failed[result.item] = str(result.error)
+                        progress_log.record(result.item, False, error=str(result.error), seconds=seconds)
+                        continue
+                    sink(result.item, result.value)
+                    report.succeeded.append(result.item)
+                    progress_log.record(result.item, True, seconds=seconds, blocks=len(result.value))
+        return report
@@ -0,0 +1,163 @@
+"""Tests for the course structure client"""
+import json
+import os.path
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from edx_api.bulk import ProgressLog
+from edx_api.client import EdxApi
+from .sinks import JsonLinesSink
+from .structs import BlockIndex
+
+BASE_URL = "https://lms.example.com/"
+BLOCKS_URL = f"{BASE_URL}api/courses/v1/blocks/"
+COURSES_URL = f"{BASE_URL}api/courses/v1/courses/"
+
+
+@pytest.fixture(name="structure")
+def structure_fixture():
+    """The blocks of the demo course"""
+    with open(os.path.join(os.path.dirname(__file__), "fixtures/course_structure.json")) as file_obj:
+        return json.loads(file_obj.read())
+
+
+def test_course_blocks(requests_mock, structure):
+    """the blocks of a course are requested for a user"""
+    requests_mock.get(BLOCKS_URL, json=structure)
+    blocks = EdxApi({"access_token": "token"}, BASE_URL).course_structure.course_blocks("course-v1:edX+DemoX", "staff")
+    assert blocks.root.block_id == structure["root"]
+    assert requests_mock.last_request.qs["course_id"] == ["course-v1:edx+demox"]
+    assert requests_mock.last_request.qs["username"] == ["staff"]
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_course_blocks_many(requests_mock, structure, processes):
+    """the blocks of every course are indexed, in threads or in processes"""
+    def blocks(request, context):
+        if request.qs["course_id"] == ["course-v1:missing"]:
+            context.status_code = 404
+            return {"detail": "Not found"}
+        return structure
+
+    requests_mock.get(BLOCKS_URL, json=blocks)
+    limiter = Mock()
+    client = EdxApi({"access_token": "token"}, BASE_URL).course_structure
+
+    results = client.course_blocks_many(
+        ["course-v1:a", "course-v1:missing", "course-v1:b"], "staff", processes=processes, rate_limiter=limiter
+    )
+
+    assert [result.item for result in results] == ["course-v1:a", "course-v1:missing", "course-v1:b"]
+    assert results[0].value == results[2].value == BlockIndex.from_json(structure)
+    assert not results[1].ok
+    assert results[1].error.response.status_code == 404
+    assert limiter.acquire.call_count == 3
+
+
+def test_course_blocks_many_schema_errors(requests_mock):
+    """an unexpected payload fails its course only"""
+    requests_mock.get(BLOCKS_URL, json={"root": "course", "blocks": {}})
+    client = EdxApi({"access_token": "token"}, BASE_URL).course_structure
+    result, = client.course_blocks_many(["course-v1:a"], "staff", processes=1)
+    assert "unknown block" in str(result.error)
+
+
+class TestCrawlCourseBlocks:
+    """Tests for the block tree crawler"""
+
+    @pytest.fixture(autouse=True)
+    def blocks(self, requests_mock, structure):
+        """serves the demo course blocks for every course, but the missing one"""
+        def respond(request, context):
+            if request.qs["course_id"] == ["course-v1:missing"]:
+                context.status_code = 404
+                return {"detail": "Not found"}
+            return structure
+
+        requests_mock.get(BLOCKS_URL, json=respond)
+        self.index = BlockIndex.from_json(structure)  # pylint: disable=attribute-defined-outside-init
+
+    @staticmethod
+    def block_requests(requests_mock):
+        """The course ids of the blocks requests"""
+        return [request.qs["course_id"][0] for request in requests_mock.request_history if "blocks" in request.path]
+
+    @pytest.mark.parametrize("processes", [None, 2])
+    def test_crawl(self, requests_mock, processes):
+        """every course is indexed once and sunk in order, the failures are reported"""
+        api = EdxApi({"access_token": "token"}, BASE_URL)
+        sink = Mock()
+
+        report = api.course_structure.crawl_course_blocks(
+            sink, "staff", ["course-v1:a", "course-v1:missing", "course-v1:b", "course-v1:a", "course-v1:c"],
+            chunk_size=2, processes=processes,
+        )
+
+        assert [call.args for call in sink.call_args_list] == [
+            ("course-v1:a", self.index), ("course-v1:b", self.index), ("course-v1:c", self.index),
+        ]
+        assert report.succeeded == ["course-v1:a", "course-v1:b", "course-v1:c"]
+        assert list(report.failed) == ["course-v1:missing"]
+        assert "404" in report.failed["course-v1:missing"]
+        assert report.skipped == []
+        assert set(report.seconds) == {"course-v1:a", "course-v1:missing", "course-v1:b", "course-v1:c"}
+        assert api.metrics.snapshot()["timings"]["course_blocks_seconds"]["blocks"]["count"] == 4
+        assert len(self.block_requests(requests_mock)) == 4
+
+    def test_one_process_pool_per_crawl(self):
+        """the processes are started once, not for every chunk"""
+        client = EdxApi({"access_token": "token"}, BASE_URL).course_structure
+        sink = Mock()
+        with patch("edx_api.bulk.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool:
+            report = client.crawl_course_blocks(
+                sink, "staff", ["course-v1:a", "course-v1:b", "course-v1:c"], chunk_size=1, processes=2
+            )
+        assert report.succeeded == ["course-v1:a", "course-v1:b", "course-v1:c"]
+        pool.assert_called_once_with(max_workers=2)
+
+    def test_resumes_from_progress_log(self, requests_mock, tmp_path):
+        """the courses already indexed are skipped, the sink file holds every course once"""
+        log_path, sink_path = str(tmp_path / "crawl.jsonl"), str(tmp_path / "blocks.jsonl")
+        client = EdxApi({"access_token": "token"}, BASE_URL).course_structure
+        with JsonLinesSink(sink_path) as sink:
+            client.crawl_course_blocks(sink, "staff", ["course-v1:a", "course-v1:missing"], progress_log=log_path)
+        with JsonLinesSink(sink_path) as sink:
+            report = client.crawl_course_blocks(
+                sink, "staff", ["course-v1:a", "course-v1:missing", "course-v1:b"], progress_log=log_path
+            )
+
+        assert report.skipped == ["course-v1:a"]
+        assert report.succeeded == ["course-v1:b"]
+        assert sorted(self.block_requests(requests_mock)) == [
+            "course-v1:a", "course-v1:b", "course-v1:missing", "course-v1:missing"
+        ]
+        with open(sink_path) as file_obj:
+            lines = [json.loads(line) for line in file_obj]
+        assert [line["course_id"] for line in lines] == ["course-v1:a", "course-v1:b"]
+        assert BlockIndex.from_index_json(lines[0]) == self.index
+        record = ProgressLog(log_path).get("course-v1:b")
+        assert record["ok"] and record["blocks"] == len(self.index) and record["seconds"] >= 0
+
+    def test_retries(self, requests_mock, structure):
+        """transient errors are retried"""
+        requests_mock.get(BLOCKS_URL, [{"status_code": 503}, {"json": structure}])
+        client = EdxApi({"access_token": "token"}, BASE_URL).course_structure
+        sink = Mock()
+        with patch("edx_api.bulk.time.sleep") as sleep:
+            report = client.crawl_course_blocks(sink, "staff", ["course-v1:a"], backoff=0.5)
+        assert report.succeeded == ["course-v1:a"]
+        sleep.assert_called_once_with(0.5)
+        sink.assert_called_once_with("course-v1:a", self.index)
+
+    def test_whole_catalog(self, requests_mock):
+        """without course ids, the courses visible to the user are crawled"""
+        requests_mock.get(COURSES_URL, json={
+            "results": [{"id": "course-v1:a"}, {"id": "course-v1:b"}], "pagination": {"next": None},
+        })
+        client = EdxApi({"access_token": "token"}, BASE_URL).course_structure
+        sink = Mock()
+        report = client.crawl_course_blocks(sink, "staff")
+        assert report.succeeded == ["course-v1:a", "course-v1:b"]
+        assert requests_mock.request_history[0].qs["username"] == ["staff"]
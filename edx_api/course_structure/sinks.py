@@ -0,0 +1,45 @@
+"""
+Sinks receiving the block indexes of the courses crawled by CourseStructure.crawl_course_blocks
+"""
+import json
+import threading
+
+
+class JsonLinesSink:
+    """
+    Appends the block index of each course to a JSON lines file, one object per course
+    with its course_id and the fields of BlockIndex.to_json
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): the file the indexes are appended to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")  # pylint: disable=consider-using-with
+
+    def __call__(self, course_id, index):
+        """
+        Writes the index of a course
+
+        Args:
+            course_id (str): the edX course id
+            index (BlockIndex): the blocks of the course
+        """
+        line = json.dumps(dict(index.to_json(), course_id=course_id))
+        with self._lock:
+            self._file.write(line + "\n")
+            # the line is on disk before the course is recorded as done
+            self._file.flush()
+
+    def close(self):
+        """Closes the file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,139 @@
+"""
+Typed, immutable structs for the course structure API, validated when they are decoded
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from edx_api.schema import SchemaError, field, mapping
+
+
+@dataclass(frozen=True)
+class BlockIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    A compact index of the block tree of a course: the blocks are listed depth first from
+    the root, in course order, their fields are kept in parallel tuples and the parent of
+    each block is the position of its parent (-1 for the root and the unreachable blocks).
+
+    It is much smaller than the decoded payload, and cheap to pickle.
+    """
+    root: str
+    block_ids: Tuple[str, ...] = ()
+    types: Tuple[str, ...] = ()
+    titles: Tuple[Optional[str], ...] = ()
+    parents: Tuple[int, ...] = ()
+    visible: Tuple[bool, ...] = ()
+
+    def __str__(self):
+        return f"Block index for {self.root}"
+
+    def __len__(self):
+        return len(self.block_ids)
+
+    def position(self, block_id):
+        """
+        Returns the position of a block in the index
+
+        Args:
+            block_id (str): the block id
+
+        Returns:
+            int: the position of the block, its fields are at this position in every tuple
+        """
+        return self.block_ids.index(block_id)
+
+    def children(self, block_id):
+        """
+        Returns the ids of the children of a block, in course order
+
+        Args:
+            block_id (str): the block id
+
+        Returns:
+            list of str: the children ids
+        """
+        position = self.position(block_id)
+        return [self.block_ids[index] for index, parent in enumerate(self.parents) if parent == position]
+
+    def to_json(self):
+        """
+        Returns the index as a JSON serializable dict, see from_index_json
+
+        Returns:
+            dict: the root and the fields of the blocks, by field name
+        """
+        return {
+            "root": self.root,
+            "block_ids": list(self.block_ids),
+            "types": list(self.types),
+            "titles": list(self.titles),
+            "parents": list(self.parents),
+            "visible": list(self.visible),
+        }
+
+    @classmethod
+    def from_index_json(cls, payload):
+        """
+        Rebuilds an index from the dict returned by to_json
+
+        Args:
+            payload (dict): the decoded JSON
+
+        Returns:
+            BlockIndex: the index
+        """
+        return cls(
+            root=payload["root"],
+            block_ids=tuple(payload["block_ids"]),
+            types=tuple(payload["types"]),
+            titles=tuple(payload["titles"]),
+            parents=tuple(payload["parents"]),
+            visible=tuple(payload["visible"]),
+        )
+
+    @classmethod
+    def from_json(cls, payload, path=""):
+        """
+        Indexes the blocks returned by the course blocks API
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            BlockIndex: the index
+        """
+        mapping(payload, path)
+        root = field(payload, "root", str, path, required=True)
+        blocks_path = f"{path}.blocks" if path else "blocks"
+        blocks = mapping(field(payload, "blocks", dict, path, required=True), blocks_path)
+        if root not in blocks:
+            raise SchemaError(f"{path}.root" if path else "root", f"unknown block {root!r}")
+
+        positions = {}
+        block_ids, types, titles, parents, visible = [], [], [], [], []
+        # a stack walked from the root, the unreachable blocks are listed after the tree
+        # in the payload order
+        pending = [(block_id, -1) for block_id in reversed(list(blocks))]
+        pending.append((root, -1))
+        while pending:
+            block_id, parent = pending.pop()
+            if block_id in positions:
+                continue
+            block_path = f"{blocks_path}[{block_id!r}]"
+            block = mapping(blocks[block_id], block_path)
+            positions[block_id] = len(block_ids)
+            block_ids.append(block_id)
+            types.append(field(block, "type", str, block_path, required=True))
+            titles.append(field(block, "display_name", str, block_path))
+            visible.append(not field(block, "visible_to_staff_only", bool, block_path, default=False))
+            parents.append(parent)
+            children = field(block, "children", list, block_path, default=[])
+            pending.extend((child, positions[block_id]) for child in reversed(children) if child in blocks)
+        return cls(
+            root=root,
+            block_ids=tuple(block_ids),
+            types=tuple(types),
+            titles=tuple(titles),
+            parents=tuple(parents),
+            visible=tuple(visible),
+        )
@@ -0,0 +1,57 @@
+"""Tests for the course structure structs"""
+import json
+import os.path
+import pickle
+from unittest import TestCase
+
+from edx_api.schema import SchemaError
+from .models import Structure
+from .structs import BlockIndex
+
+
+class BlockIndexTests(TestCase):
+    """Tests for BlockIndex"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(os.path.dirname(__file__), "fixtures/course_structure.json")) as file_obj:
+            cls.structure = json.loads(file_obj.read())
+
+    def test_matches_the_structure(self):
+        """the index holds every block of the structure, with the same tree"""
+        index = BlockIndex.from_json(self.structure)
+        structure = Structure(self.structure)
+        assert len(index) == len(self.structure["blocks"])
+        assert index.block_ids[0] == structure.root.block_id
+        assert index.parents[0] == -1
+        assert str(index) == f"Block index for {structure.root.block_id}"
+        for block in structure.blocks:
+            position = index.position(block.block_id)
+            assert index.titles[position] == block.title
+            assert index.visible[position] == block.visible
+            assert index.types[position] == self.structure["blocks"][block.block_id]["type"]
+            assert index.children(block.block_id) == self.structure["blocks"][block.block_id].get("children", [])
+        assert pickle.loads(pickle.dumps(index)) == index
+
+    def test_depth_first_order(self):
+        """blocks are listed in course order, the unreachable ones last"""
+        index = BlockIndex.from_json({"root": "course", "blocks": {
+            "orphan": {"type": "html"},
+            "chapter2": {"type": "chapter", "children": ["unit"]},
+            "course": {"type": "course", "children": ["chapter1", "chapter2", "missing"]},
+            "unit": {"type": "vertical", "visible_to_staff_only": True},
+            "chapter1": {"type": "chapter", "display_name": "One"},
+        }})
+        assert index.block_ids == ("course", "chapter1", "chapter2", "unit", "orphan")
+        assert index.parents == (-1, 0, 0, 2, -1)
+        assert index.visible == (True, True, True, False, True)
+        assert index.titles == (None, "One", None, None, None)
+
+    def test_schema_errors(self):
+        """unexpected payloads are reported with the path of the invalid value"""
+        with self.assertRaisesRegex(SchemaError, "^root: unknown block 'course'"):
+            BlockIndex.from_json({"root": "course", "blocks": {}})
+        with self.assertRaisesRegex(SchemaError, "^blocks: is required"):
+            BlockIndex.from_json({"root": "course"})
+        with self.assertRaisesRegex(SchemaError, r"^blocks\['course'\].type: is required"):
+            BlockIndex.from_json({"root": "course", "blocks": {"course": {}}})
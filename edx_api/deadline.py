@@ -0,0 +1,76 @@
+"""
+Overall deadlines for operations spanning several requests (e.g. paginated iterators)
+"""
+import time
+
+from requests.exceptions import Timeout
+
+
+class DeadlineExceeded(Timeout):
+    """Raised when an operation runs past its overall deadline"""
+
+
+class Deadline:
+    """
+    A point in time by which an operation must be done
+    """
+
+    def __init__(self, seconds):
+        """
+        Args:
+            seconds (float): the time allowed from now
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_seconds(cls, seconds):
+        """
+        Returns a Deadline expiring in `seconds`, or None when no deadline is set
+
+        Args:
+            seconds (float): the time allowed from now, or None
+        """
+        return None if seconds is None else cls(seconds)
+
+    def check(self):
+        """
+        Returns the time left, raising DeadlineExceeded if there is none
+
+        Returns:
+            float: the seconds left
+        """
+        remaining = self.expires_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"The deadline of {self.seconds}s was exceeded")
+        return remaining
+
+    def clamp(self, timeout):
+        """
+        Caps a requests timeout to the time left
+
+        Args:
+            timeout (float or tuple): a timeout, or a (connect, read) tuple
+
+        Returns:
+            float or tuple: the timeout capped to the time left
+        """
+        remaining = self.check()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
+
+
+def deadline_kwargs(deadline):
+    """
+    The keyword arguments passing a deadline to the requester, if there is one
+
+    Args:
+        deadline (Deadline): the deadline or None
+
+    Returns:
+        dict: the keyword arguments
+    """
+    return {} if deadline is None else {"deadline": deadline}
@@ -0,0 +1,33 @@
+"""Tests for the deadlines"""
+from unittest.mock import patch
+
+import pytest
+
+from .deadline import Deadline, DeadlineExceeded, deadline_kwargs
+
+
+def test_from_seconds():
+    """no deadline is built without seconds"""
+    assert Deadline.from_seconds(None) is None
+    assert Deadline.from_seconds(5).seconds == 5
+
+
+def test_clamp():
+    """timeouts are capped to the time left"""
+    with patch("edx_api.deadline.time.monotonic", return_value=100):
+        deadline = Deadline(10)
+    with patch("edx_api.deadline.time.monotonic", return_value=104):
+        assert deadline.clamp(25) == 6
+        assert deadline.clamp(3) == 3
+        assert deadline.clamp((3.05, 25)) == (3.05, 6)
+        assert deadline.clamp(None) == 6
+    with patch("edx_api.deadline.time.monotonic", return_value=110):
+        with pytest.raises(DeadlineExceeded):
+            deadline.clamp(25)
+
+
+def test_deadline_kwargs():
+    """the deadline is only passed to the requester when set"""
+    deadline = Deadline(1)
+    assert deadline_kwargs(None) == {}
+    assert deadline_kwargs(deadline) == {"deadline": deadline}
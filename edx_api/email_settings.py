@@ -4,6 +4,8 @@ API client for interacting with change email settings
 import logging
 from urllib import parse
 
+from edx_api.bulk import DEFAULT_MAX_WORKERS, map_concurrently
+
 log = logging.getLogger(__name__)
 
 
@@ -25,10 +27,7 @@ class EmailSettings:
         Returns:
             JSON response (dict)
         """
-        response = self.requester.post(
-            parse.urljoin(self.base_url, self.api_url),
-            json=payload
-        )
+        response = self._post_settings(payload)
 
         try:
             response.raise_for_status()
@@ -36,17 +35,36 @@ class EmailSettings:
             log.error(response.json())
         return response.json().get("success", False)
 
+    def _post_settings(self, payload):
+        """Sends the settings to edX, returning the response whatever its status"""
+        return self.requester.post(
+            parse.urljoin(self.base_url, self.api_url),
+            json=payload
+        )
+
+    def _change_settings_or_raise(self, payload):
+        """Changes the settings, raising an HTTPError for an error status"""
+        response = self._post_settings(payload)
+        response.raise_for_status()
+        return response.json().get("success", False)
+
+    @staticmethod
+    def _payload(course_id, receive_emails):
+        """The settings payload subscribing the user to the emails of a course, or not"""
+        payload = {
+            "course_id": course_id,
+        }
+        if receive_emails:
+            payload["receive_emails"] = "on"
+        return payload
+
     def subscribe(self, course_id):
         """
         Subscribe the user to receive all course emails
         Args:
             course_id (int): Corresponding edx course id
         """
-        payload = {
-            "course_id": course_id,
-            "receive_emails": "on",
-        }
-        return self.change_settings(payload)
+        return self.change_settings(self._payload(course_id, True))
 
     def unsubscribe(self, course_id):
         """
@@ -54,7 +72,47 @@ class EmailSettings:
         Args:
             course_id (int): Corresponding edx course
         """
-        payload = {
-            "course_id": course_id,
-        }
-        return self.change_settings(payload)
+        return self.change_settings(self._payload(course_id, False))
+
+    def change_subscriptions(self, subscriptions, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Subscribes or unsubscribes the user to the emails of many courses concurrently
+        Args:
+            subscriptions (dict): whether the user receives the emails, by course id
+            max_workers (int): the maximum number of concurrent requests
+        Returns:
+            list of BulkResult: the outcome for each course id, its value is the
+                success flag returned by edX, its error the HTTPError of an error status
+        """
+        return map_concurrently(
+            lambda course_id: self._change_settings_or_raise(self._payload(course_id, subscriptions[course_id])),
+            list(subscriptions),
+            max_workers,
+        )
+
+    def subscribe_all(self, course_ids, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Subscribe the user to receive the emails of many courses
+        Args:
+            course_ids (iterable): edx course ids
+            max_workers (int): the maximum number of concurrent requests
+        Returns:
+            list of BulkResult: the outcome for each course id
+        """
+        return self.change_subscriptions(dict.fromkeys(course_ids, True), max_workers)
+
+    def unsubscribe_all(self, course_ids=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Unsubscribe the user from receiving the emails of many courses
+        Args:
+            course_ids (iterable): edx course ids, defaults to every course the user is enrolled in
+            max_workers (int): the maximum number of concurrent requests
+        Returns:
+            list of BulkResult: the outcome for each course id
+        """
+        if course_ids is None:
+            from edx_api.enrollments import CourseEnrollments  # pylint: disable=import-outside-toplevel
+
+            enrollments = CourseEnrollments(self.requester, self.base_url).get_student_enrollments()
+            course_ids = enrollments.get_enrolled_course_ids()
+        return self.change_subscriptions(dict.fromkeys(course_ids, False), max_workers)
@@ -1,10 +1,14 @@
 """test for change email settings"""
+import json
+
 import requests_mock
+from requests.exceptions import HTTPError
 from unittest import TestCase
 from urllib.parse import urljoin
 
 from edx_api.client import EdxApi
 from edx_api.email_settings import EmailSettings
+from edx_api.enrollments import CourseEnrollments
 
 
 class TestEmailSettings(TestCase):
@@ -36,3 +40,56 @@ class TestEmailSettings(TestCase):
             mocked_request.last_request.json(), {"course_id": self.course_id}
         )
         self.assertTrue(response)
+
+    @requests_mock.mock()
+    def test_change_subscriptions(self, mocked_request):
+        def settings_response(request, context):
+            if request.json()["course_id"] == "broken":
+                context.status_code = 500
+                return "<html>"
+            return json.dumps({"success": request.json()["course_id"] != "refused"})
+
+        mocked_request.post(self.api_url, text=settings_response)
+        results = self.email_settings.change_subscriptions({"a": True, "b": False, "refused": True, "broken": False})
+
+        self.assertEqual([result.item for result in results], ["a", "b", "refused", "broken"])
+        self.assertEqual([result.value for result in results], [True, True, False, None])
+        self.assertIsInstance(results[3].error, HTTPError)
+        payloads = sorted(
+            (request.json() for request in mocked_request.request_history), key=lambda payload: payload["course_id"]
+        )
+        self.assertEqual(payloads, [
+            {"course_id": "a", "receive_emails": "on"},
+            {"course_id": "b"},
+            {"course_id": "broken"},
+            {"course_id": "refused", "receive_emails": "on"},
+        ])
+
+    @requests_mock.mock()
+    def test_change_subscriptions_json_errors(self, mocked_request):
+        mocked_request.post(self.api_url, status_code=403, json={"success": False, "error": "forbidden"})
+        result, = self.email_settings.change_subscriptions({"a": True})
+
+        self.assertFalse(result.ok)
+        self.assertIsInstance(result.error, HTTPError)
+        self.assertEqual(result.error.response.status_code, 403)
+
+    @requests_mock.mock()
+    def test_subscribe_all(self, mocked_request):
+        mocked_request.post(self.api_url, json=self.json)
+        results = self.email_settings.subscribe_all(["a", "b", "a"])
+        self.assertEqual([(result.item, result.value) for result in results], [("a", "true"), ("b", "true")])
+        self.assertTrue(all("receive_emails" in request.json() for request in mocked_request.request_history))
+
+    @requests_mock.mock()
+    def test_unsubscribe_all_enrollments(self, mocked_request):
+        enrollment_url = urljoin(self.api_url, CourseEnrollments.enrollment_url)
+        mocked_request.get(enrollment_url, json=[
+            {"course_details": {"course_id": "course-v1:A+1+R"}, "user": "staff"},
+            {"course_details": {"course_id": "course-v1:B+2+R"}, "user": "staff"},
+        ])
+        mocked_request.post(self.api_url, json=self.json)
+        results = self.email_settings.unsubscribe_all()
+        self.assertEqual(sorted(result.item for result in results), ["course-v1:A+1+R", "course-v1:B+2+R"])
+        posted = sorted(request.json()["course_id"] for request in mocked_request.request_history[1:])
+        self.assertEqual(posted, ["course-v1:A+1+R", "course-v1:B+2+R"])
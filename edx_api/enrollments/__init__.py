@@ -2,6 +2,7 @@
 edX Enrollment REST API client class
 """
 from edx_api.constants import ENROLLMENT_MODE_AUDIT, ENROLLMENT_MODE_VERIFIED
+from edx_api.deadline import Deadline, deadline_kwargs
 
 try:
     from urlparse import urlparse, parse_qs
@@ -10,6 +11,7 @@ except ImportError:
 from urllib.parse import urljoin
 
 from .models import Enrollment, Enrollments
+from .structs import EnrollmentStruct
 
 
 # pylint: disable=too-few-public-methods
@@ -30,7 +32,7 @@ class CourseEnrollments:
         self.requester = requester
         self.base_url = base_url
 
-    def _get_enrollments_list_page(self, params=None):
+    def _get_enrollments_list_page(self, params=None, deadline=None):
         """
         Submit request to retrieve enrollments list.
 
@@ -41,9 +43,12 @@ class CourseEnrollments:
                     Optional.
                 * username: username: List of comma-separated usernames. Filters the result to the
                     course enrollments of the given users. Optional.
+            deadline (Deadline): the deadline of the whole listing, if any
         """
         req_url = urljoin(self.base_url, self.enrollment_list_url)
-        resp = self.requester.get(req_url, params=params)
+        if deadline is not None:
+            deadline.check()
+        resp = self.requester.get(req_url, params=params, **deadline_kwargs(deadline))
         resp.raise_for_status()
         resp_json = resp.json()
         results = resp_json['results']
@@ -60,7 +65,7 @@ class CourseEnrollments:
 
         return results, cursor
 
-    def get_enrollments(self, course_id=None, usernames=None):
+    def get_enrollments(self, course_id=None, usernames=None, deadline=None, typed=False):
         """
         List all course enrollments.
 
@@ -68,6 +73,10 @@ class CourseEnrollments:
             course_id (str, optional): If used enrollments will be filtered to the specified
                 course id.
             usernames (list, optional): List of usernames to filter enrollments.
+            deadline (float, optional): Seconds allowed to go through all the pages, counted from
+                the first page request. DeadlineExceeded is raised once they have elapsed.
+            typed (bool, optional): If True, each item is decoded into a validated, immutable
+                :class:`EnrollmentStruct` and SchemaError is raised for an unexpected payload.
 
         Notes:
             - This method returns an iterator to avoid going through the entire pagination at once.
@@ -88,19 +97,21 @@ class CourseEnrollments:
                     do_something(enrollment)
 
         Returns:
-            Generator with an instance of :class:`Enrollments` for each item.
+            Generator with an instance of :class:`Enrollments` (or :class:`EnrollmentStruct`) for each item.
         """
+        decode = EnrollmentStruct.from_json if typed else Enrollment
         params = {}
         if course_id is not None:
             params['course_id'] = course_id
         if usernames is not None and isinstance(usernames, list):
             params['username'] = ','.join(usernames)
 
+        deadline = Deadline.from_seconds(deadline)
         done = False
         while not done:
-            enrollments, next_cursor = self._get_enrollments_list_page(params)
+            enrollments, next_cursor = self._get_enrollments_list_page(params, deadline)
             for enrollment in enrollments:
-                yield Enrollment(enrollment)
+                yield decode(enrollment)
 
             if next_cursor:
                 params['cursor'] = next_cursor
@@ -3,6 +3,7 @@ Tests for the content of the __init__ module
 """
 import json
 import os
+import time
 from unittest import TestCase
 
 from unittest.mock import patch
@@ -12,7 +13,9 @@ from urllib.parse import urljoin
 
 from edx_api.client import EdxApi
 from edx_api.constants import ENROLLMENT_MODE_AUDIT, ENROLLMENT_MODE_VERIFIED
+from edx_api.deadline import DeadlineExceeded
 from edx_api.enrollments import CourseEnrollments
+from edx_api.enrollments.structs import EnrollmentStruct
 
 
 class EnrollmentsTest(TestCase):
@@ -135,6 +138,18 @@ class EnrollmentsTest(TestCase):
         enrollments = list(self.enrollment_client.get_enrollments())
         assert len(enrollments) == 8
 
+    @patch('edx_api.enrollments.CourseEnrollments._get_enrollments_list_page')
+    def test_get_enrollments_typed(self, mock_get_enrollments_list_page):
+        """
+        Test get_enrollments can decode the enrollments into structs.
+        """
+        mock_get_enrollments_list_page.side_effect = [(self.enrollments_list_json, None)]
+        enrollments = list(self.enrollment_client.get_enrollments(typed=True))
+        assert all(isinstance(enrollment, EnrollmentStruct) for enrollment in enrollments)
+        assert [enrollment.course_id for enrollment in enrollments] == [
+            enrollment['course_id'] for enrollment in self.enrollments_list_json
+        ]
+
     @requests_mock.mock()
     def test_get_enrollments_list(self, mock_req):
         """
@@ -161,6 +176,28 @@ class EnrollmentsTest(TestCase):
         enrollments = list(self.enrollment_client.get_enrollments())
         assert len(enrollments) == 4
 
+    @requests_mock.mock()
+    def test_get_enrollments_deadline(self, mock_req):
+        """
+        Test get_enrollments stops paginating once its deadline has passed.
+        """
+        def slow_page(request, context):  # pylint: disable=unused-argument
+            time.sleep(0.3)
+            return json.dumps({
+                'previous': None,
+                'results': self.enrollments_list_json[:2],
+                'next': 'http://base_url/enrl/?cursor=next-cursor'
+            })
+
+        mock_req.register_uri('GET', CourseEnrollments.enrollment_list_url, text=slow_page)
+        enrollments = self.enrollment_client.get_enrollments(deadline=0.2)
+        assert next(enrollments) is not None
+        assert next(enrollments) is not None
+        with self.assertRaises(DeadlineExceeded):
+            next(enrollments)
+        assert mock_req.call_count == 1
+        assert mock_req.last_request.timeout <= 0.2
+
     @requests_mock.mock()
     def test_deactivate_enrollment(self, request_mock):
         """
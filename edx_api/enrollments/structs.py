@@ -0,0 +1,138 @@
+"""
+Typed, immutable structs for the enrollments API, validated when they are decoded
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple, Union
+
+from edx_api.schema import SchemaError, datetime_field, field, mapping
+
+
+@dataclass(frozen=True)
+class CourseModeStruct:
+    """
+    Course enrollment mode
+    """
+    slug: str
+    name: Optional[str] = None
+    currency: Optional[str] = None
+    description: Optional[str] = None
+    expiration_datetime: Optional[datetime] = None
+    min_price: Optional[Union[int, float]] = None
+    suggested_prices: Optional[Union[str, list]] = None
+
+    @classmethod
+    def from_json(cls, payload, path=""):
+        """
+        Decodes a course mode payload
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            CourseModeStruct: the course mode
+        """
+        mapping(payload, path)
+        return cls(
+            slug=field(payload, "slug", str, path, required=True),
+            name=field(payload, "name", str, path),
+            currency=field(payload, "currency", str, path),
+            description=field(payload, "description", str, path),
+            expiration_datetime=datetime_field(payload, "expiration_datetime", path),
+            min_price=field(payload, "min_price", (int, float), path),
+            suggested_prices=field(payload, "suggested_prices", (str, list), path),
+        )
+
+
+@dataclass(frozen=True)
+class CourseDetailsStruct:
+    """
+    Course enrollment info
+    """
+    course_id: str
+    course_start: Optional[datetime] = None
+    course_end: Optional[datetime] = None
+    enrollment_start: Optional[datetime] = None
+    enrollment_end: Optional[datetime] = None
+    invite_only: bool = False
+    course_modes: Tuple[CourseModeStruct, ...] = ()
+
+    @classmethod
+    def from_json(cls, payload, path="course_details"):
+        """
+        Decodes the course details of an enrollment
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            CourseDetailsStruct: the course details
+        """
+        mapping(payload, path)
+        modes_path = f"{path}.course_modes"
+        return cls(
+            course_id=field(payload, "course_id", str, path, required=True),
+            course_start=datetime_field(payload, "course_start", path),
+            course_end=datetime_field(payload, "course_end", path),
+            enrollment_start=datetime_field(payload, "enrollment_start", path),
+            enrollment_end=datetime_field(payload, "enrollment_end", path),
+            invite_only=field(payload, "invite_only", bool, path, default=False),
+            course_modes=tuple(
+                CourseModeStruct.from_json(mode, f"{modes_path}[{index}]")
+                for index, mode in enumerate(field(payload, "course_modes", list, path, default=()))
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class EnrollmentStruct:
+    """
+    Single enrollment, the course details are only returned by some endpoints
+    """
+    course_id: str
+    user: Optional[str] = None
+    mode: Optional[str] = None
+    is_active: bool = False
+    created: Optional[datetime] = None
+    course_details: Optional[CourseDetailsStruct] = None
+
+    def __str__(self):
+        return f"<Enrollment for user {self.user} in course {self.course_id}>"
+
+    @property
+    def is_verified(self):
+        """
+        Checks if the mode is "verified"
+        """
+        return self.mode == 'verified'
+
+    @classmethod
+    def from_json(cls, payload, path=""):
+        """
+        Decodes an enrollment payload
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            EnrollmentStruct: the enrollment
+        """
+        mapping(payload, path)
+        details = payload.get("course_details")
+        details = None if details is None else CourseDetailsStruct.from_json(
+            details, f"{path}.course_details" if path else "course_details"
+        )
+        course_id = details.course_id if details is not None else field(payload, "course_id", str, path)
+        if course_id is None:
+            raise SchemaError(f"{path}.course_id" if path else "course_id", "is required")
+        return cls(
+            course_id=course_id,
+            user=field(payload, "user", str, path),
+            mode=field(payload, "mode", str, path),
+            is_active=field(payload, "is_active", bool, path, default=False),
+            created=datetime_field(payload, "created", path),
+            course_details=details,
+        )
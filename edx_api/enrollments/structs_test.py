@@ -0,0 +1,63 @@
+"""Tests for the typed enrollment structs"""
+import dataclasses
+import json
+import os.path
+from unittest import TestCase
+
+from edx_api.schema import SchemaError
+from .models import Enrollment
+from .structs import EnrollmentStruct
+
+
+class EnrollmentStructTests(TestCase):
+    """Tests for EnrollmentStruct"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(os.path.dirname(__file__), 'fixtures/user_enrollments.json')) as file_obj:
+            cls.enrollments_json = json.loads(file_obj.read())
+        with open(os.path.join(os.path.dirname(__file__), 'fixtures/enrollments_list.json')) as file_obj:
+            cls.enrollments_list_json = json.loads(file_obj.read())
+
+    def test_matches_the_models(self):
+        """the structs expose the same values as the models"""
+        for payload in self.enrollments_json:
+            struct = EnrollmentStruct.from_json(payload)
+            model = Enrollment(payload)
+            assert str(struct) == str(model)
+            for name in ('course_id', 'user', 'mode', 'is_active', 'created', 'is_verified'):
+                assert getattr(struct, name) == getattr(model, name), name
+            for name in ('course_start', 'course_end', 'enrollment_start', 'enrollment_end', 'invite_only'):
+                assert getattr(struct.course_details, name) == getattr(model.course_details, name), name
+            for struct_mode, model_mode in zip(struct.course_details.course_modes, model.course_details.course_modes):
+                for name in ('slug', 'name', 'currency', 'min_price', 'expiration_datetime', 'suggested_prices'):
+                    assert getattr(struct_mode, name) == getattr(model_mode, name), name
+
+    def test_without_course_details(self):
+        """the enrollments list has no course details"""
+        struct = EnrollmentStruct.from_json(self.enrollments_list_json[0])
+        assert struct.course_id == self.enrollments_list_json[0]['course_id']
+        assert struct.course_details is None
+
+    def test_immutable(self):
+        """the structs cannot be modified"""
+        struct = EnrollmentStruct.from_json(self.enrollments_json[0])
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            struct.mode = 'verified'
+        assert isinstance(struct.course_details.course_modes, tuple)
+
+    def test_schema_errors(self):
+        """unexpected payloads are reported with the path of the invalid value"""
+        payload = json.loads(json.dumps(self.enrollments_json[0]))
+        payload['course_details']['course_modes'][0]['slug'] = None
+        with self.assertRaises(SchemaError) as error:
+            EnrollmentStruct.from_json(payload)
+        assert error.exception.path == 'course_details.course_modes[0].slug'
+
+        with self.assertRaises(SchemaError) as error:
+            EnrollmentStruct.from_json(dict(self.enrollments_list_json[0], is_active='yes'))
+        assert error.exception.path == 'is_active'
+
+        with self.assertRaises(SchemaError) as error:
+            EnrollmentStruct.from_json({'user': 'staff'})
+        assert error.exception.path == 'course_id'
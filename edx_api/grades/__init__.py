@@ -4,8 +4,27 @@ edX Grades REST API client class
 from requests.exceptions import HTTPError
 from urllib.parse import urljoin
 
+from edx_api.bulk import DEFAULT_MAX_WORKERS, decode_and_build, map_concurrently, process_pool
+from edx_api.deadline import Deadline, deadline_kwargs
 from edx_api.enrollments import CourseEnrollments
 from .models import CurrentGrade, CurrentGradesByUser, CurrentGradesByCourse
+from .structs import CurrentGradeStruct
+
+
+def _typed_grades_page(payload):
+    """
+    Decodes a page of the course grades into CurrentGradeStruct objects, in a process of a
+    pool: only the structs and the URL of the next page are sent back
+
+    Args:
+        payload (dict or list): a decoded page, or the unpaginated list of the older releases
+
+    Returns:
+        tuple: the URL of the next page (None for the last one) and the grades
+    """
+    if isinstance(payload, dict) and 'results' in payload:
+        return payload['next'], [CurrentGradeStruct.from_json(entry) for entry in payload['results']]
+    return None, [CurrentGradeStruct.from_json(entry) for entry in payload]
 
 
 class UserCurrentGrades:
@@ -22,13 +41,14 @@ class UserCurrentGrades:
         self.requester = requester
         self.base_url = base_url
 
-    def get_student_current_grade(self, username, course_id):
+    def get_student_current_grade(self, username, course_id, typed=False):
         """
         Returns an CurrentGrade object for the user in a course
 
         Args:
             username (str): an edx user's username
             course_id (str): an edX course id.
+            typed (bool, optional): If True, returns a validated, immutable CurrentGradeStruct.
 
         Returns:
             CurrentGrade: object representing the student current grade for a course
@@ -43,6 +63,8 @@ class UserCurrentGrades:
 
         resp.raise_for_status()
 
+        if typed:
+            return CurrentGradeStruct.from_json(resp.json()[0])
         return CurrentGrade(resp.json()[0])
 
     def get_student_current_grades(self, username, course_ids=None):
@@ -72,12 +94,19 @@ class UserCurrentGrades:
 
         return CurrentGradesByUser(all_current_grades)
 
-    def get_course_current_grades(self, course_id):
+    def get_course_current_grades(self, course_id, deadline=None, typed=False, executor=None):
         """
         Returns a CurrentGradesByCourse object for all users in the specified course.
 
         Args:
             course_id (str): an edX course ids.
+            deadline (float, optional): Seconds allowed to fetch all the pages. DeadlineExceeded
+                is raised once they have elapsed.
+            typed (bool, optional): If True, the grades are decoded into validated, immutable
+                CurrentGradeStruct objects and SchemaError is raised for an unexpected payload.
+            executor (ProcessPoolExecutor, optional): If set, the pages are decoded into
+                CurrentGradeStruct objects (whatever typed is) in this pool of processes,
+                see edx_api.bulk.process_pool.
 
         Returns:
             CurrentGradesByCourse: object representing the student current grades
@@ -86,22 +115,66 @@ class UserCurrentGrades:
             The authenticated user must have staff permissions to see grades for all users
             in a course.
         """
+        decode = CurrentGradeStruct.from_json if typed else CurrentGrade
+        deadline = Deadline.from_seconds(deadline)
         resp = self.requester.get(
             urljoin(
                 self.base_url,
                 f'/api/grades/v1/courses/{course_id}/'
-            )
+            ),
+            **deadline_kwargs(deadline)
         )
         resp.raise_for_status()
+        if executor is not None:
+            return self._decode_pages_in_processes(resp, deadline, executor)
         resp_json = resp.json()
         if 'results' in resp_json:
-            grade_entries = [CurrentGrade(entry) for entry in resp_json["results"]]
+            grade_entries = [decode(entry) for entry in resp_json["results"]]
             while resp_json['next'] is not None:
-                resp = self.requester.get(resp_json['next'])
+                if deadline is not None:
+                    deadline.check()
+                resp = self.requester.get(resp_json['next'], **deadline_kwargs(deadline))
                 resp.raise_for_status()
                 resp_json = resp.json()
-                grade_entries.extend(CurrentGrade(entry) for entry in resp_json["results"])
+                grade_entries.extend(decode(entry) for entry in resp_json["results"])
         else:
-            grade_entries = [CurrentGrade(entry) for entry in resp_json]
+            grade_entries = [decode(entry) for entry in resp_json]
 
         return CurrentGradesByCourse(grade_entries)
+
+    def _decode_pages_in_processes(self, resp, deadline, executor):
+        """
+        Follows the pages of the course grades from resp, each page is decoded in the pool
+        of processes before the next one is requested
+        """
+        next_url, grade_entries = executor.submit(decode_and_build, _typed_grades_page, resp.content).result()
+        while next_url is not None:
+            if deadline is not None:
+                deadline.check()
+            resp = self.requester.get(next_url, **deadline_kwargs(deadline))
+            resp.raise_for_status()
+            next_url, entries = executor.submit(decode_and_build, _typed_grades_page, resp.content).result()
+            grade_entries.extend(entries)
+        return CurrentGradesByCourse(grade_entries)
+
+    def get_courses_current_grades(self, course_ids, max_workers=DEFAULT_MAX_WORKERS, processes=None):
+        """
+        Fetches the grade books of many courses concurrently, decoded into CurrentGradeStruct objects.
+
+        Decoding large grade pages is CPU bound, the fetching threads serialize on it. With
+        `processes` the threads only fetch the pages, which are decoded in a pool of processes.
+
+        Args:
+            course_ids (iterable): the edX course ids
+            max_workers (int): the maximum number of courses fetched concurrently
+            processes (int): if set, the number of processes decoding the pages
+
+        Returns:
+            list of BulkResult: the CurrentGradesByCourse of each course, or the error raised
+                for it, in the order of the course ids
+        """
+        with process_pool(processes) as executor:
+            return map_concurrently(
+                lambda course_id: self.get_course_current_grades(course_id, typed=True, executor=executor),
+                course_ids, max_workers=max_workers,
+            )
@@ -11,6 +11,7 @@ import requests_mock
 
 from edx_api import enrollments, grades
 from edx_api.client import EdxApi
+from edx_api.grades.structs import CurrentGradeStruct
 
 
 class GradesApiTestCase(TestCase):
@@ -93,6 +94,48 @@ class GradesApiTestCase(TestCase):
         self.assertIsInstance(grades_response, grades.CurrentGradesByCourse)
         self.assertEqual(len(grades_response.current_grades), 4)
 
+    @requests_mock.mock()
+    def test_typed_grades(self, mock_req):
+        """
+        Verify that the grades can be decoded into structs
+        """
+        mock_req.get(
+            requests_mock.ANY,
+            [
+                {"text": json.dumps(self.get_grades_data("course_grades_ironwood_p1.json"))},
+                {"text": json.dumps(self.get_grades_data("course_grades_ironwood_p2.json"))},
+            ],
+        )
+        grades_response = self.client.current_grades.get_course_current_grades(
+            "course-v1:edX+DemoX+Demo_Course", typed=True
+        )
+        self.assertEqual(len(grades_response.current_grades), 4)
+        for current_grade in grades_response.all_current_grades:
+            self.assertIsInstance(current_grade, CurrentGradeStruct)
+        self.assertEqual(grades_response.current_grades["tomoko"].percent, 0.97)
+
+    def test_courses_current_grades(self):
+        """
+        Verify that the grade books of many courses are decoded, in threads or in processes
+        """
+        pages = [
+            json.dumps(self.get_grades_data("course_grades_ironwood_p1.json")),
+            json.dumps(self.get_grades_data("course_grades_ironwood_p2.json")),
+        ]
+        for processes in (None, 2):
+            with requests_mock.Mocker() as mock_req:
+                mock_req.get(requests_mock.ANY, [{"text": page} for page in pages])
+                mock_req.get(urljoin(self.base_url, "/api/grades/v1/courses/course-v1:missing/"), status_code=404)
+                results = self.client.current_grades.get_courses_current_grades(
+                    ["course-v1:edX+DemoX+Demo_Course", "course-v1:missing"], processes=processes
+                )
+
+            self.assertEqual([result.item for result in results], ["course-v1:edX+DemoX+Demo_Course", "course-v1:missing"])
+            self.assertEqual(len(results[0].value.current_grades), 4)
+            self.assertIsInstance(results[0].value.current_grades["tomoko"], CurrentGradeStruct)
+            self.assertEqual(results[0].value.current_grades["tomoko"].percent, 0.97)
+            self.assertEqual(results[1].error.response.status_code, 404)
+
     @staticmethod
     def get_grades_data(filename):
         """
@@ -2,6 +2,8 @@
 Business objects for the Grades API
 """
 from collections.abc import Iterable
+
+from .structs import CurrentGradeStruct
 # pylint: disable=too-few-public-methods
 
 
@@ -32,7 +34,7 @@ class CurrentGradesByCourse(CurrentGrades):
         self.course_id = None
         self.current_grades = {}
         for current_grade in current_grade_list:
-            if not isinstance(current_grade, CurrentGrade):
+            if not isinstance(current_grade, (CurrentGrade, CurrentGradeStruct)):
                 raise ValueError("Only CurrentGrade objects are allowed")
             if self.course_id is None:
                 self.course_id = current_grade.course_id
@@ -62,7 +64,7 @@ class CurrentGradesByUser(CurrentGrades):
         self.username = None
         self.current_grades = {}
         for current_grade in current_grade_list:
-            if not isinstance(current_grade, CurrentGrade):
+            if not isinstance(current_grade, (CurrentGrade, CurrentGradeStruct)):
                 raise ValueError("Only CurrentGrade objects are allowed")
             self.current_grades[current_grade.course_id] = current_grade
 
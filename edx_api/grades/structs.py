@@ -0,0 +1,45 @@
+"""
+Typed, immutable structs for the Grades API, validated when they are decoded
+"""
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from edx_api.schema import field, mapping
+
+
+@dataclass(frozen=True)
+class CurrentGradeStruct:
+    """
+    Single current grade
+    """
+    course_id: str
+    username: str
+    email: Optional[str] = None
+    passed: Optional[bool] = None
+    percent: Optional[Union[int, float]] = None
+    letter_grade: Optional[str] = None
+
+    def __str__(self):
+        return f"<Current Grade for user {self.username} in course {self.course_id}>"
+
+    @classmethod
+    def from_json(cls, payload, path=""):
+        """
+        Decodes a current grade payload
+
+        Args:
+            payload (dict): the decoded JSON
+            path (str): the location of the payload, used in the errors
+
+        Returns:
+            CurrentGradeStruct: the current grade
+        """
+        mapping(payload, path)
+        return cls(
+            course_id=field(payload, "course_id", str, path, required=True),
+            username=field(payload, "username", str, path, required=True),
+            email=field(payload, "email", str, path),
+            passed=field(payload, "passed", bool, path),
+            percent=field(payload, "percent", (int, float), path),
+            letter_grade=field(payload, "letter_grade", str, path),
+        )
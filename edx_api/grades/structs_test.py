@@ -0,0 +1,33 @@
+"""Tests for the typed grade structs"""
+import json
+import os.path
+from unittest import TestCase
+
+from edx_api.schema import SchemaError
+from .models import CurrentGrade
+from .structs import CurrentGradeStruct
+
+
+class CurrentGradeStructTests(TestCase):
+    """Tests for CurrentGradeStruct"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(os.path.dirname(__file__), 'fixtures/course_grades_hawthorn.json')) as file_obj:
+            cls.grades_json = json.loads(file_obj.read())
+
+    def test_matches_the_models(self):
+        """the structs expose the same values as the models"""
+        for payload in self.grades_json:
+            struct = CurrentGradeStruct.from_json(payload)
+            model = CurrentGrade(payload)
+            assert str(struct) == str(model)
+            for name in ('course_id', 'username', 'email', 'passed', 'percent', 'letter_grade'):
+                assert getattr(struct, name) == getattr(model, name), name
+
+    def test_schema_errors(self):
+        """unexpected payloads are rejected"""
+        with self.assertRaisesRegex(SchemaError, '^percent: expected int or float, got str'):
+            CurrentGradeStruct.from_json(dict(self.grades_json[0], percent='0.9'))
+        with self.assertRaisesRegex(SchemaError, '^username: is required'):
+            CurrentGradeStruct.from_json(dict(self.grades_json[0], username=None))
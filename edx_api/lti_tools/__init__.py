@@ -1,6 +1,12 @@
 """Client for LTI Tools API"""
 from urllib.parse import urljoin
 
+from edx_api.bulk import DEFAULT_MAX_WORKERS, ProgressLog, call_with_retries, chunked, map_concurrently
+from .models import LTIUserFixResult
+
+# emails are read from the input and fixed this many at a time
+LTI_FIX_BATCH_SIZE = 500
+
 
 class LTITools:
     """
@@ -36,3 +42,74 @@ class LTITools:
                 '/api/lti-user-fix/'
             ),
             json=request_data)
+
+    def _fix_lti_user_or_raise(self, email):
+        """Fixes an LTI user, raising the transient errors (429 and 5xx) so that they are retried"""
+        response = self.fix_lti_user(email)
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    # pylint: disable=too-many-arguments
+    def fix_lti_users(
+        self, emails, max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None, retries=3, backoff=1.0, progress_log=None
+    ):
+        """
+        Fixes many LTI users with duplicate emails
+
+        The emails are read lazily and fixed concurrently, batch after batch. Requests failing
+        with a connection error, a timeout, a 429 or a 5xx response are retried after a backoff.
+        Every outcome is recorded in the progress log: with a log kept in a file, running the
+        fix again skips the users already fixed.
+
+        Args:
+            emails (iterable): Emails of the Application users
+            max_workers (int): the maximum number of concurrent requests
+            rate_limiter (RateLimiter): limits the rate of the requests
+            retries (int): the number of times a request is retried
+            backoff (float): the delay before the first retry in seconds, doubled for every other retry
+            progress_log (ProgressLog or str): the progress log, or the path of its file
+
+        Yields:
+            LTIUserFixResult: the outcome for each email, in order
+        """
+        if progress_log is None or isinstance(progress_log, str):
+            progress_log = ProgressLog(progress_log)
+
+        def fix(email):
+            """Fixes a user and records the outcome"""
+            try:
+                response = call_with_retries(
+                    self._fix_lti_user_or_raise, email, retries=retries, backoff=backoff
+                )
+                result = LTIUserFixResult(email, response.ok, response.status_code, _response_message(response))
+            except Exception as error:  # pylint: disable=broad-except
+                response = getattr(error, "response", None)
+                result = LTIUserFixResult(
+                    email, False, getattr(response, "status_code", None), str(error)
+                )
+            progress_log.record(email, result.fixed, status_code=result.status_code, message=result.message)
+            return result
+
+        for batch in chunked(emails, LTI_FIX_BATCH_SIZE):
+            pending = [email for email in dict.fromkeys(batch) if not progress_log.is_done(email)]
+            fixed = {result.item: result.value for result in map_concurrently(fix, pending, max_workers, rate_limiter)}
+            for email in batch:
+                if email in fixed:
+                    yield fixed[email]
+                else:
+                    record = progress_log.get(email)
+                    yield LTIUserFixResult(email, True, record.get("status_code"), "already fixed")
+
+
+def _response_message(response):
+    """The message of an LTI user fix response"""
+    try:
+        payload = response.json()
+    except ValueError:
+        return response.text[:200]
+    if isinstance(payload, dict):
+        for key in ("message", "detail", "error"):
+            if key in payload:
+                return str(payload[key])
+    return str(payload)[:200]
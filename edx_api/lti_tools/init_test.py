@@ -1,9 +1,12 @@
 """Tests for LTI Tools API client"""
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from urllib.parse import urljoin
 
+from edx_api.bulk import ProgressLog, RateLimiter
+from edx_api.client import EdxApi
 from edx_api.lti_tools import LTITools
+from edx_api.lti_tools.models import LTIUserFixResult
 
 
 class TestLTITools:
@@ -65,4 +68,73 @@ class TestLTITools:
         self.client.fix_lti_user(email)
 
         call_args = self.requester.post.call_args
-        assert call_args[1]['json'] == {"email": email}
\ No newline at end of file
+        assert call_args[1]['json'] == {"email": email}
+
+
+class TestFixLTIUsers:
+    """Tests for the bulk LTI user fix"""
+
+    base_url = "https://example.edx.org"
+    fix_url = urljoin(base_url, '/api/lti-user-fix/')
+
+    @staticmethod
+    def fix_response(request, context):
+        """fixes the users, except unknown ones"""
+        email = request.json()["email"]
+        if email.startswith("unknown"):
+            context.status_code = 404
+            return {"detail": "User not found"}
+        return {"message": f"Fixed {email}"}
+
+    def test_fix_lti_users(self, requests_mock):
+        """the outcome of every email is normalized, in order"""
+        requests_mock.post(self.fix_url, json=self.fix_response)
+        client = EdxApi({"access_token": "token"}, self.base_url).lti_tools
+        limiter = Mock(wraps=RateLimiter(1000, burst=10))
+
+        results = list(client.fix_lti_users(
+            iter(["a@example.com", "unknown@example.com", "b@example.com"]), rate_limiter=limiter
+        ))
+
+        assert results == [
+            LTIUserFixResult("a@example.com", True, 200, "Fixed a@example.com"),
+            LTIUserFixResult("unknown@example.com", False, 404, "User not found"),
+            LTIUserFixResult("b@example.com", True, 200, "Fixed b@example.com"),
+        ]
+        assert limiter.acquire.call_count == 3
+
+    def test_retries_and_errors(self, requests_mock):
+        """transient errors are retried, the last error is reported"""
+        requests_mock.post(self.fix_url, [
+            {"status_code": 503, "text": "unavailable"},
+            {"json": {"message": "Fixed"}},
+            {"status_code": 502, "text": "bad gateway"},
+        ])
+        client = EdxApi({"access_token": "token"}, self.base_url).lti_tools
+        with patch("edx_api.bulk.time.sleep"):
+            assert list(client.fix_lti_users(["a@example.com"], backoff=0)) == [
+                LTIUserFixResult("a@example.com", True, 200, "Fixed")
+            ]
+            result, = client.fix_lti_users(["b@example.com"], retries=0)
+        assert not result.fixed
+        assert result.status_code == 502
+        assert "502" in result.message
+
+    def test_resumes_from_progress_log(self, requests_mock, tmp_path):
+        """the users already fixed are not sent again"""
+        path = str(tmp_path / "lti.jsonl")
+        requests_mock.post(self.fix_url, json=self.fix_response)
+        client = EdxApi({"access_token": "token"}, self.base_url).lti_tools
+        list(client.fix_lti_users(["a@example.com", "unknown@example.com"], progress_log=path))
+
+        results = list(client.fix_lti_users(
+            ["a@example.com", "unknown@example.com", "c@example.com"], progress_log=path
+        ))
+
+        assert [(result.email, result.fixed, result.message) for result in results] == [
+            ("a@example.com", True, "already fixed"),
+            ("unknown@example.com", False, "User not found"),
+            ("c@example.com", True, "Fixed c@example.com"),
+        ]
+        assert requests_mock.call_count == 4
+        assert ProgressLog(path).done == {"a@example.com", "c@example.com"}
@@ -0,0 +1,8 @@
+"""
+Business objects for the LTI Tools API
+"""
+from collections import namedtuple
+
+# the outcome of the fix of an LTI user: whether it was fixed, the HTTP status of the
+# response (None when no response was received) and the message of edX or the error
+LTIUserFixResult = namedtuple("LTIUserFixResult", ["email", "fixed", "status_code", "message"])
@@ -0,0 +1,88 @@
+"""
+In-process metrics recorded by the edX API client
+"""
+import threading
+
+
+class Metrics:
+    """
+    Thread-safe counters, gauges and timings, each kept per endpoint group.
+
+    Usage:
+        >>> api = EdxApi({'access_token': 'token'})
+        >>> api.enrollments.get_student_enrollments()
+        >>> api.metrics.snapshot()["counters"]["requests"]
+        {'enrollment': 1}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timings = {}
+
+    def increment(self, name, group=None, value=1):
+        """
+        Adds value to a counter
+
+        Args:
+            name (str): the counter name
+            group (str): the endpoint group
+            value (int): the amount to add
+        """
+        with self._lock:
+            counter = self._counters.setdefault(name, {})
+            counter[group] = counter.get(group, 0) + value
+
+    def set_gauge(self, name, value, group=None):
+        """
+        Sets a gauge
+
+        Args:
+            name (str): the gauge name
+            value (object): the current value
+            group (str): the endpoint group
+        """
+        with self._lock:
+            self._gauges.setdefault(name, {})[group] = value
+
+    def observe(self, name, value, group=None):
+        """
+        Records a measurement (e.g. a duration in seconds)
+
+        Args:
+            name (str): the timing name
+            value (float): the measurement
+            group (str): the endpoint group
+        """
+        with self._lock:
+            timing = self._timings.setdefault(name, {}).setdefault(
+                group, {"count": 0, "total": 0.0, "max": 0.0}
+            )
+            timing["count"] += 1
+            timing["total"] += value
+            timing["max"] = max(timing["max"], value)
+
+    def snapshot(self):
+        """
+        Returns a copy of all the metrics
+
+        Returns:
+            dict: the counters, gauges and timings, by name then by group
+        """
+        with self._lock:
+            return {
+                "counters": {name: dict(groups) for name, groups in self._counters.items()},
+                "gauges": {name: dict(groups) for name, groups in self._gauges.items()},
+                "timings": {
+                    name: {group: dict(timing) for group, timing in groups.items()}
+                    for name, groups in self._timings.items()
+                },
+            }
+
+    def reset(self):
+        """Clears all the metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
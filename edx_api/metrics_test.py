@@ -0,0 +1,31 @@
+"""Tests for the metrics"""
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import Metrics
+
+
+def test_metrics_snapshot():
+    """counters, gauges and timings are kept per group"""
+    metrics = Metrics()
+    metrics.increment("requests", "grades")
+    metrics.increment("requests", "grades", 2)
+    metrics.increment("requests", "enrollment")
+    metrics.set_gauge("circuit_state", "open", "grades")
+    metrics.observe("request_seconds", 0.5, "grades")
+    metrics.observe("request_seconds", 1.5, "grades")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"requests": {"grades": 3, "enrollment": 1}}
+    assert snapshot["gauges"] == {"circuit_state": {"grades": "open"}}
+    assert snapshot["timings"] == {"request_seconds": {"grades": {"count": 2, "total": 2.0, "max": 1.5}}}
+
+    metrics.reset()
+    assert metrics.snapshot() == {"counters": {}, "gauges": {}, "timings": {}}
+
+
+def test_metrics_thread_safe():
+    """concurrent increments are not lost"""
+    metrics = Metrics()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: metrics.increment("requests", "grades"), range(1000)))
+    assert metrics.snapshot()["counters"]["requests"]["grades"] == 1000
@@ -0,0 +1,178 @@
+"""
+A registry of EdxApi clients for processes talking to many Open edX instances
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .client import EdxApi
+
+
+def tenant_key(base_url, credentials):
+    """
+    The identity of a tenant: its base URL and a digest of its credentials
+
+    Args:
+        base_url (str): the base URL of the edX instance
+        credentials (dict): the credentials used with the instance
+
+    Returns:
+        tuple: the tenant key
+    """
+    digest = hashlib.sha256(json.dumps(credentials, sort_keys=True).encode("utf-8")).hexdigest()
+    return base_url.rstrip("/"), digest
+
+
+class EdxApiPool:
+    """
+    Keeps one EdxApi per (base_url, credentials) so that tenants reuse their sub-clients
+    and connection pools across calls.
+
+    The total number of connections is bounded: each tenant gets a connection pool of
+    max_connections // max_tenants connections, and at most max_tenants tenants are kept,
+    the least recently used one being closed to make room. Tenants unused for
+    idle_timeout seconds are closed as well.
+
+    A client returned by `get` may be closed by an eviction while another thread still
+    uses it. Threads sharing a pool use `lease` instead: a leased tenant is neither idle
+    nor evicted while tenants that are not leased can make room. When every tenant is
+    leased the least recently used one is still dropped from the pool, but it is only
+    closed once its last lease is released, its connections stay open in the meantime
+    and the bound on the connections is then exceeded.
+    """
+
+    def __init__(self, max_tenants=32, max_connections=256, idle_timeout=600, **client_kwargs):
+        """
+        Args:
+            max_tenants (int): maximum number of clients kept open
+            max_connections (int): maximum number of connections across all the tenants
+            idle_timeout (float): seconds after which an unused tenant is closed
+            **client_kwargs: extra arguments used to build every EdxApi
+        """
+        if max_connections < max_tenants:
+            raise ValueError("max_connections must allow at least one connection per tenant")
+        self.max_tenants = max_tenants
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        # tenant key -> [client, last use, leases, evicted], least recently used first
+        self._tenants = OrderedDict()
+
+    @property
+    def connections_per_tenant(self):
+        """The size of the connection pool of each tenant"""
+        return self.max_connections // self.max_tenants
+
+    def get(self, base_url, credentials):
+        """
+        Returns the client of a tenant, building it on first use
+
+        The client may be closed by a later call making room for another tenant, see lease.
+
+        Args:
+            base_url (str): the base URL of the edX instance
+            credentials (dict): the credentials used with the instance
+
+        Returns:
+            EdxApi: the client of the tenant
+        """
+        return self._acquire(base_url, credentials, lease=False)[0]
+
+    @contextmanager
+    def lease(self, base_url, credentials):
+        """
+        Returns the client of a tenant for the duration of a with block, building it on
+        first use. The client is not closed until the block exits.
+
+        Args:
+            base_url (str): the base URL of the edX instance
+            credentials (dict): the credentials used with the instance
+
+        Yields:
+            EdxApi: the client of the tenant
+        """
+        tenant = self._acquire(base_url, credentials, lease=True)
+        try:
+            yield tenant[0]
+        finally:
+            self._release(tenant)
+
+    def _acquire(self, base_url, credentials, lease):
+        """Returns the tenant of base_url and credentials, leased if lease is True"""
+        key = tenant_key(base_url, credentials)
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_idle(now))
+            tenant = self._tenants.get(key)
+            if tenant is None:
+                while len(self._tenants) >= self.max_tenants:
+                    evicted.append(self._pop_least_recently_used())
+                client = EdxApi(
+                    credentials, base_url, pool_maxsize=self.connections_per_tenant, **self.client_kwargs
+                )
+                tenant = self._tenants[key] = [client, now, 0, False]
+            else:
+                self._tenants.move_to_end(key)
+                tenant[1] = now
+            if lease:
+                tenant[2] += 1
+        self._close(evicted)
+        return tenant
+
+    def _release(self, tenant):
+        """Releases a lease of a tenant, closing it if it was evicted meanwhile"""
+        with self._lock:
+            tenant[2] -= 1
+            tenant[1] = time.monotonic()
+            close = tenant[3] and not tenant[2]
+        if close:
+            tenant[0].close()
+
+    def _close(self, tenants):
+        """Closes the tenants removed from the pool, deferring the ones leased to their release"""
+        for tenant in tenants:
+            with self._lock:
+                tenant[3] = True
+                leased = tenant[2] > 0
+            if not leased:
+                tenant[0].close()
+
+    def _pop_least_recently_used(self):
+        """Removes the least recently used tenant, preferring the ones not leased"""
+        key = next((key for key, tenant in self._tenants.items() if not tenant[2]), next(iter(self._tenants)))
+        return self._tenants.pop(key)
+
+    def _pop_idle(self, now):
+        """Removes the tenants idle for longer than idle_timeout, the leased ones are in use"""
+        idle = [
+            key for key, (_, last_used, leases, _) in self._tenants.items()
+            if not leases and now - last_used > self.idle_timeout
+        ]
+        return [self._tenants.pop(key) for key in idle]
+
+    def evict_idle(self):
+        """
+        Closes the tenants idle for longer than idle_timeout
+
+        Returns:
+            int: the number of tenants closed
+        """
+        with self._lock:
+            evicted = self._pop_idle(time.monotonic())
+        self._close(evicted)
+        return len(evicted)
+
+    def close(self):
+        """Closes every tenant, the leased ones once they are released"""
+        with self._lock:
+            evicted = list(self._tenants.values())
+            self._tenants.clear()
+        self._close(evicted)
+
+    def __len__(self):
+        return len(self._tenants)
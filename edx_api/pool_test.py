@@ -0,0 +1,126 @@
+"""Tests for the multi-tenant client pool"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from .pool import EdxApiPool, tenant_key
+
+LMS_A = "https://lms-a.example.com/"
+LMS_B = "https://lms-b.example.com/"
+
+
+def test_tenant_key():
+    """the key ignores the trailing slash and the credentials order"""
+    assert tenant_key(LMS_A, {"a": 1, "b": 2}) == tenant_key(LMS_A.rstrip("/"), {"b": 2, "a": 1})
+    assert tenant_key(LMS_A, {"access_token": "one"}) != tenant_key(LMS_A, {"access_token": "two"})
+
+
+def test_reuses_clients():
+    """a tenant gets the same client, other tenants get their own"""
+    pool = EdxApiPool()
+    client = pool.get(LMS_A, {"access_token": "token"})
+    assert pool.get(LMS_A, {"access_token": "token"}) is client
+    assert pool.get(LMS_B, {"access_token": "token"}) is not client
+    assert pool.get(LMS_A, {"access_token": "other"}) is not client
+    assert len(pool) == 3
+
+
+def test_concurrent_get_builds_one_client():
+    """threads asking for the same tenant share one client"""
+    pool = EdxApiPool()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: pool.get(LMS_A, {"access_token": "token"}), range(32)))
+    assert all(client is clients[0] for client in clients)
+
+
+def test_connection_pools_are_bounded():
+    """each tenant gets an equal share of the connections"""
+    pool = EdxApiPool(max_tenants=4, max_connections=40, timeout=5)
+    client = pool.get(LMS_A, {"access_token": "token"})
+    assert pool.connections_per_tenant == 10
+    assert client.transport._pool_maxsize == 10  # pylint: disable=protected-access
+    assert client.transport._pool_block is True  # pylint: disable=protected-access
+    assert client.timeout == 5
+    assert client.enrollments.requester.get_adapter(LMS_A) is client.transport
+
+    with pytest.raises(ValueError):
+        EdxApiPool(max_tenants=10, max_connections=5)
+
+
+def test_evicts_least_recently_used():
+    """the least recently used tenant is closed when the pool is full"""
+    pool = EdxApiPool(max_tenants=2, max_connections=4)
+    first = pool.get(LMS_A, {"access_token": "one"})
+    second = pool.get(LMS_A, {"access_token": "two"})
+    pool.get(LMS_A, {"access_token": "one"})
+
+    with patch.object(second, "close") as close:
+        pool.get(LMS_B, {"access_token": "three"})
+    close.assert_called_once_with()
+    assert len(pool) == 2
+    assert pool.get(LMS_A, {"access_token": "one"}) is first
+
+
+def test_evicts_idle_tenants():
+    """tenants unused for idle_timeout seconds are closed"""
+    pool = EdxApiPool(idle_timeout=60)
+    with patch("edx_api.pool.time.monotonic", return_value=1000):
+        idle = pool.get(LMS_A, {"access_token": "token"})
+    with patch("edx_api.pool.time.monotonic", return_value=1030):
+        active = pool.get(LMS_B, {"access_token": "token"})
+    with patch("edx_api.pool.time.monotonic", return_value=1070), patch.object(idle, "close") as close:
+        assert pool.evict_idle() == 1
+    close.assert_called_once_with()
+    with patch("edx_api.pool.time.monotonic", return_value=1080):
+        assert pool.get(LMS_B, {"access_token": "token"}) is active
+
+
+def test_close():
+    """closing the pool closes every tenant"""
+    pool = EdxApiPool()
+    client = pool.get(LMS_A, {"access_token": "token"})
+    with patch.object(client, "close") as close:
+        pool.close()
+    close.assert_called_once_with()
+    assert len(pool) == 0
+
+
+def test_leased_tenants_are_not_evicted():
+    """making room evicts the least recently used tenant that is not leased"""
+    pool = EdxApiPool(max_tenants=2, max_connections=4)
+    with pool.lease(LMS_A, {"access_token": "one"}) as leased:
+        other = pool.get(LMS_A, {"access_token": "two"})
+        with patch.object(leased, "close") as close_leased, patch.object(other, "close") as close_other:
+            pool.get(LMS_B, {"access_token": "three"})
+        close_leased.assert_not_called()
+        close_other.assert_called_once_with()
+        assert pool.get(LMS_A, {"access_token": "one"}) is leased
+
+
+def test_evicted_leases_are_closed_on_release():
+    """a leased tenant evicted because every tenant is leased is closed by its last release"""
+    pool = EdxApiPool(max_tenants=1, max_connections=4)
+    first = pool.get(LMS_A, {"access_token": "one"})
+    with patch.object(first, "close") as close:
+        with pool.lease(LMS_A, {"access_token": "one"}):
+            with pool.lease(LMS_A, {"access_token": "one"}):
+                with pool.lease(LMS_B, {"access_token": "two"}) as second:
+                    assert second is not first
+                    assert len(pool) == 1
+            close.assert_not_called()
+        close.assert_called_once_with()
+
+
+def test_leased_tenants_are_not_idle():
+    """a tenant leased for longer than idle_timeout is not closed, its release counts as a use"""
+    pool = EdxApiPool(idle_timeout=60)
+    with patch("edx_api.pool.time.monotonic", return_value=1000):
+        lease = pool.lease(LMS_A, {"access_token": "token"})
+        client = lease.__enter__()  # pylint: disable=unnecessary-dunder-call
+    with patch("edx_api.pool.time.monotonic", return_value=1100):
+        assert pool.evict_idle() == 0
+        lease.__exit__(None, None, None)
+    with patch("edx_api.pool.time.monotonic", return_value=1150):
+        assert pool.evict_idle() == 0
+        assert pool.get(LMS_A, {"access_token": "token"}) is client
@@ -0,0 +1,184 @@
+"""
+The requester (HTTP session) used by every edX API client
+"""
+import re
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.models import PreparedRequest
+
+from . import DEFAULT_TIME_OUT
+from .circuit_breaker import CircuitOpenError
+from .serialization import EdxResponse
+
+VERSION_SEGMENT = re.compile(r"^v\d+(\.\d+)?$")
+
+
+def endpoint_group(url):
+    """
+    The group of edX endpoints a URL belongs to: the first path segment that is
+    neither `api` nor a version, e.g. `grades` for /api/grades/v1/courses/...
+
+    Args:
+        url (str): the request URL
+
+    Returns:
+        str: the endpoint group
+    """
+    for segment in urlsplit(url).path.split("/"):
+        if segment and segment != "api" and not VERSION_SEGMENT.match(segment):
+            return segment
+    return ""
+
+
+class EdxSession(requests.Session):
+    """
+    A requests session applying the client defaults to every request made to edX.
+
+    - a timeout is added to each request unless one is passed explicitly, the timeout
+      of the longest matching URL path prefix in `path_timeouts` wins over the default
+    - a `deadline` (edx_api.deadline.Deadline) can be passed to cap the timeout of a
+      request to the time left, DeadlineExceeded is raised once it has passed
+    - concurrent identical GET requests (same URL, params, headers and credentials)
+      are coalesced into a single request when a SingleFlight group is provided,
+      unless they carry a deadline
+    - requests fail fast with CircuitOpenError while the circuit breaker of their
+      endpoint group is open
+    - request counts, errors and durations are recorded per endpoint group, as well
+      as the bytes received (compressed) and decoded (decompressed)
+    - response.json() decodes with the fastest JSON library installed, see
+      edx_api.serialization
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self, timeout=DEFAULT_TIME_OUT, single_flight=None, circuit_breakers=None, metrics=None, path_timeouts=None
+    ):
+        """
+        Args:
+            timeout (float or tuple): default timeout for the requests, or (connect, read) timeouts
+            single_flight (SingleFlight): group used to coalesce concurrent GET requests
+            circuit_breakers (CircuitBreakers): the circuit breakers by endpoint group
+            metrics (Metrics): where the request metrics are recorded
+            path_timeouts (dict): timeouts by URL path prefix
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.single_flight = single_flight
+        self.circuit_breakers = circuit_breakers
+        self.metrics = metrics
+        self.path_timeouts = sorted((path_timeouts or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def timeout_for(self, url):
+        """
+        Returns the timeout of a request to url
+
+        Args:
+            url (str): the request URL
+
+        Returns:
+            float or tuple: the timeout
+        """
+        if self.path_timeouts:
+            path = urlsplit(url).path
+            for prefix, timeout in self.path_timeouts:
+                if path.startswith(prefix):
+                    return timeout
+        return self.timeout
+
+    def _coalescing_key(self, url, kwargs):
+        """
+        Builds the identity of a GET request, or None if it must not be coalesced
+        """
+        if set(kwargs) - {"params", "headers", "timeout", "allow_redirects"}:
+            return None
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, kwargs.get("params"))
+        headers = kwargs.get("headers") or {}
+        return (
+            prepared.url,
+            # the auth object stands for the credentials when tokens come from a provider
+            self.auth if self.auth is not None else self.headers.get("Authorization"),
+            tuple(sorted((str(key).lower(), str(value)) for key, value in headers.items())),
+        )
+
+    def _record(self, name, group, value=1):
+        """Increments a counter if metrics are recorded"""
+        if self.metrics is not None:
+            self.metrics.increment(name, group, value)
+
+    def _record_circuit(self, group, breaker):
+        """Exposes the circuit state of the endpoint group"""
+        if self.metrics is not None:
+            self.metrics.set_gauge("circuit_state", breaker.state, group)
+
+    def _record_body_size(self, response, group, stream):
+        """
+        Records the size of the response body on the wire and once decompressed.
+        Streamed bodies are not read here, they are not measured.
+        """
+        if stream:
+            return
+        decoded = len(response.content or b"")
+        try:
+            received = response.raw.tell()
+        except AttributeError:
+            received = decoded
+        self.metrics.increment("bytes_received", group, received)
+        self.metrics.increment("bytes_decoded", group, decoded)
+        encoding = response.headers.get("Content-Encoding")
+        if encoding:
+            self.metrics.increment(f"encoding_{encoding.lower()}", group)
+
+    def _send(self, method, url, *args, **kwargs):
+        """
+        Sends a request through the circuit breaker of its endpoint group
+        """
+        group = endpoint_group(url)
+        breaker = self.circuit_breakers.get(group) if self.circuit_breakers is not None else None
+        if breaker is not None:
+            allowed = breaker.allow()
+            # the circuit may have half-opened since the last call recorded its state
+            self._record_circuit(group, breaker)
+            if not allowed:
+                self._record("circuit_rejected", group)
+                raise CircuitOpenError(f"The circuit of the '{group}' endpoints is open")
+
+        started = time.monotonic()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception:
+            self._record("request_errors", group)
+            if breaker is not None:
+                breaker.record(False)
+                self._record_circuit(group, breaker)
+            raise
+        duration = time.monotonic() - started
+        if type(response) is requests.Response:  # pylint: disable=unidiomatic-typecheck
+            response.__class__ = EdxResponse
+
+        self._record("requests", group)
+        if response.status_code >= 500:
+            self._record("server_errors", group)
+        if self.metrics is not None:
+            self.metrics.observe("request_seconds", duration, group)
+            self._record_body_size(response, group, kwargs.get("stream", False))
+        if breaker is not None:
+            breaker.record(response.status_code < 500, duration)
+            self._record_circuit(group, breaker)
+        return response
+
+    def request(self, method, url, *args, **kwargs):  # pylint: disable=arguments-differ
+        deadline = kwargs.pop("deadline", None)
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self.timeout_for(url)
+        if deadline is not None:
+            kwargs["timeout"] = deadline.clamp(kwargs["timeout"])
+        # a request with a deadline is not coalesced: it would wait for the request in flight,
+        # whose timeout is not capped to its own deadline
+        if self.single_flight is not None and deadline is None and not args and method.upper() == "GET":
+            key = self._coalescing_key(url, kwargs)
+            if key is not None:
+                return self.single_flight.do(key, self._send, method, url, **kwargs)
+        return self._send(method, url, *args, **kwargs)
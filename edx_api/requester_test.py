@@ -0,0 +1,258 @@
+"""Tests for the requester and the request coalescing"""
+import asyncio
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from .client import EdxApi
+from .deadline import Deadline, DeadlineExceeded
+from .metrics import Metrics
+from .requester import EdxSession, endpoint_group
+from .single_flight import SingleFlight
+
+BASE_URL = "http://edx.example.com"
+DETAIL_URL = f"{BASE_URL}/api/courses/v1/courses/course-v1:edX+DemoX+Demo_Course"
+
+
+def _wait_for_dups(flight, key, count):
+    """Blocks until `count` callers are waiting on the in-flight call for key"""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:  # pylint: disable=protected-access
+            call = flight._calls.get(key)  # pylint: disable=protected-access
+            if call is not None and call.dups >= count:
+                return
+        time.sleep(0.001)
+    raise AssertionError("callers never joined the in-flight call")
+
+
+def test_single_flight_shares_result():
+    """concurrent calls with the same key run the function once"""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"id": 1}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "key", fetch) for _ in range(5)]
+        _wait_for_dups(flight, "key", 4)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert not flight._calls  # pylint: disable=protected-access
+
+
+def test_single_flight_shares_error():
+    """followers receive the exception raised by the leader"""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", fetch) for _ in range(3)]
+        _wait_for_dups(flight, "key", 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_single_flight_does_not_cache():
+    """sequential calls are not coalesced"""
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+
+
+def test_single_flight_async():
+    """concurrent coroutines with the same key await a single call"""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def run():
+        return await asyncio.gather(
+            flight.do_async("key", fetch, 1),
+            flight.do_async("key", fetch, 2),
+            flight.do_async("other", fetch, 3),
+        )
+
+    assert asyncio.run(run()) == [1, 1, 3]
+    assert calls == [1, 3]
+
+
+def test_single_flight_async_error():
+    """followers receive the exception raised by the leading coroutine"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            flight.do_async("key", fetch), flight.do_async("key", fetch), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_session_default_timeout(requests_mock):
+    """the session timeout is used unless one is passed"""
+    requests_mock.get(DETAIL_URL, json={})
+    session = EdxSession(timeout=3)
+    session.get(DETAIL_URL)
+    assert requests_mock.last_request.timeout == 3
+    session.get(DETAIL_URL, timeout=7)
+    assert requests_mock.last_request.timeout == 7
+
+
+def test_session_coalesces_identical_gets(requests_mock):
+    """concurrent identical GETs through the client are sent once"""
+    release = threading.Event()
+
+    def slow_response(request, context):  # pylint: disable=unused-argument
+        release.wait(5)
+        return {"id": "course-v1:edX+DemoX+Demo_Course"}
+
+    requests_mock.get(DETAIL_URL, json=slow_response)
+    api = EdxApi({"access_token": "token"}, BASE_URL)
+    session = api.get_requester()
+    key = session._coalescing_key(DETAIL_URL, {})  # pylint: disable=protected-access
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(lambda: api.course_detail.get_detail("course-v1:edX+DemoX+Demo_Course"))
+            for _ in range(4)
+        ]
+        _wait_for_dups(api._single_flight, key, 3)  # pylint: disable=protected-access
+        release.set()
+        details = [future.result() for future in futures]
+
+    assert requests_mock.call_count == 1
+    assert {detail.course_id for detail in details} == {"course-v1:edX+DemoX+Demo_Course"}
+
+
+def test_coalescing_key_identity():
+    """requests for other credentials, params or streams are not coalesced together"""
+    session = EdxSession(single_flight=SingleFlight())
+    session.headers["Authorization"] = "Bearer one"
+    key = session._coalescing_key(DETAIL_URL, {"params": {"a": 1}})  # pylint: disable=protected-access
+    assert key != session._coalescing_key(DETAIL_URL, {"params": {"a": 2}})  # pylint: disable=protected-access
+    assert session._coalescing_key(DETAIL_URL, {"stream": True}) is None  # pylint: disable=protected-access
+
+    other = EdxSession(single_flight=SingleFlight())
+    other.headers["Authorization"] = "Bearer two"
+    assert key != other._coalescing_key(DETAIL_URL, {"params": {"a": 1}})  # pylint: disable=protected-access
+
+
+def test_coalescing_disabled():
+    """no single flight group is used when coalescing is turned off"""
+    api = EdxApi({"access_token": "token"}, BASE_URL, coalesce_requests=False)
+    assert api.get_requester().single_flight is None
+
+
+@pytest.mark.parametrize("url, group", [
+    ("http://edx.example.com/api/grades/v1/courses/course-v1:a+b+c/", "grades"),
+    ("http://edx.example.com/api/mobile/v0.5/my_user_info", "mobile"),
+    ("http://studio.example.com/api/v1/course_runs/", "course_runs"),
+    ("http://edx.example.com/v1/accounts/bulk_retire_users", "accounts"),
+    ("http://edx.example.com/", ""),
+])
+def test_endpoint_group(url, group):
+    """the endpoint group is the first meaningful path segment"""
+    assert endpoint_group(url) == group
+
+
+def test_session_records_metrics(requests_mock):
+    """requests are counted and timed per endpoint group"""
+    requests_mock.get(DETAIL_URL, json={})
+    metrics = Metrics()
+    session = EdxSession(metrics=metrics)
+    session.get(DETAIL_URL)
+    session.get(DETAIL_URL)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["requests"] == {"courses": 2}
+    assert snapshot["timings"]["request_seconds"]["courses"]["count"] == 2
+
+
+def test_path_timeouts(requests_mock):
+    """the longest matching path prefix sets the timeout"""
+    blocks_url = "http://edx.example.com/api/courses/v1/blocks/"
+    requests_mock.get(blocks_url, json={})
+    requests_mock.get(DETAIL_URL, json={})
+    session = EdxSession(timeout=(3.05, 25), path_timeouts={
+        "/api/courses/": 10,
+        "/api/courses/v1/blocks/": (3.05, 120),
+    })
+    session.get(blocks_url)
+    assert requests_mock.last_request.timeout == (3.05, 120)
+    session.get(DETAIL_URL)
+    assert requests_mock.last_request.timeout == 10
+    assert session.timeout_for("http://edx.example.com/api/grades/v1/") == (3.05, 25)
+
+
+def test_deadline_caps_timeout(requests_mock):
+    """a request made with a deadline gets at most the time left"""
+    requests_mock.get(DETAIL_URL, json={})
+    session = EdxSession(timeout=25)
+    with patch("edx_api.deadline.time.monotonic", return_value=100):
+        deadline = Deadline(10)
+    with patch("edx_api.deadline.time.monotonic", return_value=108):
+        session.get(DETAIL_URL, deadline=deadline)
+    assert requests_mock.last_request.timeout == 2
+    with patch("edx_api.deadline.time.monotonic", return_value=111):
+        with pytest.raises(DeadlineExceeded):
+            session.get(DETAIL_URL, deadline=deadline)
+    assert requests_mock.call_count == 1
+
+
+def test_deadline_requests_are_not_coalesced(requests_mock):
+    """a request with a deadline is sent on its own, it never waits for a request in flight"""
+    requests_mock.get(DETAIL_URL, json={})
+    flight = SingleFlight()
+    session = EdxSession(single_flight=flight)
+    with patch.object(flight, "do", wraps=flight.do) as do:
+        session.get(DETAIL_URL)
+        assert do.call_count == 1
+        session.get(DETAIL_URL, deadline=Deadline(10))
+        assert do.call_count == 1
+    assert requests_mock.call_count == 2
+    assert requests_mock.last_request.timeout <= 10
+
+
+def test_compression_metrics(requests_mock):
+    """compressed and decompressed sizes are recorded per endpoint group"""
+    body = json.dumps({"results": [{"username": f"user{index}"} for index in range(200)]}).encode()
+    requests_mock.get(DETAIL_URL, content=gzip.compress(body), headers={"Content-Encoding": "gzip"})
+    metrics = Metrics()
+    session = EdxSession(metrics=metrics)
+
+    assert len(session.get(DETAIL_URL).json()["results"]) == 200
+    counters = metrics.snapshot()["counters"]
+    assert counters["bytes_decoded"] == {"courses": len(body)}
+    assert counters["bytes_received"] == {"courses": len(gzip.compress(body))}
+    assert counters["bytes_received"]["courses"] < counters["bytes_decoded"]["courses"]
+    assert counters["encoding_gzip"] == {"courses": 1}
+
+    session.get(DETAIL_URL, stream=True)
+    assert metrics.snapshot()["counters"]["bytes_decoded"] == {"courses": len(body)}
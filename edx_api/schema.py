@@ -0,0 +1,108 @@
+"""
+Validation helpers for decoding edX payloads into typed, immutable structs
+"""
+from datetime import datetime
+
+from dateutil import parser
+
+_MISSING = object()
+
+
+class SchemaError(ValueError):
+    """Raised when a payload does not match the schema it is decoded with"""
+
+    def __init__(self, path, message):
+        """
+        Args:
+            path (str): the location of the invalid value, e.g. course_details.course_modes[0].slug
+            message (str): what is wrong with it
+        """
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+    def __reduce__(self):
+        # the errors are pickled back from the processes decoding payloads
+        return self.__class__, (self.path, self.message)
+
+
+def _join(path, key):
+    """The path of a key inside the object at path"""
+    return f"{path}.{key}" if path else key
+
+
+def mapping(value, path):
+    """
+    Checks that a value is a JSON object
+
+    Args:
+        value (object): the decoded value
+        path (str): its location in the payload
+
+    Returns:
+        dict: the value
+    """
+    if not isinstance(value, dict):
+        raise SchemaError(path or "<root>", f"expected an object, got {type(value).__name__}")
+    return value
+
+
+def field(payload, key, types, path, required=False, default=None):
+    """
+    Returns a field of a JSON object after checking its type
+
+    Args:
+        payload (dict): the JSON object
+        key (str): the field name
+        types (type or tuple): the accepted types, null is accepted unless the field is required
+        path (str): the location of the object in the payload
+        required (bool): whether the field must be present and not null
+        default (object): the value of an absent or null optional field
+
+    Returns:
+        object: the value of the field
+    """
+    value = payload.get(key, _MISSING)
+    if value is _MISSING or value is None:
+        if required:
+            raise SchemaError(_join(path, key), "is required")
+        return default
+    # bool is an int subclass, it is only accepted where it is expected
+    if not isinstance(value, types) or (isinstance(value, bool) and bool not in _as_tuple(types)):
+        raise SchemaError(_join(path, key), f"expected {_type_names(types)}, got {type(value).__name__}")
+    return value
+
+
+def datetime_field(payload, key, path):
+    """
+    Returns an ISO 8601 date field of a JSON object as a datetime, or None when it is null
+
+    Args:
+        payload (dict): the JSON object
+        key (str): the field name
+        path (str): the location of the object in the payload
+
+    Returns:
+        datetime: the parsed date
+    """
+    value = field(payload, key, str, path)
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        pass
+    try:
+        return parser.parse(value)
+    except (ValueError, OverflowError) as ex:
+        raise SchemaError(_join(path, key), f"invalid date {value!r}") from ex
+
+
+def _as_tuple(types):
+    """The accepted types as a tuple"""
+    return types if isinstance(types, tuple) else (types,)
+
+
+def _type_names(types):
+    """A readable list of the accepted types"""
+    return " or ".join(type_.__name__ for type_ in _as_tuple(types))
@@ -0,0 +1,51 @@
+"""Tests for the schema validation helpers"""
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from .schema import SchemaError, datetime_field, field, mapping
+
+
+def test_field():
+    """fields are type checked, null and absent optional fields get the default"""
+    payload = {"name": "Audit", "price": 10, "active": True, "note": None}
+    assert field(payload, "name", str, "mode") == "Audit"
+    assert field(payload, "price", (int, float), "mode") == 10
+    assert field(payload, "active", bool, "mode") is True
+    assert field(payload, "note", str, "mode", default="") == ""
+    assert field(payload, "missing", str, "mode") is None
+
+    with pytest.raises(SchemaError) as error:
+        field(payload, "name", int, "mode")
+    assert error.value.path == "mode.name"
+    assert str(error.value) == "mode.name: expected int, got str"
+    with pytest.raises(SchemaError, match="expected int or float, got bool"):
+        field(payload, "active", (int, float), "mode")
+    with pytest.raises(SchemaError, match="^note: is required"):
+        field(payload, "note", str, "", required=True)
+
+
+def test_datetime_field():
+    """ISO 8601 dates are parsed, invalid ones are rejected"""
+    payload = {"start": "2015-01-08T14:00:00Z", "created": "2019-04-04T19:44:31.802434Z", "end": None}
+    assert datetime_field(payload, "start", "") == datetime(2015, 1, 8, 14, tzinfo=timezone.utc)
+    assert datetime_field(payload, "created", "").microsecond == 802434
+    assert datetime_field(payload, "end", "") is None
+    assert datetime_field({"start": "Jan 8 2015"}, "start", "") == datetime(2015, 1, 8)
+    with pytest.raises(SchemaError, match="schedule.start: invalid date 'soon'"):
+        datetime_field({"start": "soon"}, "start", "schedule")
+
+
+def test_mapping():
+    """payloads must be JSON objects"""
+    assert mapping({}, "") == {}
+    with pytest.raises(SchemaError, match="<root>: expected an object, got list"):
+        mapping([], "")
+
+
+def test_schema_error_pickles():
+    """the errors can be sent back from other processes"""
+    error = pickle.loads(pickle.dumps(SchemaError("course.id", "is required")))
+    assert str(error) == "course.id: is required"
+    assert error.path == "course.id"
@@ -0,0 +1,98 @@
+"""
+Decoding of the JSON bodies of edX responses
+"""
+import json
+import threading
+
+import requests
+
+_lock = threading.Lock()
+_decoder = None
+
+
+def default_decoder():
+    """
+    Returns the fastest JSON decoder installed: orjson, then msgspec, then the standard library
+
+    Returns:
+        tuple: the name of the decoder and a function decoding bytes or str
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        import orjson
+        return "orjson", orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        return "msgspec", msgspec.json.decode
+    except ImportError:
+        pass
+    return "json", json.loads
+
+
+def get_decoder():
+    """
+    Returns the JSON decoder used for the responses, picking the default one on first use
+
+    Returns:
+        tuple: the name of the decoder and a function decoding bytes or str
+    """
+    global _decoder  # pylint: disable=global-statement
+    if _decoder is None:
+        with _lock:
+            if _decoder is None:
+                _decoder = default_decoder()
+    return _decoder
+
+
+def set_decoder(loads, name=None):
+    """
+    Sets the JSON decoder used for the responses
+
+    Args:
+        loads (callable): a function decoding bytes to Python objects, or None to restore the default one
+        name (str): the name of the decoder
+    """
+    global _decoder  # pylint: disable=global-statement
+    with _lock:
+        _decoder = None if loads is None else (name or getattr(loads, "__module__", None) or "custom", loads)
+
+
+def loads(data):
+    """
+    Decodes a JSON document with the configured decoder
+
+    Args:
+        data (bytes or str): the JSON document
+
+    Returns:
+        object: the decoded document
+
+    Raises:
+        ValueError: if the document is not valid JSON, whatever the error type of the decoder
+    """
+    try:
+        return get_decoder()[1](data)
+    except (ValueError, TypeError):
+        raise
+    except Exception as ex:  # pylint: disable=broad-except
+        # e.g. msgspec.DecodeError is not a ValueError, the callers expect the json.loads errors
+        raise ValueError(str(ex)) from ex
+
+
+class EdxResponse(requests.Response):
+    """
+    A response whose json() uses the configured decoder.
+
+    Bodies the decoder rejects (e.g. not UTF-8 encoded) and calls passing json.loads
+    arguments are handled by requests, which also raises its usual JSONDecodeError.
+    """
+
+    def json(self, **kwargs):
+        if kwargs or not self.content:
+            return super().json(**kwargs)
+        try:
+            return loads(self.content)
+        except ValueError:
+            return super().json()
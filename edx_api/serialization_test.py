@@ -0,0 +1,94 @@
+"""Tests for the JSON decoding of responses"""
+import json
+from unittest.mock import Mock
+
+import pytest
+from requests.exceptions import JSONDecodeError
+
+from . import serialization
+from .requester import EdxSession
+from .serialization import EdxResponse, default_decoder, get_decoder, loads, set_decoder
+
+URL = "http://edx.example.com/api/enrollment/v1/enrollments"
+
+
+@pytest.fixture(autouse=True)
+def restore_decoder():
+    """every test starts with the default decoder"""
+    set_decoder(None)
+    yield
+    set_decoder(None)
+
+
+def test_default_decoder():
+    """the fastest decoder installed is picked"""
+    name, decoder = default_decoder()
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        pass
+    else:
+        assert (name, decoder) == ("orjson", orjson.loads)
+    assert get_decoder()[0] == name
+    assert loads(b'{"results": [1, 2]}') == {"results": [1, 2]}
+
+
+def test_set_decoder():
+    """a custom decoder is used until the default one is restored"""
+    decoder = Mock(return_value={"decoded": True})
+    set_decoder(decoder, "mock")
+    assert get_decoder() == ("mock", decoder)
+    assert loads(b"{}") == {"decoded": True}
+    set_decoder(json.loads)
+    assert get_decoder() == ("json", json.loads)
+    set_decoder(None)
+    assert get_decoder() == default_decoder()
+
+
+def test_session_responses_use_the_decoder(requests_mock):
+    """the responses of the requester are decoded with the configured decoder"""
+    requests_mock.get(URL, content=b'{"results": []}')
+    decoder = Mock(return_value={"results": ["decoded"]})
+    set_decoder(decoder, "mock")
+    response = EdxSession().get(URL)
+    assert isinstance(response, EdxResponse)
+    assert response.json() == {"results": ["decoded"]}
+    decoder.assert_called_once_with(b'{"results": []}')
+
+
+def test_fallback_to_requests(requests_mock):
+    """bodies the decoder rejects and json.loads arguments are handled by requests"""
+    requests_mock.get(URL, content='{"name": "Zoë"}'.encode("utf-16"))
+    assert EdxSession().get(URL).json() == {"name": "Zoë"}
+
+    requests_mock.get(URL, content=b'{"grade": 0.5}')
+    assert EdxSession().get(URL).json(parse_float=str) == {"grade": "0.5"}
+
+    requests_mock.get(URL, content=b"<html>")
+    with pytest.raises(JSONDecodeError):
+        EdxSession().get(URL).json()
+    requests_mock.get(URL, content=b"")
+    with pytest.raises(JSONDecodeError):
+        EdxSession().get(URL).json()
+
+
+class DecodeError(Exception):
+    """A decoder error which is not a ValueError, like msgspec.DecodeError"""
+
+
+def test_decoder_errors_are_value_errors(requests_mock):
+    """whatever a decoder raises for an invalid document, callers get a ValueError"""
+    set_decoder(Mock(side_effect=DecodeError("malformed")), "strict")
+    with pytest.raises(ValueError, match="malformed"):
+        loads(b"<html>")
+
+    requests_mock.get(URL, content=b"<html>")
+    with pytest.raises(JSONDecodeError):
+        EdxSession().get(URL).json()
+
+
+def test_lazy_default():
+    """the default decoder is only looked up on first use"""
+    assert serialization._decoder is None  # pylint: disable=protected-access
+    loads(b"[]")
+    assert serialization._decoder == default_decoder()  # pylint: disable=protected-access
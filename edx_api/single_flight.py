@@ -0,0 +1,109 @@
+"""
+De-duplication of concurrent identical calls
+"""
+import threading
+
+
+class _Call:
+    """
+    An in-flight call tracked by SingleFlight
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.dups = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into a single call.
+
+    The first caller for a key runs the function, every caller arriving while it
+    is still running waits for it and receives the same result (or exception).
+    Nothing is cached once the call returns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) unless a call with the same key is already in flight.
+
+        Args:
+            key (hashable): the identity of the call
+            func (callable): the function to execute
+
+        Returns:
+            The value returned by the (possibly shared) call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.dups += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as exc:  # pylint: disable=broad-except
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, coro_func, *args, **kwargs):
+        """
+        Awaits coro_func(*args, **kwargs) unless a call with the same key is already
+        in flight on the running event loop.
+
+        Args:
+            key (hashable): the identity of the call
+            coro_func (callable): a function returning an awaitable
+
+        Returns:
+            The value produced by the (possibly shared) awaitable
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[loop_key] = loop.create_future()
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await coro_func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+            # the exception is re-raised here, mark it retrieved for the followers
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
@@ -1,30 +1,81 @@
 """Client for user_info API"""
+import hashlib
 from urllib.parse import urljoin
 
+from edx_api.cache import TTLCache
 from .models import Info
 
+USER_INFO_CACHE_TTL = 300
+USER_INFO_CACHE_SIZE = 4096
+
+UPDATE_HEADERS = {
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "X-Requested-With": "XMLHttpRequest",
+    "Content-Type": "application/merge-patch+json",
+}
+
+# the identity of the owner of an access token, by edX instance and token digest. It
+# is shared by the clients of the process, so that a token is resolved once even by
+# callers building an EdxApi per request.
+_identity_cache = TTLCache(maxsize=USER_INFO_CACHE_SIZE, ttl=USER_INFO_CACHE_TTL)
+
+
+def clear_identity_cache():
+    """Forgets every identity resolved by the clients using the process-level cache"""
+    _identity_cache.clear()
+
 
 class UserInfo:
     """
     edX user info client
+
+    The identity of the owner of the access token is cached for USER_INFO_CACHE_TTL
+    seconds, by default in a cache shared by the clients of the process.
     """
 
-    def __init__(self, requester, base_url):
+    def __init__(self, requester, base_url, cache=None):
         """
         Args:
             requester (Requester): an authenticated objects for requests to edX
             base_url (str): string representing the base URL of an edX LMS instance
+            cache (TTLCache or bool): the cache of the identities, the process-level one
+                if None, False disables the caching
         """
         self.requester = requester
         self.base_url = base_url
+        # the identities by edX instance and token digest, the token of a credentials
+        # provider is renewed
+        if cache is None:
+            cache = _identity_cache
+        self.cache = None if cache is False else cache
+
+    def _identity_key(self):
+        """The cache key of the identity of the current credentials: the edX instance and a digest of the token"""
+        auth = getattr(self.requester, "auth", None)
+        if auth is not None and hasattr(auth, "provider"):
+            authorization = f"{auth.token_type} {auth.provider.get_token(auth.token_type)}"
+        else:
+            authorization = self.requester.headers.get("Authorization", "")
+        return self.base_url, hashlib.sha256(authorization.encode("utf-8")).hexdigest()
 
-    def get_user_info(self):
+    def get_user_info(self, use_cache=True):
         """
         Returns a UserInfo object for the logged in user.
 
+        The user info is cached for USER_INFO_CACHE_TTL seconds per access token.
+
+        Args:
+            use_cache (bool): whether the user info resolved for the same token can be returned
+
         Returns:
             UserInfo: object representing the student current grades
         """
+        key = self._identity_key()
+        if use_cache and self.cache is not None:
+            info = self.cache.get(key)
+            if info is not None:
+                return info
+
         # the request is done in behalf of the current logged in user
         resp = self.requester.get(
             urljoin(
@@ -35,7 +86,10 @@ class UserInfo:
 
         resp.raise_for_status()
 
-        return Info(resp.json())
+        info = Info(resp.json())
+        if self.cache is not None:
+            self.cache.set(key, info)
+        return info
 
     def update_user_name(self, username, full_name):
         """
@@ -50,20 +104,19 @@ class UserInfo:
         """
         request_data = dict(name=full_name)
 
-        # the request is done on behalf of the current logged in user
-        self.requester.headers.update(
-            {
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "X-Requested-With": "XMLHttpRequest",
-                "Content-Type": "application/merge-patch+json",
-            }
-        )
+        # the request is done on behalf of the current logged in user, the headers are
+        # passed with the request as the requester is shared with the other clients
         resp = self.requester.patch(
             urljoin(
                 self.base_url,
                 f'/api/user/v1/accounts/{username}'
             ),
-            json=request_data)
+            json=request_data,
+            headers=UPDATE_HEADERS)
         resp.raise_for_status()
 
+        # the cached identities of the user are stale
+        if self.cache is not None:
+            self.cache.invalidate(self._identity_key())
+            self.cache.invalidate_if(lambda key, info: key[0] == self.base_url and info.username == username)
         return Info(resp.json())
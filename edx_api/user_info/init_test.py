@@ -0,0 +1,131 @@
+"""Tests for the user info client"""
+from unittest.mock import Mock, patch
+
+import pytest
+
+from edx_api.cache import TTLCache
+from edx_api.client import EdxApi
+from . import USER_INFO_CACHE_TTL
+
+BASE_URL = "http://edx.example.com"
+USER_INFO_URL = f"{BASE_URL}/api/mobile/v0.5/my_user_info"
+ACCOUNT_URL = f"{BASE_URL}/api/user/v1/accounts/staff"
+OTHER_BASE_URL = "http://other-edx.example.com"
+OTHER_USER_INFO_URL = f"{OTHER_BASE_URL}/api/mobile/v0.5/my_user_info"
+
+
+def test_get_user_info_is_cached_per_token(requests_mock):
+    """the identity of a token is requested once, by any client of the process"""
+    requests_mock.get(USER_INFO_URL, json={"username": "staff"})
+    requests_mock.get(OTHER_USER_INFO_URL, json={"username": "staff"})
+    assert EdxApi({"access_token": "token"}, BASE_URL).user_info.get_user_info().username == "staff"
+    assert EdxApi({"access_token": "token"}, BASE_URL).user_info.get_user_info().username == "staff"
+    assert requests_mock.call_count == 1
+
+    EdxApi({"access_token": "other"}, BASE_URL).user_info.get_user_info()
+    assert requests_mock.call_count == 2
+    EdxApi({"access_token": "token"}, OTHER_BASE_URL).user_info.get_user_info()
+    assert requests_mock.call_count == 3
+    EdxApi({"access_token": "token"}, BASE_URL).user_info.get_user_info(use_cache=False)
+    assert requests_mock.call_count == 4
+
+
+def test_identity_cache_injected(requests_mock):
+    """clients given their own cache do not share the process-level one"""
+    requests_mock.get(USER_INFO_URL, json={"username": "staff"})
+    cache = TTLCache()
+    api = EdxApi({"access_token": "token"}, BASE_URL, identity_cache=cache)
+    api.user_info.get_user_info()
+    api.user_info.get_user_info()
+    assert requests_mock.call_count == 1
+    assert len(cache) == 1
+
+    EdxApi({"access_token": "token"}, BASE_URL).user_info.get_user_info()
+    assert requests_mock.call_count == 2
+
+
+def test_identity_cache_disabled(requests_mock):
+    """identity_cache=False requests the identity every time"""
+    requests_mock.get(USER_INFO_URL, json={"username": "staff"})
+    api = EdxApi({"access_token": "token"}, BASE_URL, identity_cache=False)
+    api.user_info.get_user_info()
+    api.user_info.get_user_info()
+    assert requests_mock.call_count == 2
+    assert api.user_info.cache is None
+
+
+def test_renewed_tokens_are_looked_up(requests_mock):
+    """the identity is cached per token, a new token is requested again"""
+    requests_mock.get(USER_INFO_URL, json={"username": "staff"})
+    provider = Mock()
+    provider.get_token.return_value = "first"
+    user_info = EdxApi({}, BASE_URL, credentials_provider=provider).user_info
+    user_info.get_user_info()
+    user_info.get_user_info()
+    provider.get_token.return_value = "second"
+    user_info.get_user_info()
+    assert [request.headers["Authorization"] for request in requests_mock.request_history] == [
+        "Bearer first", "Bearer second"
+    ]
+
+
+def test_cache_expires(requests_mock):
+    """identities are requested again after USER_INFO_CACHE_TTL seconds"""
+    requests_mock.get(USER_INFO_URL, json={"username": "staff"})
+    user_info = EdxApi({"access_token": "token"}, BASE_URL).user_info
+    with patch("edx_api.cache.time.monotonic", return_value=1000):
+        user_info.get_user_info()
+    with patch("edx_api.cache.time.monotonic", return_value=1000 + USER_INFO_CACHE_TTL):
+        user_info.get_user_info()
+    assert requests_mock.call_count == 2
+
+
+def test_errors_are_not_cached(requests_mock):
+    """failed lookups are sent again"""
+    requests_mock.get(USER_INFO_URL, [{"status_code": 500}, {"json": {"username": "staff"}}])
+    user_info = EdxApi({"access_token": "token"}, BASE_URL).user_info
+    with pytest.raises(Exception):
+        user_info.get_user_info()
+    assert user_info.get_user_info().username == "staff"
+
+
+def test_update_user_name_invalidates(requests_mock):
+    """the identities of a renamed user are requested again"""
+    requests_mock.get(USER_INFO_URL, [{"json": {"username": "staff", "name": "Old"}},
+                                      {"json": {"username": "staff", "name": "New"}}])
+    requests_mock.patch(ACCOUNT_URL, json={"username": "staff", "name": "New"})
+    user_info = EdxApi({"access_token": "token"}, BASE_URL).user_info
+    assert user_info.get_user_info().name == "Old"
+
+    assert user_info.update_user_name("staff", "New").name == "New"
+    assert requests_mock.last_request.json() == {"name": "New"}
+    assert user_info.get_user_info().name == "New"
+
+
+def test_update_other_user_invalidates_their_identity(requests_mock):
+    """renaming a user through another token drops the identity cached for theirs"""
+    requests_mock.get(USER_INFO_URL, json={"username": "staff", "name": "Old"})
+    requests_mock.patch(ACCOUNT_URL, json={"username": "staff", "name": "New"})
+    EdxApi({"access_token": "token"}, BASE_URL).user_info.get_user_info()
+
+    EdxApi({"access_token": "admin"}, BASE_URL).user_info.update_user_name("staff", "New")
+    EdxApi({"access_token": "token"}, BASE_URL).user_info.get_user_info()
+    assert requests_mock.call_count == 3
+
+
+def test_update_user_name_leaves_the_shared_requester_alone(requests_mock):
+    """the merge-patch headers are sent with the update only"""
+    requests_mock.patch(ACCOUNT_URL, json={"username": "staff", "name": "New"})
+    requests_mock.get(USER_INFO_URL, json={"username": "staff"})
+    api = EdxApi({"access_token": "token"}, BASE_URL)
+    headers = dict(api.user_info.requester.headers)
+
+    api.user_info.update_user_name("staff", "New")
+    update = requests_mock.last_request
+    assert update.headers["Content-Type"] == "application/merge-patch+json"
+    assert update.headers["X-Requested-With"] == "XMLHttpRequest"
+    assert update.headers["Authorization"] == "Bearer token"
+    assert dict(api.user_info.requester.headers) == headers
+
+    api.user_info.get_user_info()
+    assert "X-Requested-With" not in requests_mock.last_request.headers
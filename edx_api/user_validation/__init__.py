@@ -1,12 +1,27 @@
 """Client for user_validation API"""
 from urllib.parse import urljoin
 
+from edx_api.bulk import DEFAULT_MAX_WORKERS, map_concurrently
+from edx_api.cache import TTLCache
+from edx_api.single_flight import SingleFlight
 from .models import UserValidationResult
 
+# validation decisions change when users register, they are only cached briefly
+VALIDATION_CACHE_TTL = 30
+VALIDATION_CACHE_SIZE = 4096
+
+
+def _payload_key(registration_information):
+    """The identity of a validation request: its fields, sorted"""
+    return tuple(sorted((str(key), str(value)) for key, value in (registration_information or {}).items()))
+
 
 class UserValidation(object):
     """
     Open edX user validation client
+
+    The results are cached for VALIDATION_CACHE_TTL seconds and concurrent identical
+    validations are sent once.
     """
 
     api_url = "/api/user/v1/validation/registration"
@@ -19,21 +34,48 @@ class UserValidation(object):
         """
         self.requester = requester
         self.base_url = base_url
+        self.cache = TTLCache(maxsize=VALIDATION_CACHE_SIZE, ttl=VALIDATION_CACHE_TTL)
+        self._single_flight = SingleFlight()
+
+    def _validate(self, registration_information, key):
+        """Sends a validation request and caches its result"""
+        resp = self.requester.post(
+            urljoin(self.base_url, self.api_url), data=registration_information
+        )
+        resp.raise_for_status()
+
+        result = UserValidationResult(resp.json())
+        self.cache.set(key, result)
+        return result
 
-    def validate_user_registration_info(self, registration_information=None):
+    def validate_user_registration_info(self, registration_information=None, use_cache=True):
         """
         Validate information about user data during registration.
 
         Args:
             registration_information (dict): request payload to validate user registration information
             i.e. name or username
+            use_cache (bool): whether a result cached in the last VALIDATION_CACHE_TTL seconds can be returned
 
         Returns:
             UserValidationResult: Object representing the user validation response data
         """
-        resp = self.requester.post(
-            urljoin(self.base_url, self.api_url), data=registration_information
-        )
-        resp.raise_for_status()
+        key = _payload_key(registration_information)
+        if use_cache:
+            result = self.cache.get(key)
+            if result is not None:
+                return result
+        return self._single_flight.do(key, self._validate, registration_information, key)
+
+    def validate_many(self, registrations, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Validate the registration information of many users concurrently, e.g. before an import.
+
+        Args:
+            registrations (iterable): the registration information of each user
+            max_workers (int): the maximum number of concurrent requests
 
-        return UserValidationResult(resp.json())
+        Returns:
+            list of BulkResult: the UserValidationResult of each registration, or the error raised
+        """
+        return map_concurrently(self.validate_user_registration_info, registrations, max_workers)
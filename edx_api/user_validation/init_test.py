@@ -2,10 +2,17 @@
 Test responses from user_validation api.
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urljoin
+
 import pytest
-from urllib.parse import urljoin
+from requests.exceptions import HTTPError
 
 from edx_api.client import EdxApi
+from . import VALIDATION_CACHE_TTL, UserValidation
 from .models import UserValidationResult
 
 
@@ -50,3 +57,75 @@ def test_validate_user_registration_info(requests_mock, expected_validation_deci
 
     assert isinstance(validation_response, UserValidationResult)
     assert validation_response.validation_decisions == expected_validation_decisions
+
+
+def test_validation_is_cached(requests_mock):
+    """identical validations are answered from the cache"""
+    base_url = "https://edx.example.com"
+    client = EdxApi({"access_token": ""}, base_url).user_validation
+    requests_mock.post(
+        urljoin(base_url, '/api/user/v1/validation/registration'),
+        json={"validation_decisions": {"username": ""}}
+    )
+
+    first = client.validate_user_registration_info({"username": "user", "name": "Name"})
+    assert client.validate_user_registration_info({"name": "Name", "username": "user"}) is first
+    assert requests_mock.call_count == 1
+
+    client.validate_user_registration_info({"username": "other"})
+    assert requests_mock.call_count == 2
+    assert client.validate_user_registration_info({"username": "user", "name": "Name"}, use_cache=False) is not first
+    assert requests_mock.call_count == 3
+
+    with patch("edx_api.cache.time.monotonic", return_value=time.monotonic() + VALIDATION_CACHE_TTL):
+        client.validate_user_registration_info({"username": "other"})
+    assert requests_mock.call_count == 4
+
+
+def test_errors_are_not_cached(requests_mock):
+    """failed validations are sent again"""
+    base_url = "https://edx.example.com"
+    client = EdxApi({"access_token": ""}, base_url).user_validation
+    url = urljoin(base_url, '/api/user/v1/validation/registration')
+    requests_mock.post(url, [{"status_code": 503}, {"json": {"validation_decisions": {"name": ""}}}])
+
+    with pytest.raises(HTTPError):
+        client.validate_user_registration_info({"name": "Name"})
+    assert client.validate_user_registration_info({"name": "Name"}).name == ""
+
+
+def test_concurrent_validations_are_sent_once():
+    """concurrent identical validations share one request"""
+    requester = Mock()
+    started = threading.Event()
+    release = threading.Event()
+
+    def post(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return Mock(json=Mock(return_value={"validation_decisions": {"username": ""}}))
+
+    requester.post.side_effect = post
+    client = UserValidation(requester, "https://edx.example.com")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(client.validate_user_registration_info, {"username": "user"}) for _ in range(4)]
+        started.wait(5)
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+    assert requester.post.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_validate_many(requests_mock):
+    """many registrations are validated concurrently"""
+    base_url = "https://edx.example.com"
+    client = EdxApi({"access_token": ""}, base_url).user_validation
+
+    def validation_response(request, context):
+        username = parse_qs(request.text)["username"][0]
+        return {"validation_decisions": {"username": "" if username.isalnum() else "Invalid username"}}
+
+    requests_mock.post(urljoin(base_url, '/api/user/v1/validation/registration'), json=validation_response)
+    results = client.validate_many([{"username": "good"}, {"username": "!bad"}, {"username": "fine"}])
+    assert [result.value.username for result in results] == ["", "Invalid username", ""]
@@ -33,10 +33,12 @@ setup(
     author='MIT Office of Digital Learning',
     author_email='mitx-devops@mit.edu',
     url="https://github.com/mitodl/edx-api-client",
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     include_package_data=True,
     install_requires=install_requires,
     extras_require={
         'dev': dev_requires,
+        'compression': ['brotli', 'zstandard'],
+        'fast-json': ['orjson'],
     },
 )